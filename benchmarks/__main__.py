@@ -0,0 +1,60 @@
+"""
+Run eagle's internal benchmarks.
+
+Usage:
+    python -m benchmarks
+    python -m benchmarks --filter faker --min-time 2
+    python -m benchmarks --output .benchmarks/today.json --compare .benchmarks/yesterday.json
+"""
+import os
+from datetime import datetime
+import click
+from prettytable import PrettyTable
+from eagle.logger import logger
+from benchmarks import bench_check_points, bench_faker, bench_http, bench_utils  # noqa
+from benchmarks.harness import load_results, registry, run_benchmark, save_results
+
+
+def _format_change(current: float, previous: float) -> str:
+    if not previous:
+        return '-'
+    return f'{(current - previous) / previous * 100:+.1f}%'
+
+
+@click.command()
+@click.option('--filter', '-k', 'pattern', help='Only run benchmarks whose name contains this string')
+@click.option('--min-time', default=1.0, show_default=True, help='Minimum seconds spent measuring each benchmark')
+@click.option('--output', '-o', help='JSON file the results are saved to')
+@click.option('--compare', '-c', help='A previous JSON result file to compare with')
+@click.option('--with-logging', is_flag=True, help='Keep eagle logging enabled while measuring')
+def main(pattern, min_time, output, compare, with_logging):
+    if not with_logging:
+        logger.disable('eagle')
+
+    previous = load_results(compare) if compare else {}
+    results = []
+
+    table = PrettyTable()
+    table.field_names = ['benchmark', 'unit/s', 'ops/s', 'peak bytes/op', 'change']
+    table.align['benchmark'] = 'l'
+    for benchmark in registry.get_benchmarks(pattern):
+        result = run_benchmark(benchmark, min_time=min_time)
+        results.append(result)
+        previous_result = previous.get(benchmark.name, {})
+        table.add_row([
+            benchmark.name,
+            f"{result['units_per_second']:,.0f} {benchmark.unit}",
+            f"{result['ops_per_second']:,.1f}",
+            f"{result['peak_bytes_per_op']:,.0f}",
+            _format_change(result['units_per_second'], previous_result.get('units_per_second')),
+        ])
+    print(table)
+
+    if output is None:
+        output = os.path.join('.benchmarks', f'{datetime.now():%Y%m%d-%H%M%S}.json')
+    save_results(results, output)
+    print(f'Results saved to {output}')
+
+
+if __name__ == '__main__':
+    main()
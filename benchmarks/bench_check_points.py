@@ -0,0 +1,46 @@
+from eagle.logger import logger
+from eagle.testcase.check_points.http import (
+    HttpStatusCodeEqual,
+    HttpResponseValueCheckPoint,
+    HttpResponseValueInListItemsCheckPoint,
+    HttpResponseJsonIncludeCheckPoint,
+    HttpResponseListPaginationCheckPoint,
+    HttpResponseSchemaCheckPoint,
+)
+from benchmarks.fixtures import UserFaker, build_client
+from benchmarks.harness import benchmark
+
+
+@benchmark('check_points.http', unit='check points')
+def check_point_throughput():
+    response = build_client().get('/items/')
+    logger.disable('eagle')
+
+    def op():
+        check_points = [
+            HttpStatusCodeEqual(200),
+            HttpResponseValueCheckPoint(2, '$.count'),
+            HttpResponseValueInListItemsCheckPoint('A', 'type', '$.results'),
+            HttpResponseJsonIncludeCheckPoint({'count': 2}, '$'),
+            HttpResponseListPaginationCheckPoint('$', 2, 'count', 'results'),
+        ]
+        for check_point in check_points:
+            check_point(response)
+        return len(check_points)
+    return op
+
+
+@benchmark('check_points.schema', unit='objects')
+def schema_check_point_throughput():
+    # A list of 1000 users checked against the compiled schema of their Faker, in one pass over the body.
+    object_count = 1000
+    users = UserFaker.generate_many(object_count)
+    response = build_client(lambda method, url, body: (200, {'count': object_count, 'results': users})).get('/users/')
+    logger.disable('eagle')
+
+    def op():
+        check_point = HttpResponseSchemaCheckPoint(UserFaker, '$.results', many=True)
+        check_point(response)
+        assert not check_point.failed, check_point.error_message
+        return object_count
+    return op
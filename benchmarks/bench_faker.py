@@ -0,0 +1,73 @@
+from eagle.payload import materialize
+from benchmarks.fixtures import UserFaker, build_wide_faker, build_constrained_faker, build_nested_faker
+from benchmarks.harness import benchmark
+
+
+@benchmark('faker.valid_data', unit='payloads')
+def faker_valid_data():
+    def op():
+        UserFaker().valid_data
+        return 1
+    return op
+
+
+@benchmark('faker.invalid_data', unit='payloads')
+def faker_invalid_data():
+    def op():
+        return len(UserFaker().invalid_data)
+    return op
+
+
+@benchmark('faker.invalid_data.wide_200', unit='payloads')
+def faker_invalid_data_wide():
+    wide_faker_class = build_wide_faker(200)
+
+    def op():
+        return len(wide_faker_class().invalid_data)
+    return op
+
+
+@benchmark('faker.invalid_data.wide_200.materialized', unit='payloads')
+def faker_invalid_data_wide_materialized():
+    wide_faker_class = build_wide_faker(200)
+
+    def op():
+        invalid_data = wide_faker_class().invalid_data
+        for item in invalid_data:
+            materialize(item.data)
+        return len(invalid_data)
+    return op
+
+
+@benchmark('faker.invalid_data.nested', unit='payloads')
+def faker_invalid_data_nested():
+    nested_faker_class = build_nested_faker(4)
+
+    def op():
+        return len(nested_faker_class().invalid_data)
+    return op
+
+
+@benchmark('faker.list_invalid_variants.wide_200', unit='variants')
+def faker_list_invalid_variants_wide():
+    wide_faker_class = build_wide_faker(200)
+
+    def op():
+        return len(wide_faker_class().list_invalid_variants())
+    return op
+
+
+@benchmark('faker.generate_many', unit='records')
+def faker_generate_many():
+    def op():
+        return len(UserFaker.generate_many(10000))
+    return op
+
+
+@benchmark('faker.generate_many.constrained', unit='records')
+def faker_generate_many_constrained():
+    constrained_faker_class = build_constrained_faker(10)
+
+    def op():
+        return len(constrained_faker_class.generate_many(2000))
+    return op
@@ -0,0 +1,86 @@
+import time
+from urllib.parse import parse_qs, urlsplit
+from eagle.runner import Runner
+from eagle.testcase.unit import APIEndpointTestCase
+from eagle.testcase.check_points.http import HttpStatusCodeEqual
+from eagle.testcase.rest_caseset import RestApiCaseSet
+from eagle.testcase.suitus import FakerAutoTestSuite
+from eagle.testcase.pagination import PaginationCrawler
+from benchmarks.fixtures import UserFaker, build_bulk_faker, build_client
+from benchmarks.harness import benchmark
+
+
+@benchmark('http.client.request', unit='requests')
+def client_request_overhead():
+    client = build_client()
+
+    def op():
+        client.request('POST', '/users/', json={'name': 'eagle'})
+        return 1
+    return op
+
+
+@benchmark('http.streamed_body', unit='items')
+def streamed_body():
+    # The body is encoded while it is sent: the peak memory does not grow with the number of items.
+    item_count = 100000
+    client = build_client(lambda method, url, body: (201, None))
+    case = APIEndpointTestCase(
+        'POST', '/users/bulk/', client=client, json=build_bulk_faker(item_count)().valid_data,
+        check_points=[HttpStatusCodeEqual(201)],
+    )
+
+    def op():
+        case.execute()
+        return item_count
+    return op
+
+
+@benchmark('http.bulk_create', unit='objects')
+def bulk_create():
+    # Every response takes 1ms, like a fast API: the objects are created 8 at a time.
+    def handler(method, url, body):
+        time.sleep(0.001)
+        return 201, {'id': 1, **body}
+    client = build_client(handler)
+
+    def op():
+        return UserFaker.objects.bulk_create(200, '/users/', client=client, concurrency=8).created
+    return op
+
+
+@benchmark('http.pagination_crawl', unit='pages')
+def pagination_crawl():
+    # 100 pages of 500 items, every response takes 1ms: the pages are fetched 8 at a time.
+    item_count, page_size = 50000, 500
+
+    def handler(method, url, body):
+        time.sleep(0.001)
+        page = int(parse_qs(urlsplit(url).query).get('page', ['1'])[0])
+        start = (page - 1) * page_size
+        return 200, {'count': item_count, 'results': [{'id': i} for i in range(start, min(start + page_size, item_count))]}
+    crawler = PaginationCrawler(build_client(handler), '/users/', page_size, concurrency=8)
+
+    def op():
+        return crawler.crawl().pages
+    return op
+
+
+@benchmark('runner.cases', unit='cases')
+def runner_cases_per_second():
+    class TestCreateUser(RestApiCaseSet, FakerAutoTestSuite):
+        faker_class = UserFaker
+        client = build_client()
+        url = '/users/'
+        enable = 'create'
+        disable_payload_check = True
+
+    def op():
+        runner = Runner(root_path='.', client_path=None)
+        runner.cases = [
+            TestCreateUser(),
+            APIEndpointTestCase('GET', '/users/', client=TestCreateUser.client, check_points=[HttpStatusCodeEqual(200)]),
+        ]
+        runner.execute()
+        return runner.evaluator.total
+    return op
@@ -0,0 +1,18 @@
+from eagle.utils import get_value_from_json_path
+from benchmarks.harness import benchmark
+
+
+DOCUMENT = {
+    'count': 100,
+    'results': [{'id': i, 'type': 'A', 'owner': {'name': f'user-{i}'}} for i in range(100)],
+}
+
+
+@benchmark('utils.get_value_from_json_path', unit='lookups')
+def json_path_lookup():
+    def op():
+        get_value_from_json_path(DOCUMENT, '$.count')
+        get_value_from_json_path(DOCUMENT, '$.results')
+        get_value_from_json_path(DOCUMENT, '$.results[50].owner.name')
+        return 3
+    return op
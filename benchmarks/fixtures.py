@@ -0,0 +1,126 @@
+from typing import Optional
+from eagle.faker import Faker, fields
+from eagle.faker.constraint import RelationConstraint, DictValueEqual, DictValueIn, DictKeyExist, DictValueNotNull
+from eagle.http.client import AuthenticatedHttpClient
+from eagle.settings.bases import app_settings
+from benchmarks.transport import InMemoryTransport, Handler
+
+
+BENCH_ENDPOINT = 'http://bench.local'
+
+# The objects "created" by the benchmarks are not journaled for cleanup.
+app_settings.RESOURCE_JOURNAL_FILE = None
+
+
+class UserFaker(Faker):
+
+    name = fields.CharField(allow_blank=False, required=True, allow_null=False)
+    age = fields.IntegerField(required=True, allow_null=False, min_value=1, max_value=120)
+    sex = fields.ChoiceField(allow_blank=False, required=True, allow_null=False, choices=['0', '1'])
+    phone = fields.CharField(required=True, allow_null=False, allow_blank=False, min_length=11, max_length=11)
+    address = fields.DictField(
+        required=True,
+        allow_null=False,
+        city=fields.CharField(required=True, allow_null=False, allow_blank=False),
+        street=fields.CharField(required=True, allow_blank=False),
+        zip_code=fields.IntegerField(min_value=10000, max_value=99999),
+    )
+
+
+def build_wide_faker(field_count: int = 200) -> type:
+    """
+    Build a Faker with `field_count` fields, a tenth of them nested dicts,
+    to stress the invalid data generation of wide schemas.
+    """
+    attrs = {}
+    for i in range(field_count):
+        if i % 10 == 0:
+            attrs[f'field_{i}'] = fields.DictField(
+                required=True,
+                allow_null=False,
+                name=fields.CharField(required=True, allow_null=False, allow_blank=False),
+                value=fields.IntegerField(required=True, min_value=0, max_value=100),
+            )
+        elif i % 3 == 0:
+            attrs[f'field_{i}'] = fields.IntegerField(required=True, allow_null=False, min_value=0, max_value=1000)
+        else:
+            attrs[f'field_{i}'] = fields.CharField(required=True, allow_null=False, allow_blank=False)
+    return type(f'Wide{field_count}Faker', (Faker,), attrs)
+
+
+def build_nested_faker(depth: int = 4) -> type:
+    """
+    Build a Faker with a binary tree of `DictField`s `depth` levels deep,
+    and a list of dict elements, to stress nested invalid data generation.
+    """
+    def build_dict(level):
+        if level == 0:
+            return fields.CharField(required=True, allow_null=False, allow_blank=False)
+        return fields.DictField(
+            required=True,
+            allow_null=False,
+            max_invalid_depth=None,
+            left=build_dict(level - 1),
+            right=build_dict(level - 1),
+            size=fields.IntegerField(min_value=0, max_value=5),
+        )
+
+    attrs = {
+        'tree': build_dict(depth),
+        'items': fields.ListField(
+            fields=[build_dict(2) for _ in range(3)],
+            min_length=3,
+            max_length=3,
+            required=True,
+        ),
+    }
+    return type(f'Nested{depth}Faker', (Faker,), attrs)
+
+
+def build_constrained_faker(group_count: int = 10) -> type:
+    """
+    Build a Faker with `group_count` groups of fields tied by relation constraints
+    on nested keys, several of them sharing the same condition.
+    """
+    attrs = {}
+    relation_constraints = []
+    for i in range(group_count):
+        attrs[f'kind_{i}'] = fields.ChoiceField(required=True, allow_null=False, choices=['a', 'b', 'c'])
+        attrs[f'detail_{i}'] = fields.DictField(
+            required=True,
+            allow_null=False,
+            code=fields.IntegerField(min_value=0, max_value=9),
+            note=fields.CharField(allow_blank=False),
+        )
+        condition = DictValueIn(['a', 'b'], key=f'kind_{i}')
+        relation_constraints += [
+            RelationConstraint(condition, [DictKeyExist(default=1, key=[f'detail_{i}', 'code'])]),
+            RelationConstraint(condition, [DictValueNotNull(default='n', key=[f'detail_{i}', 'note'])]),
+            RelationConstraint(DictValueEqual('c', key=f'kind_{i}'), [DictValueNotNull(default=0, key=[f'detail_{i}', 'code'])]),
+        ]
+    attrs['Meta'] = type('Meta', (), {'relation_constraints': relation_constraints})
+    return type(f'Constrained{group_count}Faker', (Faker,), attrs)
+
+
+def build_bulk_faker(item_count: int) -> type:
+    """
+    Build a Faker whose `items` is a streamed list of `item_count` user-like dicts,
+    like the payload of a bulk import endpoint.
+    """
+    items = fields.ListField(
+        required=True,
+        allow_null=False,
+        fields=[fields.DictField(
+            name=fields.CharField(required=True, allow_null=False, allow_blank=False),
+            age=fields.IntegerField(required=True, min_value=1, max_value=120),
+        )],
+        stream_length=item_count,
+        max_length=item_count,
+    )
+    return type(f'Bulk{item_count}Faker', (Faker,), {'items': items})
+
+
+def build_client(handler: Optional[Handler] = None, endpoint: str = BENCH_ENDPOINT) -> AuthenticatedHttpClient:
+    client = AuthenticatedHttpClient(endpoint=endpoint)
+    client.mount(endpoint, InMemoryTransport(handler))
+    return client
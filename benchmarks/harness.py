@@ -0,0 +1,134 @@
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Benchmark(namedtuple('Benchmark', ['name', 'unit', 'setup'])):
+    __slots__ = ()
+
+
+class BenchmarkRegistry:
+
+    def __init__(self):
+        self.benchmarks: Dict[str, Benchmark] = {}
+
+    def register(self, benchmark: Benchmark) -> None:
+        if benchmark.name in self.benchmarks:
+            raise ValueError(f'Benchmark {benchmark.name} is already registered.')
+        self.benchmarks[benchmark.name] = benchmark
+
+    def get_benchmarks(self, pattern: Optional[str] = None) -> List[Benchmark]:
+        return [
+            benchmark for name, benchmark in self.benchmarks.items()
+            if pattern is None or pattern in name
+        ]
+
+
+registry = BenchmarkRegistry()
+
+
+def benchmark(name: str, unit: str = 'ops'):
+    """
+    Register a benchmark.
+
+    The decorated function is the setup: it is called once and must return
+    the operation to measure. The operation is called repeatedly and returns
+    how many `unit`s it processed (e.g. 20 payloads, 1 case).
+
+    Usage:
+        >>> @benchmark('faker.valid_data', unit='payloads')
+            def faker_valid_data():
+                def op():
+                    UserFaker().valid_data
+                    return 1
+                return op
+    """
+    def decorator(setup: Callable[[], Callable[[], int]]):
+        registry.register(Benchmark(name, unit, setup))
+        return setup
+    return decorator
+
+
+def _measure_speed(op: Callable[[], int], min_time: float) -> Dict[str, float]:
+    # Warm up caches, lazy imports and connection pools.
+    op()
+
+    ops = units = 0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            units += op() or 1
+            ops += 1
+            elapsed = time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        'ops': ops,
+        'units': units,
+        'seconds': elapsed,
+        'ops_per_second': ops / elapsed,
+        'units_per_second': units / elapsed,
+        'mean_op_seconds': elapsed / ops,
+    }
+
+
+def _measure_memory(op: Callable[[], int], repeat: int) -> Dict[str, float]:
+    # tracemalloc only reports the live and the peak size, so the peak
+    # growth of every single operation is used as the allocation figure.
+    tracemalloc.start()
+    try:
+        peaks = units = 0
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            units += op() or 1
+            _, peak = tracemalloc.get_traced_memory()
+            peaks += peak - baseline
+    finally:
+        tracemalloc.stop()
+    return {
+        'peak_bytes_per_op': peaks / repeat,
+        'peak_bytes_per_unit': peaks / units,
+    }
+
+
+def run_benchmark(benchmark: Benchmark, min_time: float = 1.0, memory_repeat: int = 5) -> Dict[str, Any]:
+    op = benchmark.setup()
+    result = {'name': benchmark.name, 'unit': benchmark.unit}
+    result |= _measure_speed(op, min_time)
+    result |= _measure_memory(op, memory_repeat)
+    return result
+
+
+def get_environment() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def save_results(results: List[Dict[str, Any]], output: str) -> None:
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'environment': get_environment(), 'results': results}, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return {result['name']: result for result in data['results']}
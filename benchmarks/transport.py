@@ -0,0 +1,152 @@
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional, Tuple
+from requests.adapters import BaseAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+
+
+# A handler receives the method, the url and the decoded json body (or None, also for streamed bodies)
+# and returns the status code and the json body of the response.
+Handler = Callable[[str, str, Optional[Any]], Tuple[int, Any]]
+
+
+def default_handler(method: str, url: str, body: Optional[Any]) -> Tuple[int, Any]:
+    """
+    A tiny REST stand-in:
+        - POST echoes the body back with an `id` and answers 201,
+          or 400 if any top level value is None.
+        - DELETE answers 204.
+        - Anything else answers 200 with a paginated list.
+    """
+    if method == 'POST':
+        if isinstance(body, dict) and all(value is not None for value in body.values()):
+            return 201, {'id': 1, **body}
+        return 400, {'detail': 'invalid'}
+    if method == 'DELETE':
+        return 204, None
+    return 200, {'count': 2, 'results': [{'id': 1, 'type': 'A'}, {'id': 2, 'type': 'A'}]}
+
+
+def _decode_body(body: Any) -> Optional[Any]:
+    if not body:
+        return None
+    if not isinstance(body, (bytes, str)):
+        # A streamed body (e.g. `JsonStream`) is drained chunk by chunk and not kept,
+        # like a bulk endpoint would do with a body too large to hold.
+        for _ in body:
+            pass
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+class InMemoryTransport(BaseAdapter):
+    """
+    A `requests` transport adapter that answers requests in-process,
+    so the benchmarks measure eagle and not the network.
+
+    Usage:
+        >>> client = AuthenticatedHttpClient(endpoint='http://bench.local')
+        >>> client.mount('http://bench.local', InMemoryTransport())
+    """
+
+    def __init__(self, handler: Optional[Handler] = None) -> None:
+        super().__init__()
+        self.handler = handler or default_handler
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        status_code, body = self.handler(request.method, request.url, _decode_body(request.body))
+        response = Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response._content = b'' if body is None else json.dumps(body).encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class LocalStandInServer:
+    """
+    A threaded HTTP server bound to localhost that answers with `handler`.
+    It is used when the benchmark should include a real socket round trip.
+
+    Usage:
+        >>> with LocalStandInServer() as server:
+        >>>     client = AuthenticatedHttpClient(endpoint=server.endpoint)
+    """
+
+    def __init__(self, handler: Optional[Handler] = None, host: str = '127.0.0.1', port: int = 0) -> None:
+        self.handler = handler or default_handler
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    def _build_request_handler(self):
+        handler = self.handler
+
+        class RequestHandler(BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1'
+
+            def _answer(self):
+                if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+                    body = self._drain_chunks()
+                else:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    body = _decode_body(self.rfile.read(length)) if length else None
+                status_code, data = handler(self.command, self.path, body)
+                content = b'' if data is None else json.dumps(data).encode('utf-8')
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def _drain_chunks(self) -> None:
+                # Chunked bodies are read and dropped, see `_decode_body`.
+                while True:
+                    size = int(self.rfile.readline().split(b';')[0], 16)
+                    self.rfile.read(size + 2)
+                    if size == 0:
+                        return None
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _answer
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return RequestHandler
+
+    def start(self) -> 'LocalStandInServer':
+        self._server = ThreadingHTTPServer((self.host, self.port), self._build_request_handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'LocalStandInServer':
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
@@ -1,7 +1,8 @@
 from typing import Optional
 import click
 import os
-from eagle.runner import Runner
+from eagle.runner import Runner, load_client
+from eagle.resources import resources
 
 
 @click.group()
@@ -13,11 +14,68 @@ def runner_cli():
 @click.option('--root_path', '-d', help='Test root directory')
 @click.option('--exclude', '-e', help='Exclude test directory')
 @click.option('--prefix', '-p', help='Test case prefix')
+@click.option('--trace-file', help='Export trace spans to this file (OTLP JSON lines)')
+@click.option('--metrics-port', type=int, help='Serve Prometheus metrics on this local port during the run')
+@click.option('--seed', type=int, help='Seed of the generated payloads, a random seed is used and reported if omitted')
+@click.option('--case', 'case_id', help='Only generate and run the case with this id (use with the seed of the run)')
+@click.option('--no-cleanup', is_flag=True, help='Keep the resources created by the run, `eagle cleanup` deletes them later')
 def run(
     root_path: Optional[str] = None,
     exclude: Optional[str] = None,
     prefix: Optional[str] = None,
+    trace_file: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    seed: Optional[int] = None,
+    case_id: Optional[str] = None,
+    no_cleanup: bool = False,
 ):  # sourcery skip: avoid-builtin-shadow
     if root_path is None:
         root_path = os.getcwd()
-    Runner(root_path=root_path, prefix=prefix).run()
+    Runner(
+        root_path=root_path,
+        prefix=prefix,
+        trace_file=trace_file,
+        metrics_port=metrics_port,
+        seed=seed,
+        case_id=case_id,
+        cleanup=not no_cleanup,
+    ).run()
+
+
+@runner_cli.command(name='list')
+@click.option('--root_path', '-d', help='Test root directory')
+@click.option('--prefix', '-p', help='Test case prefix')
+def list_test_cases(
+    root_path: Optional[str] = None,
+    prefix: Optional[str] = None,
+):
+    """List the registered test cases, without generating any case or sending any request."""
+    if root_path is None:
+        root_path = os.getcwd()
+    test_cases = Runner(root_path=root_path, prefix=prefix).list_test_cases()
+    for test_case in test_cases:
+        click.echo(f'{test_case.module}.{test_case.name}')
+    click.echo(f'{len(test_cases)} test cases.')
+
+
+@runner_cli.command()
+@click.option('--root_path', '-d', help='Test root directory, its client.py deletes the resources')
+@click.option('--client-path', help='Path of the module defining the client')
+@click.option('--concurrency', '-c', type=int, default=8, help='Maximum number of DELETE requests in flight')
+def cleanup(
+    root_path: Optional[str] = None,
+    client_path: Optional[str] = None,
+    concurrency: int = 8,
+):
+    """Delete the resources left by interrupted runs or runs with --no-cleanup."""
+    if root_path is None:
+        root_path = os.getcwd()
+    client = load_client(root_path, client_path)
+    pending = resources.load()
+    if not pending:
+        click.echo('Nothing to clean up.')
+        return
+    result = resources.cleanup(client=client, concurrency=concurrency)
+    click.echo(f'Deleted {len(result.deleted)} of {len(pending)} resources.')
+    for resource in result.failed:
+        click.echo(f'Not deleted: {resource.url}')
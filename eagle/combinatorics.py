@@ -0,0 +1,160 @@
+import random
+from bisect import bisect, insort
+from collections import defaultdict, namedtuple
+from itertools import combinations, product
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
+from eagle.seed import get_random
+
+
+T = TypeVar('T')
+
+# A t-tuple to cover: the dimensions it spans and the value (index) of each.
+Interaction = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+
+class CoveringArray(namedtuple('CoveringArray', ['rows', 'covered', 'total'])):
+    """
+    Rows of a covering array, each row holds the index of the value of every dimension.
+    `covered` of the `total` t-tuples are in at least one row (all of them unless a budget stopped the array).
+    """
+    __slots__ = ()
+
+    @property
+    def coverage(self) -> float:
+        return self.covered / self.total if self.total else 1.0
+
+
+def _iter_interactions(sizes: Sequence[int], strength: int, skip_default: bool) -> Iterator[Interaction]:
+    for dimensions in combinations(range(len(sizes)), strength):
+        for values in product(*(range(sizes[dimension]) for dimension in dimensions)):
+            if skip_default and not any(values):
+                continue
+            yield dimensions, values
+
+
+def _iter_candidate_keys(interactions: Iterable[Interaction]) -> Iterator[Tuple[Tuple[Tuple[int, ...], Tuple[int, ...], int], int]]:
+    for dimensions, values in interactions:
+        for index, dimension in enumerate(dimensions):
+            others = dimensions[:index] + dimensions[index + 1:]
+            yield (others, values[:index] + values[index + 1:], dimension), values[index]
+
+
+def covering_array(
+    sizes: Sequence[int],
+    strength: int = 2,
+    budget: Optional[int] = None,
+    skip_default: bool = False,
+    random_: Optional[random.Random] = None,
+) -> CoveringArray:
+    """
+    Build a t-wise covering array greedily: every combination of values of any `strength` dimensions
+    is in at least one row, with far fewer rows than the full product of the dimensions.
+
+    Each row starts from a t-tuple that is not covered yet, then every other dimension takes
+    the value covering the most new t-tuples with the dimensions already set.
+
+    Args:
+        sizes (Sequence[int]): The number of values of each dimension.
+        strength (int): The `t` of t-wise, 1 covers every value, 2 every pair of values (pairwise).
+        budget (int, optional): Maximum number of rows. The array stops there even if it does not
+            cover everything, see `CoveringArray.coverage`.
+        skip_default (bool): Value 0 of each dimension is its default (e.g. a valid value, or no filter).
+            t-tuples made of defaults only do not need to be covered.
+        random_ (random.Random, optional): Generator used to break ties, defaults to the current generator.
+
+    Usage:
+        >>> covering_array([3, 3, 3, 3]).rows
+        [(0, 0, 0, 0), (1, 1, 1, 0), ...]   # 9 to 11 rows instead of 81
+    """
+    random_ = random_ or get_random()
+    sizes = list(sizes)
+    strength = min(strength, len(sizes))
+    if strength <= 0 or not all(sizes):
+        return CoveringArray(rows=[], covered=0, total=0)
+
+    # Rows are started from the first uncovered t-tuple in this (lexicographic) order.
+    pending = list(_iter_interactions(sizes, strength, skip_default))
+    uncovered: Set[Interaction] = set(pending)
+    total = len(uncovered)
+
+    # For a dimension and the values of `strength - 1` other dimensions,
+    # the values of the dimension that still make an uncovered t-tuple with them.
+    candidates: Dict[Tuple[Tuple[int, ...], Tuple[int, ...], int], Set[int]] = defaultdict(set)
+    for key, value in _iter_candidate_keys(uncovered):
+        candidates[key].add(value)
+
+    rows: List[Tuple[int, ...]] = []
+    position = 0
+
+    while uncovered and (budget is None or len(rows) < budget):
+        while pending[position] not in uncovered:
+            position += 1
+        seed_dimensions, seed_values = pending[position]
+        row: List[Optional[int]] = [None] * len(sizes)
+        for dimension, value in zip(seed_dimensions, seed_values):
+            row[dimension] = value
+
+        assigned = list(seed_dimensions)
+        covered = [(seed_dimensions, seed_values)]
+        remaining = [dimension for dimension in range(len(sizes)) if row[dimension] is None]
+        random_.shuffle(remaining)
+        for dimension in remaining:
+            scores = [0] * sizes[dimension]
+            matches = []
+            for others in combinations(assigned, strength - 1):
+                other_values = tuple(map(row.__getitem__, others))
+                values = candidates.get((others, other_values, dimension))
+                if values:
+                    matches.append((others, other_values, values))
+                    for value in values:
+                        scores[value] += 1
+            best_score = max(scores)
+            value = random_.choice([value for value, score in enumerate(scores) if score == best_score])
+            row[dimension] = value
+
+            # Every t-tuple of the row is seen once, when the last of its dimensions is set.
+            for others, other_values, values in matches:
+                if value in values:
+                    index = bisect(others, dimension)
+                    covered.append((
+                        others[:index] + (dimension,) + others[index:],
+                        other_values[:index] + (value,) + other_values[index:],
+                    ))
+            insort(assigned, dimension)
+
+        rows.append(tuple(row))
+        uncovered.difference_update(covered)
+        for key, value in _iter_candidate_keys(covered):
+            candidates[key].discard(value)
+
+    return CoveringArray(rows=rows, covered=total - len(uncovered), total=total)
+
+
+def stratified_sample(
+    strata: Sequence[Sequence[T]],
+    budget: int,
+    random_: Optional[random.Random] = None,
+) -> List[T]:
+    """
+    Pick `budget` items, round robin across the strata and at random within each stratum:
+    every stratum has an item before any has two, and the strata sizes differ by one at most
+    until the smaller strata run out.
+
+    Args:
+        strata (Sequence[Sequence[T]]): The items, grouped (e.g. the values of each filter).
+        random_ (random.Random, optional): Generator picking the items, defaults to the current generator.
+
+    Usage:
+        >>> stratified_sample([['a', 'b', 'c'], ['x'], ['1', '2']], 4)
+        ['b', 'x', '2', 'a']
+    """
+    random_ = random_ or get_random()
+    shuffled = [random_.sample(list(stratum), len(stratum)) for stratum in strata]
+    sample: List[T] = []
+    for rank in range(max(map(len, shuffled), default=0)):
+        for stratum in shuffled:
+            if len(sample) >= budget:
+                return sample
+            if rank < len(stratum):
+                sample.append(stratum[rank])
+    return sample
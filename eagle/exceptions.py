@@ -10,3 +10,11 @@ class APIAuthFailedException(AppException):
 
 class APIServerErrorException(AppException):
     ...
+
+
+class OpenAPIImportError(AppException):
+    ...
+
+
+class FixtureError(AppException):
+    ...
@@ -1,35 +1,94 @@
 import inspect
-from typing import List, Dict, Union, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from collections import namedtuple
+from itertools import count
 from eagle.faker.fields import Field
 from eagle.faker.enums import InvalidProviderType
-from eagle.faker.invalid import InvalidValue, InvalidDictValue
+from eagle.faker.invalid import InvalidDictValue
+from eagle.payload import DELETED, PayloadOverlay
 import copy
-from eagle.faker.constraint import RelationConstraint
+import random
+from eagle.faker.constraint import RelationConstraint, CompiledRelationConstraints
 from eagle.logger import logger
 from eagle.faker.managers import AutoTestCaseManager, Manager
+from eagle.combinatorics import covering_array
+from eagle.seed import get_seed, seeded_random, use_random
+from eagle.settings.bases import app_settings
+from eagle.utils import get_record_builder
 
 
-class InvalidData(namedtuple('InvalidData', ['data', 'field_name', 'invalid_reason', 'whold_field'])):
+# The number of the next faker of each class without a key, see `Faker.__init__`.
+_instance_counters: Dict[type, Iterator[int]] = {}
+
+# The key of an invalid data is `<field_name>#<index>`,
+# `@relation#<index>` for the invalid data of relation constraints,
+# or `@combination#<index>` for the invalid data combining several fields.
+RELATION_INVALID_DATA_KEY = '@relation'
+COMBINATION_INVALID_DATA_KEY = '@combination'
+
+
+class InvalidData(namedtuple('InvalidData', ['data', 'field_name', 'invalid_reason', 'whold_field', 'key'], defaults=(None,))):
+    __slots__ = ()
+
+
+class InvalidVariant(namedtuple('InvalidVariant', ['key', 'field_name', 'invalid_reason', 'whold_field'])):
+    """An invalid data listed without its payload, see `Faker.list_invalid_variants`."""
+    __slots__ = ()
+
+
+class InvalidChange(namedtuple('InvalidChange', ['invalid_reason', 'whold_field', 'value'])):
+    """The invalid value set on a field, `DELETED` if the field is removed."""
+    __slots__ = ()
+
+
+class FieldPlan(namedtuple(
+    'FieldPlan',
+    ['name', 'field', 'required', 'generate_valid_value', 'generate_valid_values', 'invalid_providers']
+)):
+    """
+    A field of a Faker class with its generators and invalid value providers bound once, when the class is created.
+    """
     __slots__ = ()
 
+    @classmethod
+    def from_field(cls, name: str, field: Field) -> 'FieldPlan':
+        return cls(
+            name=name,
+            field=field,
+            required=field.required,
+            generate_valid_value=field.generate_valid_value,
+            generate_valid_values=field.generate_valid_values,
+            invalid_providers=tuple(field.get_invalid_providers()),
+        )
+
 
 class RegisterFieldMetaclass(type):
     """
     This metaclass sets a dictionary named `_declared_fields` on the class.
     Any instances of `Field` included as attributes on either the class
     or on any of its superclasses will be included in the
-    `_declared_fields` dictionary.
+    `_declared_fields` dictionary, the fields of the superclasses first.
+    A subclass removes an inherited field by setting its name to None.
+
+    It also compiles the generation plan of the class once:
+    `_generation_plan` is the ordered tuple of `FieldPlan`, and `_field_plans` maps field names to them.
     """
 
     def __new__(cls, name, bases, class_attrs, **kwargs):
         new_cls = super().__new__(cls, name, bases, class_attrs, **kwargs)
         if not inspect.isabstract(new_cls):
-            new_cls._declared_fields = {
-                field_name: field
-                for field_name, field in new_cls.__dict__.items()
-                if isinstance(field, Field)
-            }
+            declared_fields = {}
+            for klass in reversed(new_cls.__mro__):
+                for field_name, attr in klass.__dict__.items():
+                    if isinstance(attr, Field):
+                        declared_fields[field_name] = attr
+                    elif attr is None:
+                        declared_fields.pop(field_name, None)
+            new_cls._declared_fields = declared_fields
+            new_cls._generation_plan = tuple(
+                FieldPlan.from_field(field_name, field) for field_name, field in declared_fields.items()
+            )
+            new_cls._field_plans = {plan.name: plan for plan in new_cls._generation_plan}
         return new_cls
 
 
@@ -38,8 +97,15 @@ class Faker(metaclass=RegisterFieldMetaclass):
     A generic virtual data generator class that generates valid and invalid data based on declared fields
     and handles relation constraints.
 
+    Args:
+        seed (int, optional): Seed of the generated data. Defaults to the seed of the run (`eagle.seed.set_seed`).
+            Valid data and the invalid data of each field use their own generator derived from the seed,
+            so any invalid data can be generated again on its own with `get_invalid_data(key)`.
+
     Attributes:
         _declared_fields: A dictionary storing declared fields, mapping field names to `eagle.faker.fields.Field` objects.
+            Fields are inherited from the Faker superclasses.
+        _generation_plan (Tuple[FieldPlan, ...]): The declared fields with their bound generators, compiled once per class.
         _invalid_data: A list to store generated invalid data.
         _relation_invalid_data: (List): A list to store invalid data related to relation constraints.
         _valid_data (Dict[str, Any]): A dictionary to store generated valid data.
@@ -47,9 +113,21 @@ class Faker(metaclass=RegisterFieldMetaclass):
     Properties:
         valid_data (Dict[str, Any]): Get the generated valid data. It generates data if not generated already by calling the _generate_valid_data method.
         invalid_data (List[InvalidData]): Get a list of generated invalid data, including invalid field data and data related to relation constraints.
+            The `data` of each item is a `PayloadOverlay` on top of the valid data, call `materialize()` to get a plain dict.
         copy_valid_data (Dict[str, Any]): Get a deep copy of the generated valid data.
         relation_constraints (List[RelationConstraint]): Get a list of relation constraints used to handle constraints between fields.
 
+    Meta:
+        relation_constraints (List[RelationConstraint]): Relation constraints between fields.
+        invalid_combination_strength (int, optional): Combine the invalid values of several fields
+            in each invalid data instead of one invalid data per (field, invalid reason).
+            The invalid data are the rows of a t-wise covering array of the fields, with t the strength:
+            each field is valid or takes one of its invalid values, and every combination of states
+            of any t fields is in some invalid data (1: every invalid value is sent once, 2: pairwise).
+            Relation constraints still have one invalid data each.
+        invalid_case_budget (int, optional): Maximum number of combined invalid data. Enables the combination
+            (pairwise by default) when `invalid_combination_strength` is not set.
+
     Usage:
         >>> from eagle.faker import Faker
         >>> from eagle.faker.fields import CharField, IntegerField
@@ -64,15 +142,34 @@ class Faker(metaclass=RegisterFieldMetaclass):
     """
 
     _declared_fields: Dict[str, Field] = {}
+    _generation_plan: Tuple[FieldPlan, ...] = ()
+    _field_plans: Dict[str, FieldPlan] = {}
 
     cases = AutoTestCaseManager()
     objects = Manager()
 
-    def __init__(self) -> None:
+    def __init__(self, seed: Optional[int] = None, key: Optional[str] = None) -> None:
+        """
+        Args:
+            seed (int, optional): Seed of the generated data, defaults to the seed of the run.
+            key (str, optional): Distinguishes the data of this faker from the data of the other fakers
+                of the class with the same seed, e.g. the id of the cases it generates, so they are generated
+                again by `eagle run --seed <seed> --case <case_id>`. Defaults to the number of the faker
+                among the fakers of the class created so far: each new faker generates new data.
+        """
+        self.seed = get_seed() if seed is None else seed
+        self.key = next(_instance_counters.setdefault(type(self), count())) if key is None else key
         self._invalid_data: List[InvalidData] = []
         self._relation_invalid_data = []
         self._valid_data: Dict[str, Any] = {}
 
+    def random_for(self, *parts: Any) -> random.Random:
+        """
+        The generator of one part of the generated data, derived from the seed, the faker class, its key and `parts`.
+        Without a seed it is the current generator.
+        """
+        return seeded_random(self.seed, type(self).__qualname__, self.key, *parts)
+
     @property
     def valid_data(self) -> Dict[str, Any]:
         if not self._valid_data:
@@ -93,79 +190,261 @@ class Faker(metaclass=RegisterFieldMetaclass):
         self._invalid_data.append(invalid_data)
 
     def _generate_valid_data(self) -> Dict[str, Any]:
-        valid_data = {
-            field_name: field.generate_valid_value()
-            for field_name, field in self._declared_fields.items()
-        }
-        logger.info(f'Generate valid data: {valid_data}')
-        valid_data = self.check_relation_constraint(valid_data)
+        with use_random(self.random_for('valid')):
+            valid_data = {
+                plan.name: plan.generate_valid_value()
+                for plan in self._generation_plan
+            }
+            logger.info(f'Generate valid data: {valid_data}')
+            valid_data = self.check_relation_constraint(valid_data)
         return valid_data
 
-    def check_relation_constraint(self, valid_data) -> bool:
-        for relation_constraint in self.relation_constraints:
-            condition = relation_constraint.condition
+    def apply_relation_constraints(self, valid_data) -> List[Tuple[Any, Any]]:
+        """
+        Change `valid_data` in place so that it satisfies the relation constraints.
 
-            # If condition is not satisfied
-            # then skip this relation constraint
-            if not condition.check(valid_data):
-                continue
+        Returns:
+            List[Tuple[BaseDictValue, BaseDictValue]]: The (constraint, condition) pairs
+                whose condition is true for `valid_data`.
+        """
+        return self.compiled_relation_constraints.apply(valid_data)
 
-            logger.info(f'Condition: {condition.get_repr_condition()} is True')
-
-            for constraint in relation_constraint.constraints:
-
-                # If constraint is satisfied
-                # then set valid value for constraint
-                if not constraint.check(valid_data):
-                    logger.info(f'Constraint {constraint.get_repr_condition()} is False. change valid value.')
-                    constraint.set_valid_value(valid_data)
+    def check_relation_constraint(self, valid_data) -> bool:
+        applied_constraints = self.apply_relation_constraints(valid_data)
 
-                # Generate invalid data
-                valid_data = copy.deepcopy(valid_data)
-                self._relation_invalid_data.append(
-                    constraint.generate_invalid_data(valid_data, condition)
-                )
-                logger.info(f'Generate invalid data for constraint {constraint.get_repr_condition()}')
+        # Generate invalid data once the valid data is final.
+        # Each invalid data is an overlay on the valid data,
+        # so it differs from it by the violated constraint only.
+        for constraint, condition in applied_constraints:
+            logger.info(f'Condition: {condition.get_repr_condition()} is True')
+            invalid_data = constraint.generate_invalid_data(valid_data, condition)
+            self._relation_invalid_data.append(
+                invalid_data._replace(key=f'{RELATION_INVALID_DATA_KEY}#{len(self._relation_invalid_data)}')
+            )
+            logger.info(f'Generate invalid data for constraint {constraint.get_repr_condition()}')
 
         return valid_data
 
-    def _generate_missing_required_data(self, field_name: str) -> InvalidData:
-        missing_require_data = self.copy_valid_data
-        del missing_require_data[field_name]
-        self.add_invalid_data(
+    @classmethod
+    def iter_many(cls, n: Optional[int] = None, batch_size: int = 10000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream valid records, `n` of them or endlessly if `n` is None.
+
+        The records are generated field by field, `batch_size` at a time,
+        with the batch generation of the fields (vectorized with NumPy when it is installed).
+        Relation constraints are applied to every record, no invalid data is generated.
+
+        Usage:
+            >>> for record in UserFaker.iter_many(1_000_000):
+                    ...
+        """
+        faker = cls()
+        random_ = faker.random_for('many')
+        build_records = get_record_builder(tuple(plan.name for plan in cls._generation_plan))
+        generators = [plan.generate_valid_values for plan in cls._generation_plan]
+        compiled_relation_constraints = faker.compiled_relation_constraints
+
+        generated = 0
+        while n is None or generated < n:
+            size = batch_size if n is None else min(batch_size, n - generated)
+            # The generator is only switched while a batch is generated, never across a `yield`.
+            with use_random(random_):
+                columns = [generate_valid_values(size) for generate_valid_values in generators]
+                records = build_records(columns) if columns else [{} for _ in range(size)]
+                if compiled_relation_constraints.steps:
+                    for record in records:
+                        compiled_relation_constraints.apply(record, collect=False)
+            yield from records
+            generated += size
+
+    @classmethod
+    def generate_many(cls, n: int, batch_size: int = 10000) -> List[Dict[str, Any]]:
+        """
+        Generate `n` valid records, see `iter_many`.
+
+        Usage:
+            >>> UserFaker.generate_many(3)
+            [{'name': 'eagle', 'age': 20}, {'name': 'Tom', 'age': 18}, {'name': 'x1', 'age': 7}]
+        """
+        return list(cls.iter_many(n, batch_size=batch_size))
+
+    def _generate_field_invalid_changes(self, plan: FieldPlan) -> List[InvalidChange]:
+        """
+        The invalid values of a field, in the order of their keys (`<field_name>#<index>`).
+        The first one is the removal of the field if it is required.
+        """
+        changes = []
+        with use_random(self.random_for('invalid', plan.name)):
+            if plan.required:
+                changes.append(InvalidChange(InvalidProviderType.MISSING_REQUIRE.value, plan.name, DELETED))
+
+            for provider in plan.invalid_providers:
+                invalid = provider()
+                for invalid_value in invalid if isinstance(invalid, list) else [invalid]:
+                    whold_field = plan.name
+                    if isinstance(invalid_value, InvalidDictValue):
+                        whold_field = f'{plan.name}.{invalid_value.sub_field}'
+                    changes.append(InvalidChange(invalid_value.type, whold_field, invalid_value.value))
+        return changes
+
+    def _generate_field_invalid_data(self, plan: FieldPlan) -> List[InvalidData]:
+        # The valid data is generated first so that it never uses the generator of the field.
+        valid_data = self.valid_data
+        return [
             InvalidData(
-                data=missing_require_data,
-                field_name=field_name,
-                invalid_reason=InvalidProviderType.MISSING_REQUIRE.value,
-                whold_field=field_name
+                data=PayloadOverlay(valid_data).set(plan.name, change.value),
+                field_name=plan.name,
+                invalid_reason=change.invalid_reason,
+                whold_field=change.whold_field,
+                key=f'{plan.name}#{index}'
             )
+            for index, change in enumerate(self._generate_field_invalid_changes(plan))
+        ]
+
+    def _combine_invalid_changes(self) -> List[List[Tuple[FieldPlan, InvalidChange]]]:
+        """
+        Combine the invalid values of the fields along a covering array, see `Meta.invalid_combination_strength`.
+        """
+        field_changes = [self._generate_field_invalid_changes(plan) for plan in self._generation_plan]
+        # Value 0 of each field is its valid value.
+        array = covering_array(
+            [len(changes) + 1 for changes in field_changes],
+            strength=self.invalid_combination_strength or 2,
+            budget=self.invalid_case_budget,
+            skip_default=True,
+            random_=self.random_for('combination'),
         )
+        logger.info(
+            f'Combine invalid data of {len(field_changes)} fields in {len(array.rows)} invalid data, '
+            f'coverage: {array.coverage:.1%}'
+        )
+        return [
+            [
+                (self._generation_plan[field], field_changes[field][value - 1])
+                for field, value in enumerate(row) if value
+            ]
+            for row in array.rows
+        ]
+
+    def _iter_combined_invalid_data(self) -> Iterator[InvalidData]:
+        for index, combined in enumerate(self._combine_invalid_changes()):
+            yield InvalidData(
+                data=PayloadOverlay(self.valid_data, {(plan.name,): change.value for plan, change in combined}),
+                field_name=','.join(plan.name for plan, _ in combined),
+                invalid_reason=','.join(f'{change.whold_field}:{change.invalid_reason}' for _, change in combined),
+                whold_field=','.join(change.whold_field for _, change in combined),
+                key=f'{COMBINATION_INVALID_DATA_KEY}#{index}'
+            )
 
-    def _generate_invalid_data(self) -> List[InvalidData]:
-        for field_name, field in self._declared_fields.items():
-            # Add missing required data
-            if field.required:
-                self._generate_missing_required_data(field_name)
-
-            invalid_values: List[Union[InvalidValue, InvalidDictValue]] = field.generate_invalid_values()
-
-            for invalid_value in invalid_values:
-
-                valid_data_copy = self.copy_valid_data
-                valid_data_copy[field_name] = invalid_value.value
-                whold_field = field_name
+    def _iter_field_invalid_data(self) -> Iterator[InvalidData]:
+        if self.combines_invalid_data:
+            yield from self._iter_combined_invalid_data()
+            return
 
-                if isinstance(invalid_value, InvalidDictValue):
-                    whold_field = f'{field_name}.{invalid_value.sub_field}'
+        for plan in self._generation_plan:
+            yield from self._generate_field_invalid_data(plan)
 
-                self.add_invalid_data(
-                    InvalidData(
-                        data=valid_data_copy,
-                        field_name=field_name,
-                        invalid_reason=invalid_value.type,
-                        whold_field=whold_field
-                    )
+    def _generate_invalid_data(self) -> List[InvalidData]:
+        for invalid_data in self._iter_field_invalid_data():
+            self.add_invalid_data(invalid_data)
+
+    def iter_invalid_data(self) -> Iterator[InvalidData]:
+        """
+        Generate the invalid data one field at a time, in the order of `invalid_data`, without keeping them.
+        The first invalid data is ready without waiting for the others, and only the invalid data
+        of one field are in memory at once (all of them in combination mode, see `Meta`).
+
+        Usage:
+            >>> for invalid_data in UserFaker().iter_invalid_data():
+                    ...
+        """
+        if self._invalid_data:
+            yield from self.invalid_data
+            return
+
+        yield from self._iter_field_invalid_data()
+        self.valid_data
+        yield from self._relation_invalid_data
+
+    def list_invalid_variants(self) -> List[InvalidVariant]:
+        """
+        List the invalid data of the fields (see `invalid_data`) without generating the payloads:
+        only the invalid values are generated, not the valid data they are set on.
+        The invalid data of relation constraints depend on the valid data and are not listed.
+
+        Usage:
+            >>> UserFaker(seed=1).list_invalid_variants()
+            [InvalidVariant(key='name#0', field_name='name', invalid_reason='missing_require', whold_field='name'), ...]
+        """
+        if self.combines_invalid_data:
+            return [
+                InvalidVariant(
+                    key=f'{COMBINATION_INVALID_DATA_KEY}#{index}',
+                    field_name=','.join(plan.name for plan, _ in combined),
+                    invalid_reason=','.join(f'{change.whold_field}:{change.invalid_reason}' for _, change in combined),
+                    whold_field=','.join(change.whold_field for _, change in combined),
                 )
+                for index, combined in enumerate(self._combine_invalid_changes())
+            ]
+        return [
+            InvalidVariant(
+                key=f'{plan.name}#{index}',
+                field_name=plan.name,
+                invalid_reason=change.invalid_reason,
+                whold_field=change.whold_field,
+            )
+            for plan in self._generation_plan
+            for index, change in enumerate(self._generate_field_invalid_changes(plan))
+        ]
+
+    def get_invalid_data(self, key: str) -> InvalidData:
+        """
+        Generate the invalid data with `key` (see `InvalidData.key`) without generating the others.
+        With the same seed it is the same invalid data as in `invalid_data`.
+        """
+        field_name, _, index = key.rpartition('#')
+        if not index.isdigit():
+            raise KeyError(f'Invalid key of invalid data: {key}')
+
+        if field_name == RELATION_INVALID_DATA_KEY:
+            self.valid_data
+            invalid_data = self._relation_invalid_data
+        elif field_name == COMBINATION_INVALID_DATA_KEY and self.combines_invalid_data:
+            invalid_data = list(self._iter_combined_invalid_data())
+        elif field_name in self._field_plans and not self.combines_invalid_data:
+            invalid_data = self._generate_field_invalid_data(self._field_plans[field_name])
+        else:
+            raise KeyError(f'{type(self).__name__} has no field {field_name}')
+
+        if int(index) >= len(invalid_data):
+            raise KeyError(f'{type(self).__name__} has no invalid data {key}')
+        return invalid_data[int(index)]
+
+    def get_selected_invalid_data(self, case_id_prefix: str) -> List[InvalidData]:
+        """
+        The invalid data of the cases whose id is `case_id_prefix` followed by the key of the invalid data.
+        When a single case is selected (`app_settings.CASE_ID`), only its invalid data is generated.
+        """
+        selected_case_id = app_settings.CASE_ID
+        if selected_case_id is None:
+            return self.invalid_data
+        return list(self.iter_selected_invalid_data(case_id_prefix))
+
+    def iter_selected_invalid_data(self, case_id_prefix: str) -> Iterator[InvalidData]:
+        """
+        Lazy `get_selected_invalid_data`, see `iter_invalid_data`.
+        """
+        selected_case_id = app_settings.CASE_ID
+        if selected_case_id is None:
+            yield from self.iter_invalid_data()
+            return
+        if not selected_case_id.startswith(case_id_prefix):
+            return
+        try:
+            invalid_data = self.get_invalid_data(selected_case_id[len(case_id_prefix):])
+        except KeyError:
+            return
+        yield invalid_data
 
     def get_relation_constraints(self) -> List[RelationConstraint]:
         if not hasattr(self, 'Meta') or not hasattr(self.Meta, 'relation_constraints'):
@@ -177,6 +456,33 @@ class Faker(metaclass=RegisterFieldMetaclass):
     def relation_constraints(self) -> List[RelationConstraint]:
         return self.get_relation_constraints()
 
+    @property
+    def compiled_relation_constraints(self) -> CompiledRelationConstraints:
+        """
+        The relation constraints compiled once per class,
+        compiled again only if `get_relation_constraints` returns another list.
+        """
+        relation_constraints = self.relation_constraints
+        compiled = type(self).__dict__.get('_compiled_relation_constraints')
+        if compiled is None or compiled.relation_constraints is not relation_constraints:
+            compiled = CompiledRelationConstraints(relation_constraints)
+            type(self)._compiled_relation_constraints = compiled
+        return compiled
+
+    @property
+    def invalid_combination_strength(self) -> Optional[int]:
+        return getattr(getattr(self, 'Meta', None), 'invalid_combination_strength', None)
+
+    @property
+    def invalid_case_budget(self) -> Optional[int]:
+        return getattr(getattr(self, 'Meta', None), 'invalid_case_budget', None)
+
+    @property
+    def combines_invalid_data(self) -> bool:
+        return self.invalid_combination_strength is not None or self.invalid_case_budget is not None
+
     class Meta:
 
         relation_constraints: List[RelationConstraint] = []
+        invalid_combination_strength: Optional[int] = None
+        invalid_case_budget: Optional[int] = None
@@ -1,75 +1,91 @@
-import copy
-import random
-from typing import List, Union, Callable, Any
-from functools import singledispatch
+from typing import Dict, List, Optional, Sequence, Tuple, Union, Callable, Any
+from eagle.payload import PayloadOverlay, Path, as_path
+from eagle.seed import get_random
 
 
-@singledispatch
-def get_dict_value(key, data) -> Any:
-    ...
+# Accessors of a key of a payload, compiled once per key into closures
+# instead of dispatching on the type of the key and walking it on every access.
+# A key is a field name, or a list of names for a nested key.
 
+def compile_getter(key: Union[str, List[str]]) -> Callable[[dict], Any]:
+    path = as_path(key)
+    if len(path) == 1:
+        name = path[0]
 
-@get_dict_value.register(str)
-def _str_key(key: str, data: dict) -> Any:  # noqa
-    return data.get(key)
+        def getter(data):
+            return data.get(name)
+        return getter
 
+    def nested_getter(data):
+        for name in path:
+            if data is None:
+                return None
+            data = data.get(name)
+        return data
+    return nested_getter
 
-@get_dict_value.register(list)
-def _list_key(key: list, data: dict) -> Any:  # noqa
-    for k in key:
-        data = data.get(k)
-    return data
 
+def compile_setter(key: Union[str, List[str]]) -> Callable[[dict, Any], None]:
+    path = as_path(key)
+    parents, name = path[:-1], path[-1]
 
-@singledispatch
-def set_dict_value(key, data, value) -> None:
-    ...
+    def setter(data, value):
+        for parent in parents:
+            data = data.setdefault(parent, {})
+        data[name] = value
+    return setter
 
 
-@set_dict_value.register(str)
-def _str_key(key: str, data: dict, value) -> None:  # noqa
-    data[key] = value
+def compile_exists(key: Union[str, List[str]]) -> Callable[[dict], bool]:
+    path = as_path(key)
+    if len(path) == 1:
+        name = path[0]
 
+        def exists(data):
+            return name in data
+        return exists
 
-@set_dict_value.register(list)
-def _list_key(key: list, data: dict, value) -> None:  # noqa
-    for k in key[:-1]:
-        data = data.setdefault(k, {})
-    data[key[-1]] = value
+    def nested_exists(data):
+        for name in path:
+            if not isinstance(data, dict) or name not in data:
+                return False
+            data = data[name]
+        return True
+    return nested_exists
 
 
-@singledispatch
-def key_exist(key, data) -> bool:
-    ...
+def compile_deleter(key: Union[str, List[str]]) -> Callable[[dict], None]:
+    path = as_path(key)
+    parents, name = path[:-1], path[-1]
 
+    def deleter(data):
+        for parent in parents:
+            data = data[parent]
+        del data[name]
+    return deleter
 
-@key_exist.register(str)
-def _str_key(key: str, data: dict) -> bool:  # noqa
-    return key in data
 
+def get_dict_value(key, data) -> Any:
+    return compile_getter(key)(data)
 
-@key_exist.register(list)
-def _list_key(key: list, data: dict) -> bool:  # noqa
-    for k in key:
-        if k not in data:
-            return False
-        data = data.get(k)
-    return True
 
+def set_dict_value(key, data, value) -> None:
+    compile_setter(key)(data, value)
 
-class BaseDictValue:
 
-    def __init__(self, key: Union[str, List[str]]) -> None:
-        self.key = key
+def key_exist(key, data) -> bool:
+    return compile_exists(key)(data)
 
-    def _get_value(self, data):
-        return get_dict_value(self.key, data)
 
-    def _set_value(self, data, value):
-        set_dict_value(self.key, data, value)
+class BaseDictValue:
 
-    def _key_exist(self, data):
-        return key_exist(self.key, data)
+    def __init__(self, key: Union[str, List[str]]) -> None:
+        self.key = key
+        self.path: Path = as_path(key)
+        self._get_value = compile_getter(key)
+        self._set_value = compile_setter(key)
+        self._key_exist = compile_exists(key)
+        self._delete = compile_deleter(key)
 
     def get_whold_key(self):
         return self.key if isinstance(self.key, str) else '.'.join(self.key)
@@ -78,15 +94,28 @@ class BaseDictValue:
         return self.key
 
     def delete(self, data):
-        if isinstance(self.key, str):
-            del data[self.key]
-        else:
-            to_delete_key = self.key[-1]
-            for key in self.key:
-                if key == to_delete_key:
-                    break
-                data = data.get(key)
-            del data[to_delete_key]
+        self._delete(data)
+
+    def check(self, data) -> bool:
+        raise NotImplementedError
+
+    def compile_check(self) -> Callable[[dict], bool]:
+        """
+        A function doing the same as `check`, used by `CompiledRelationConstraints`.
+        Subclasses overriding `check` must override it too.
+        """
+        return self.check
+
+    def get_check_key(self) -> Tuple[Any, ...]:
+        """
+        Two values with the same check key have the same `check` result on the same data.
+        """
+        return (type(self), self.get_repr_condition())
+
+    def overlaps(self, other: 'BaseDictValue') -> bool:
+        """Whether setting the key of `other` may change the value at the key of `self`, or the opposite."""
+        size = min(len(self.path), len(other.path))
+        return self.path[:size] == other.path[:size]
 
 
 class DictValueEqual(BaseDictValue):
@@ -98,6 +127,10 @@ class DictValueEqual(BaseDictValue):
     def check(self, data):
         return self._get_value(data) == self.expected
 
+    def compile_check(self):
+        get_value, expected = self._get_value, self.expected
+        return lambda data: get_value(data) == expected
+
     def set_valid_value(self, data):
         self._set_value(data, self.expected)
 
@@ -114,8 +147,12 @@ class DictValueIn(BaseDictValue):
     def check(self, data):
         return self._get_value(data) in self.expecteds
 
+    def compile_check(self):
+        get_value, expecteds = self._get_value, self.expecteds
+        return lambda data: get_value(data) in expecteds
+
     def set_valid_value(self, data):
-        self._set_value(data, random.choice(self.expecteds))
+        self._set_value(data, get_random().choice(self.expecteds))
 
     def get_repr_condition(self):
         return f'{self.key} in {self.expecteds}'
@@ -130,6 +167,9 @@ class DictKeyExist(BaseDictValue):
     def check(self, data):
         return self._key_exist(data)
 
+    def compile_check(self):
+        return self._key_exist
+
     def set_valid_value(self, data):
         self._set_value(data, self.default)
 
@@ -138,8 +178,7 @@ class DictKeyExist(BaseDictValue):
 
     def generate_invalid_data(self, data, condition: BaseDictValue):
         from eagle.faker.bases import InvalidData
-        invalid_data = copy.deepcopy(data)
-        self.delete(invalid_data)
+        invalid_data = PayloadOverlay(data).delete(self.key)
         return InvalidData(
             data=invalid_data,
             field_name=self.get_whold_key(),
@@ -155,6 +194,10 @@ class DictKeyDoesNotExist(BaseDictValue):
     def check(self, data):
         return not self._key_exist(data)
 
+    def compile_check(self):
+        key_exist = self._key_exist
+        return lambda data: not key_exist(data)
+
     def set_valid_value(self, data):
         self.delete(data)
 
@@ -163,8 +206,7 @@ class DictKeyDoesNotExist(BaseDictValue):
 
     def generate_invalid_data(self, data, condition: BaseDictValue):
         from eagle.faker.bases import InvalidData
-        invalid_data = copy.deepcopy(data)
-        self._set_value(invalid_data, None)
+        invalid_data = PayloadOverlay(data).set(self.key, None)
         return InvalidData(
             data=invalid_data,
             field_name=self.get_whold_key(),
@@ -182,6 +224,10 @@ class DictValueNotNull(BaseDictValue):
     def check(self, data):
         return self._get_value(data) is not None
 
+    def compile_check(self):
+        get_value = self._get_value
+        return lambda data: get_value(data) is not None
+
     def set_valid_value(self, data):
         self._set_value(data, self.default)
 
@@ -190,8 +236,7 @@ class DictValueNotNull(BaseDictValue):
 
     def generate_invalid_data(self, data, condition: BaseDictValue):
         from eagle.faker.bases import InvalidData
-        invalid_data = copy.deepcopy(data)
-        self._set_value(invalid_data, None)
+        invalid_data = PayloadOverlay(data).set(self.key, None)
         return InvalidData(
             data=invalid_data,
             field_name=self.get_whold_key(),
@@ -205,3 +250,83 @@ class RelationConstraint:
     def __init__(self, condition: BaseDictValue, constraints: List[BaseDictValue]) -> None:
         self.condition = condition
         self.constraints = constraints
+
+
+class CompiledRelationConstraints:
+    """
+    Relation constraints compiled once per `Faker` class.
+
+    Conditions with the same check key (e.g. the same `DictValueIn` shared by several relation constraints)
+    are checked once per payload, their result is reused until a constraint changes a key it reads.
+
+    Usage:
+        >>> compiled = CompiledRelationConstraints(UserFaker.Meta.relation_constraints)
+        >>> compiled.apply(data)
+        [(DictKeyExist, DictValueEqual), ...]
+    """
+
+    def __init__(self, relation_constraints: Sequence[RelationConstraint]) -> None:
+        self.relation_constraints = relation_constraints
+        condition_indexes: Dict[Tuple[Any, ...], int] = {}
+        conditions: List[BaseDictValue] = []
+        for relation_constraint in relation_constraints:
+            check_key = relation_constraint.condition.get_check_key()
+            if check_key not in condition_indexes:
+                condition_indexes[check_key] = len(conditions)
+                conditions.append(relation_constraint.condition)
+
+        self.condition_checks = [condition.compile_check() for condition in conditions]
+
+        # (condition index, condition,
+        #  [(constraint, its compiled check, indexes of the conditions its valid value may change)])
+        self.steps = [
+            (
+                condition_indexes[relation_constraint.condition.get_check_key()],
+                relation_constraint.condition,
+                [
+                    (
+                        constraint,
+                        constraint.compile_check(),
+                        tuple(index for index, condition in enumerate(conditions) if condition.overlaps(constraint)),
+                    )
+                    for constraint in relation_constraint.constraints
+                ],
+            )
+            for relation_constraint in relation_constraints
+        ]
+
+    def apply(self, data: dict, collect: bool = True) -> List[Tuple[BaseDictValue, BaseDictValue]]:
+        """
+        Change `data` in place so that it satisfies the relation constraints.
+
+        Args:
+            collect (bool): Whether to return the applied constraints.
+
+        Returns:
+            List[Tuple[BaseDictValue, BaseDictValue]]: The (constraint, condition) pairs whose condition is true for `data`,
+                empty if `collect` is False.
+        """
+        condition_checks = self.condition_checks
+        results: List[Optional[bool]] = [None] * len(condition_checks)
+        applied_constraints = []
+        for condition_index, condition, constraints in self.steps:
+            result = results[condition_index]
+            if result is None:
+                result = results[condition_index] = condition_checks[condition_index](data)
+            # If condition is not satisfied
+            # then skip this relation constraint
+            if not result:
+                continue
+
+            for constraint, check, changed_conditions in constraints:
+                # If constraint is not satisfied
+                # then set valid value for constraint
+                if not check(data):
+                    constraint.set_valid_value(data)
+                    for index in changed_conditions:
+                        results[index] = None
+
+                if collect:
+                    applied_constraints.append((constraint, condition))
+
+        return applied_constraints
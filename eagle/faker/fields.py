@@ -1,10 +1,13 @@
 import abc
 import inspect
+from functools import partial
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, Type
-import random
 import string
 from eagle.faker.enums import FieldType
 from eagle.faker.invalid import InvalidValueProvider, InvalidValue
+from eagle.payload import StreamedList
+from eagle.seed import get_random, get_numpy_random
+from eagle.utils import get_record_builder, get_string_generator
 
 
 class Field:
@@ -77,6 +80,15 @@ class Field:
             'You must implement the generate_valid_value() method.'
         )
 
+    def generate_valid_values(self, n: int) -> List[Any]:
+        """
+        Generate `n` valid values at once.
+        Fields override it with a batch implementation when they have one.
+        """
+        if self.valid_value is not None:
+            return [self.valid_value] * n
+        return [self.generate_valid_value() for _ in range(n)]
+
     def generate_default_invalid_values(self):
         ret = []
         for invalid_provider_func in self._default_invalid_providers:
@@ -87,18 +99,34 @@ class Field:
                 ret.append(invalid)
         return ret
 
-    def generate_invalid_values(self):
-        invalid_values = []
+    def get_invalid_providers(self) -> List[Callable[[], Any]]:
+        """
+        The invalid value providers of the field bound to it, in the order of `generate_invalid_values`.
+        Each returns an invalid value or a list of them.
+        """
+        providers = []
 
         if self.invalid_values:
-            invalid_values += list(self.invalid_values)
+            invalid_values = list(self.invalid_values)
+            providers.append(lambda: list(invalid_values))
 
         if self.generate_invalid_func:
             assert callable(self.generate_invalid_func), ('generate_invalid_func must be callable.')
-            invalid_values += self.generate_invalid_func(self)
+            providers.append(partial(self.generate_invalid_func, self))
+
+        for invalid_provider_func in self._default_invalid_providers:
+            providers.append(partial(invalid_provider_func, self))
 
-        invalid_values += self.generate_default_invalid_values()
+        return providers
 
+    def generate_invalid_values(self):
+        invalid_values = []
+        for provider in self.get_invalid_providers():
+            invalid = provider()
+            if isinstance(invalid, list):
+                invalid_values.extend(invalid)
+            else:
+                invalid_values.append(invalid)
         return invalid_values
 
 
@@ -109,7 +137,12 @@ class BooleanField(Field):
     def generate_valid_value(self):
         if self.valid_value is not None:
             return self.valid_value
-        return random.choice([True, False])
+        return get_random().choice([True, False])
+
+    def generate_valid_values(self, n: int) -> List[bool]:
+        if self.valid_value is not None:
+            return [self.valid_value] * n
+        return get_random().choices([True, False], k=n)
 
 
 class CharField(Field):
@@ -168,22 +201,63 @@ class CharField(Field):
                 'ascii_letters', 'digits',
             ]
 
+        self.alphabet = ''.join(
+            getattr(string, allow_string) for allow_string in self.allow_strings
+        )
+        self.string_generator = get_string_generator(self.alphabet)
+        self.body_length_range = self.get_body_length_range()
+
         if not self.allow_blank:
             self.register_invalid_provider(InvalidValueProvider.get_blank_value)
 
+    def get_body_length_range(self) -> Tuple[int, int]:
+        """
+        Length range of the random part of the string, once prefix and suffix are taken out
+        of min_length and max_length.
+        """
+        affix_length = len(self.prefix) + len(self.suffix)
+        min_length = max((self.min_length or 0) - affix_length, 0 if affix_length else 1)
+        if self.max_length is None:
+            max_length = min_length + 20
+        else:
+            max_length = self.max_length - affix_length
+        assert max_length >= min_length, 'Prefix and suffix do not fit in max_length'
+        return min_length, max_length
+
     def generate_valid_value(self):
         if self.valid_value is not None:
             return self.valid_value
-        allow_strings = ''.join(
-            getattr(string, allow_string) for allow_string in self.allow_strings
-        )
-        random_length = random.randint(1, 20)
-        random_string = ''.join(random.choice(allow_strings) for _ in range(random_length))
+        random_ = get_random()
+        random_string = self.string_generator.generate(random_.randint(*self.body_length_range), random_)
         random_string = self.prefix + random_string + self.suffix
         if self.allow_blank:
-            random_string = random.choice([random_string, ''])
+            random_string = random_.choice([random_string, ''])
         return random_string
 
+    def generate_valid_values(self, n: int) -> List[str]:
+        if self.valid_value is not None:
+            return [self.valid_value] * n
+        random_ = get_random()
+        numpy_random = get_numpy_random()
+        min_length, max_length = self.body_length_range
+        if min_length == max_length:
+            lengths = [min_length] * n
+        elif numpy_random is not None:
+            lengths = numpy_random.integers(min_length, max_length, n, endpoint=True).tolist()
+        else:
+            lengths = random_.choices(range(min_length, max_length + 1), k=n)
+        values = self.string_generator.generate_many(lengths, random_)
+        if self.prefix or self.suffix:
+            values = [self.prefix + value + self.suffix for value in values]
+
+        if self.allow_blank:
+            if numpy_random is not None:
+                keeps = numpy_random.integers(0, 1, n, endpoint=True).tolist()
+            else:
+                keeps = random_.choices([True, False], k=n)
+            values = [value if keep else '' for value, keep in zip(values, keeps)]
+        return values
+
 
 class IntegerField(Field):
 
@@ -215,15 +289,23 @@ class IntegerField(Field):
     def generate_valid_value(self):
         if self.valid_value is not None:
             return self.valid_value
-        min_value = self.min_value
-        if self.min_value is None:
-            min_value = -1000
-        max_value = self.max_value
-        if self.max_value is None:
-            max_value = 1000
+        min_value, max_value = self.get_value_range()
+        return get_random().randint(min_value, max_value)
 
+    def get_value_range(self) -> Tuple[int, int]:
+        min_value = -1000 if self.min_value is None else self.min_value
+        max_value = 1000 if self.max_value is None else self.max_value
         assert max_value >= min_value, "Maximum value must be greater than or equal to minimum value"
-        return random.randint(min_value, max_value)
+        return min_value, max_value
+
+    def generate_valid_values(self, n: int) -> List[int]:
+        if self.valid_value is not None:
+            return [self.valid_value] * n
+        min_value, max_value = self.get_value_range()
+        numpy_random = get_numpy_random()
+        if numpy_random is not None:
+            return numpy_random.integers(min_value, max_value, n, endpoint=True).tolist()
+        return get_random().choices(range(min_value, max_value + 1), k=n)
 
 
 class ChoiceField(Field):
@@ -255,7 +337,16 @@ class ChoiceField(Field):
     def generate_valid_value(self):
         if self.valid_value is not None:
             return self.valid_value
-        return random.choice(self.choices)
+        return get_random().choice(self.choices)
+
+    def generate_valid_values(self, n: int) -> List[Any]:
+        if self.valid_value is not None:
+            return [self.valid_value] * n
+        numpy_random = get_numpy_random()
+        if numpy_random is not None:
+            choices = self.choices
+            return [choices[index] for index in numpy_random.integers(0, len(choices), n).tolist()]
+        return get_random().choices(self.choices, k=n)
 
 
 class FloatField(IntegerField):
@@ -268,26 +359,40 @@ class FloatField(IntegerField):
     def generate_valid_value(self):
         if self.valid_value is not None:
             return self.valid_value
-        min_value = self.min_value
-        if self.min_value is None:
-            min_value = -1000
-        max_value = self.max_value
-        if self.max_value is None:
-            max_value = 1000
+        min_value, max_value = self.get_value_range()
+        return round(get_random().uniform(min_value, max_value), 2)
 
-        assert max_value >= min_value, "Maximum value must be greater than or equal to minimum value"
-        return round(random.uniform(min_value, max_value), 2)
+    def generate_valid_values(self, n: int) -> List[float]:
+        if self.valid_value is not None:
+            return [self.valid_value] * n
+        min_value, max_value = self.get_value_range()
+        numpy_random = get_numpy_random()
+        if numpy_random is not None:
+            return numpy_random.uniform(min_value, max_value, n).round(2).tolist()
+        uniform = get_random().uniform
+        return [round(uniform(min_value, max_value), 2) for _ in range(n)]
 
 
 class DictField(Field):
 
     field_type = FieldType.DICT.value
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        max_invalid_depth: Optional[int] = 3,
+        max_invalid_variants: Optional[int] = None,
+        **kwargs
+    ):
         """
         Args:
             fields (dict): Dictionary of fields.
+            max_invalid_depth (int, optional): Levels of nested dict and list sub-fields walked for invalid values,
+                None for no limit.
+            max_invalid_variants (int, optional): Maximum number of invalid values of the sub-fields, None for no limit.
         """
+        self.max_invalid_depth = max_invalid_depth
+        self.max_invalid_variants = max_invalid_variants
 
         # Collect sub fields from kwargs.
         super_signature = inspect.signature(super().__init__)
@@ -303,6 +408,13 @@ class DictField(Field):
         self.fields = fields
         self.register_invalid_provider(InvalidValueProvider.get_invalid_dict_value)
 
+    def iter_sub_fields(self, valid_value):
+        """Yield the (key, sub-field, valid value of the sub-field) of a valid value of the field."""
+        if not isinstance(valid_value, dict):
+            return
+        for field_name, field_instance in self.fields.items():
+            yield field_name, field_instance, valid_value.get(field_name)
+
     def generate_valid_value(self):
         if self.valid_value is not None:
             return self.valid_value
@@ -311,6 +423,14 @@ class DictField(Field):
             for field_name, field_instance in self.fields.items()
         }
 
+    def generate_valid_values(self, n: int) -> List[Dict[str, Any]]:
+        if self.valid_value is not None:
+            return [self.valid_value] * n
+        if not self.fields:
+            return [{} for _ in range(n)]
+        columns = [field_instance.generate_valid_values(n) for field_instance in self.fields.values()]
+        return get_record_builder(tuple(self.fields))(columns)
+
 
 class ListField(Field):
 
@@ -320,8 +440,11 @@ class ListField(Field):
         self,
         fields: Optional[List[Field]] = None,
         length: Optional[int] = None,
-        min_length: Optional[int] = 1,
-        max_length: Optional[int] = 10,
+        min_length: Optional[int] = None,
+        max_length: Optional[int] = None,
+        max_invalid_depth: Optional[int] = 3,
+        max_invalid_variants: Optional[int] = None,
+        stream_length: Optional[int] = None,
         *args,
         **kwargs
     ):
@@ -330,22 +453,81 @@ class ListField(Field):
         Args:
             fields (list): List of fields.
             length (int): Length of the list.
-            min_length (int): Minimum length of the list.
-            max_length (int): Maximum length of the list.
+            min_length (int): Minimum length of the list, defaults to 1.
+            max_length (int): Maximum length of the list, defaults to 10.
+                The elements beyond the `fields` repeat them. The invalid lengths (`length`, `min_length` - 1
+                and `max_length` + 1) are only generated for the bounds given.
+            max_invalid_depth (int, optional): Levels of nested dict and list elements walked for invalid values,
+                None for no limit.
+            max_invalid_variants (int, optional): Maximum number of invalid values of the elements, None for no limit.
+            stream_length (int, optional): Large-collection mode, e.g. for bulk imports: the valid value is
+                a `StreamedList` of `stream_length` elements (the `fields` repeated), generated while it is sent
+                with chunked transfer encoding instead of being built in memory.
+                `max_length` still bounds the length-boundary invalid values, set it to at least `stream_length`.
+
+        Usage:
+            >>> items = ListField(fields=[DictField(fields={'name': CharField()})], stream_length=100000, max_length=100000)
         """
         super().__init__(*args, **kwargs)
         self.fields = fields or []
         self.length = length
-        self.min_length = min_length
-        self.max_length = max_length
+        self.min_length = 1 if min_length is None else min_length
+        self.max_length = 10 if max_length is None else max_length
+        self.max_invalid_depth = max_invalid_depth
+        self.max_invalid_variants = max_invalid_variants
+        self.stream_length = stream_length
 
         assert self.max_length >= self.min_length, "Maximum length must be greater than or equal to minimum length"
 
+        if self.fields:
+            self.register_invalid_provider(InvalidValueProvider.get_invalid_list_value)
+            if length is not None or max_length is not None:
+                self.register_invalid_provider(InvalidValueProvider.get_invalid_list_max_length_value)
+            if length or min_length:
+                self.register_invalid_provider(InvalidValueProvider.get_invalid_list_min_length_value)
+
+    def iter_sub_fields(self, valid_value):
+        """Yield the (index, element field, valid element) of a valid value of the field."""
+        if not isinstance(valid_value, list):
+            return
+        for index, (field, element) in enumerate(zip(self.fields, valid_value)):
+            yield index, field, element
+
+    def generate_elements(self, count: int) -> List[Any]:
+        """Generate `count` valid elements, repeating the `fields` as many times as needed."""
+        if not self.fields:
+            return []
+        columns = [
+            field.generate_valid_values(len(range(index, count, len(self.fields))))
+            for index, field in enumerate(self.fields)
+        ]
+        return [columns[index % len(self.fields)][index // len(self.fields)] for index in range(count)]
+
+    def build_list(self, length: int) -> Union[List[Any], StreamedList]:
+        """A list of `length` valid elements, streamed in large-collection mode."""
+        if self.stream_length is not None:
+            return StreamedList(length, self.generate_elements, seed=get_random().getrandbits(64))
+        return self.generate_elements(length)
+
     def generate_valid_value(self):
         if self.valid_value is not None:
             return self.valid_value
-        random_length = self.length or random.randint(self.min_length, self.max_length)
-        return [
-            field.generate_valid_value()
-            for field in self.fields
-        ][:random_length]
+        if self.stream_length is not None:
+            return self.build_list(self.stream_length)
+        random_length = self.length or get_random().randint(self.min_length, self.max_length)
+        return self.generate_elements(random_length)
+
+    def generate_valid_values(self, n: int) -> List[List[Any]]:
+        if self.valid_value is not None:
+            return [self.valid_value] * n
+        if self.stream_length is not None:
+            return [self.build_list(self.stream_length) for _ in range(n)]
+        if not self.fields:
+            return [[] for _ in range(n)]
+        lengths = [self.length] * n if self.length else get_random().choices(range(self.min_length, self.max_length + 1), k=n)
+        # One batch per field for all the lists, element `index` of a list is generated by field `index % len(fields)`.
+        columns = [
+            iter(field.generate_valid_values(sum(len(range(index, length, len(self.fields))) for length in lengths)))
+            for index, field in enumerate(self.fields)
+        ]
+        return [[next(columns[index % len(self.fields)]) for index in range(length)] for length in lengths]
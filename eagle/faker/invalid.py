@@ -1,6 +1,7 @@
-import copy
 from collections import namedtuple
 from eagle.faker.enums import InvalidProviderType
+from itertools import islice
+from eagle.payload import DELETED, PayloadOverlay
 from eagle.utils import generate_random_string
 
 
@@ -37,16 +38,39 @@ class InvalidValueProvider:
     def get_invalid_type_value(cls, field):
         pass
 
+    @classmethod
+    def generate_string(cls, field, length):
+        # Keep to the field's own alphabet when it has one, so only the length is invalid.
+        string_generator = getattr(field, 'string_generator', None)
+        if string_generator is None:
+            return generate_random_string(length)
+        return string_generator.generate(length)
+
     @classmethod
     def get_invalid_max_length_value(cls, field):
         assert field.max_length is not None, "Field must have max_length"
-        value = generate_random_string(field.max_length + 1)
+        value = cls.generate_string(field, field.max_length + 1)
         return InvalidValue(value, InvalidProviderType.EXCEED_MAX_LENGTH.value)
 
     @classmethod
     def get_invalid_min_length_value(cls, field):
         assert field.min_length is not None, "Field must have min_length"
-        value = generate_random_string(field.min_length - 1)
+        value = cls.generate_string(field, field.min_length - 1)
+        return InvalidValue(value, InvalidProviderType.EXCEED_MIN_LENGTH.value)
+
+    @classmethod
+    def get_invalid_list_max_length_value(cls, field):
+        assert field.max_length is not None, "Field must have max_length"
+        value = field.build_list((field.length or field.max_length) + 1)
+        return InvalidValue(value, InvalidProviderType.EXCEED_MAX_LENGTH.value)
+
+    @classmethod
+    def get_invalid_list_min_length_value(cls, field):
+        assert field.min_length is not None, "Field must have min_length"
+        length = (field.length or field.min_length) - 1
+        if length < 0:
+            return []
+        value = field.build_list(length)
         return InvalidValue(value, InvalidProviderType.EXCEED_MIN_LENGTH.value)
 
     @classmethod
@@ -63,30 +87,58 @@ class InvalidValueProvider:
 
     @classmethod
     def get_invalid_dict_value(cls, field):
-        values = []
-
-        for field_name, field_instance in field.fields.items():
-
-            if field_instance.required:
-                valid_value_copy = copy.deepcopy(field.generate_valid_value())
-                del valid_value_copy[field_name]
-                values.append(
-                    InvalidDictValue(
-                        value=valid_value_copy,
-                        type=InvalidProviderType.MISSING_REQUIRE,
-                        sub_field=field_name
-                    )
-                )
-
-            for invalid_value in field_instance.generate_invalid_values():
-                valid_value_copy = copy.deepcopy(field.generate_valid_value())
-                valid_value_copy[field_name] = invalid_value.value
-                values.append(
-                    InvalidDictValue(
-                        value=valid_value_copy,
-                        type=invalid_value.type,
-                        sub_field=field_name
-                    )
-                )
-
-        return values
+        return cls.get_nested_invalid_values(field)
+
+    @classmethod
+    def get_invalid_list_value(cls, field):
+        return cls.get_nested_invalid_values(field)
+
+    @classmethod
+    def get_nested_invalid_values(cls, field):
+        """
+        The invalid values of the sub-fields of a `DictField`, or of the elements of a `ListField`.
+
+        All of them, at every level, are overlays on one valid value of `field`
+        that only store the path they change. Nested dict and list sub-fields are walked
+        down to `field.max_invalid_depth` levels, and at most `field.max_invalid_variants`
+        invalid values are generated.
+        """
+        valid_value = field.generate_valid_value()
+        variants = islice(
+            cls.iter_nested_invalid_values(field, valid_value, max_depth=field.max_invalid_depth),
+            field.max_invalid_variants,
+        )
+        return [
+            InvalidDictValue(
+                value=PayloadOverlay(valid_value).set(path, invalid_value.value),
+                type=invalid_value.type,
+                sub_field='.'.join(str(key) for key in path)
+            )
+            for path, invalid_value in variants
+        ]
+
+    @classmethod
+    def iter_nested_invalid_values(cls, field, valid_value, path=(), depth=1, max_depth=None):
+        """
+        Yield the (path, `InvalidValue`) of the sub-fields of `field`, `path` being relative to `valid_value`.
+        The value of a missing sub-field is `DELETED`.
+        """
+        nested_providers = (cls.get_invalid_dict_value, cls.get_invalid_list_value)
+
+        for key, sub_field, sub_valid_value in field.iter_sub_fields(valid_value):
+            sub_path = path + (key,)
+
+            # Elements of a list can not be missing, they would shift the next ones.
+            if sub_field.required and isinstance(key, str):
+                yield sub_path, InvalidValue(DELETED, InvalidProviderType.MISSING_REQUIRE.value)
+
+            for provider in sub_field.get_invalid_providers():
+                # Nested sub-fields are walked below, on the same valid value.
+                if getattr(provider, 'func', None) in nested_providers:
+                    continue
+                invalid = provider()
+                for invalid_value in invalid if isinstance(invalid, list) else [invalid]:
+                    yield sub_path, invalid_value
+
+            if hasattr(sub_field, 'iter_sub_fields') and (max_depth is None or depth < max_depth):
+                yield from cls.iter_nested_invalid_values(sub_field, sub_valid_value, sub_path, depth + 1, max_depth)
@@ -1,7 +1,16 @@
-from typing import List
+from array import array
+from functools import partial
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Tuple
 from eagle.http.client import AuthenticatedHttpClient
+from eagle.logger import logger
+from eagle.resources import resources
 from eagle.testcase import APIEndpointTestCase, CheckPoint
 from eagle.testcase.check_points.http import HttpStatusCodeEqual
+from eagle.settings.bases import app_settings
+from eagle.tracing import TracedThreadPoolExecutor
 
 
 class AutoTestCaseManager:
@@ -58,55 +67,251 @@ class AutoTestCaseManager:
         Returns:
             List[APIEndpointTestCase]: Test cases.
         """
-        cases = []
-        faker = self.faker_cls()
+        faker = self.faker_cls(key=f'{self.faker_cls.__name__}.{method}:')
+        cases = list(self.iter_create(
+            method=method,
+            url=url,
+            name=name,
+            client=client,
+            case_type=case_type,
+            valid_check_points=valid_check_points,
+            default_invalid_check_points=default_invalid_check_points,
+            faker=faker,
+        ))
+        return cases, faker
+
+    def iter_create(
+        self,
+        method: str,
+        url: str,
+        name: str | None = None,
+        client: AuthenticatedHttpClient | None = None,
+        case_type: str = 'all',
+        valid_check_points: List[CheckPoint] | None = None,
+        default_invalid_check_points: List[CheckPoint] | None = None,
+        faker=None,
+    ) -> Iterator[APIEndpointTestCase]:
+        """
+        Lazy `create`: the test cases are generated one at a time, while they are consumed
+        (e.g. by an `APITestSuite`), from `Faker.iter_selected_invalid_data`.
 
-        if case_type in {'valid', 'all'}:
-            case = self._generate_case(
+        Args:
+            faker (Faker, optional): The faker generating the data. Defaults to a new faker.
+        """
+        case_id_prefix = f'{self.faker_cls.__name__}.{method}:'
+        if faker is None:
+            faker = self.faker_cls(key=case_id_prefix)
+
+        valid_case_id = f'{case_id_prefix}valid'
+        if case_type in {'valid', 'all'} and app_settings.CASE_ID in {None, valid_case_id}:
+            yield self._generate_case(
                 method=method,
                 url=url,
                 name=name,
                 client=client,
                 check_points=valid_check_points or [self.default_valid_check_point],
-                json=faker.valid_data
+                json=faker.valid_data,
+                case_id=valid_case_id,
             )
-            cases.append(case)
 
         if case_type in {'invalid', 'all'}:
-            for invalid_data in faker.invalid_data:
-                case = self._generate_case(
+            for invalid_data in faker.iter_selected_invalid_data(case_id_prefix):
+                yield self._generate_case(
                     method=method,
                     url=url,
                     name=name,
                     client=client,
                     check_points=default_invalid_check_points or [self.default_invalid_check_point],
-                    json=invalid_data.data
+                    json=invalid_data.data,
+                    case_id=case_id_prefix + invalid_data.key,
                 )
-                cases.append(case)
 
-        return cases, faker
+    def __init__(self, faker_cls: type | None = None) -> None:
+        self.faker_cls = faker_cls
 
     def __get__(self, instance, faker_cls):
-        if faker_cls is not None:
-            self.faker_cls = faker_cls
-        return self
+        # A manager bound to the class, the descriptor is shared by every Faker class and threads.
+        if faker_cls is None:
+            return self
+        return type(self)(faker_cls)
+
+
+class BulkCreateFailure(namedtuple('BulkCreateFailure', ['index', 'status_code', 'reason'])):
+    """
+    A payload of `Manager.bulk_create` that was not created: its index, the status code of the response
+    (None if no response was received) and the reason (the response body, or the error).
+    """
+    __slots__ = ()
+
+
+class BulkCreateResult(namedtuple('BulkCreateResult', ['ids', 'failures', 'requested'])):
+    """
+    The ids of the created objects in the order of their payloads (an `array` when they are all integers)
+    and the `BulkCreateFailure` of the others.
+    """
+    __slots__ = ()
+
+    @property
+    def created(self) -> int:
+        return len(self.ids)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
 
 
 class Manager:
 
-    def __get__(self, instance, faker_cls):
+    def __init__(self, faker_cls: type | None = None) -> None:
         self.faker_cls = faker_cls
-        return self
+
+    def __get__(self, instance, faker_cls):
+        # A manager bound to the class, the descriptor is shared by every Faker class and threads.
+        if faker_cls is None:
+            return self
+        return type(self)(faker_cls)
 
     def create(
         self,
         url: str,
         client: AuthenticatedHttpClient | None = None,
+        pk_variable: str = 'id',
+        delete_url: str | None = None,
         **kwargs
     ):
+        """
+        Create an object, it is deleted when the run ends (see `eagle.resources`).
+
+        Args:
+            pk_variable (str): Key of the id in the created object.
+            delete_url (str, optional): URL deleting the object, with a `{pk}` placeholder. Defaults to `<url>/{pk}/`.
+        """
         if client is None:
             client = AuthenticatedHttpClient()
 
-        return client.request(
+        response = client.request(
             method='POST', url=url, json=self.faker_cls().valid_data, **kwargs
         )
+        resources.track_response(response, client, pk_variable, delete_url)
+        return response
+
+    def bulk_create(
+        self,
+        n: int,
+        url: str,
+        client: AuthenticatedHttpClient | None = None,
+        concurrency: int = 8,
+        pk_variable: str = 'id',
+        batch_url: str | None = None,
+        batch_size: int = 100,
+        delete_url: str | None = None,
+        **kwargs
+    ) -> BulkCreateResult:
+        """
+        Create `n` objects, e.g. the records a list or pagination test needs.
+
+        The payloads are generated while they are sent (`Faker.iter_many`), `concurrency` requests
+        at a time through `client`. A failed request does not stop the others, see `BulkCreateResult.failures`.
+
+        Args:
+            n (int): Number of objects.
+            url (str): URL creating one object.
+            client (AuthenticatedHttpClient, optional): HTTP client, shared by the requests.
+                Its connection pool should hold `concurrency` connections (10 by default in `requests`).
+            concurrency (int): Maximum number of requests in flight.
+            pk_variable (str): Key of the id in the created objects.
+            batch_url (str, optional): URL of a batch endpoint creating a list of objects at once:
+                it is sent lists of `batch_size` payloads and answers the list of created objects.
+            batch_size (int): Payloads per request to `batch_url`.
+            delete_url (str, optional): URL deleting an object, with a `{pk}` placeholder. Defaults to `<url>/{pk}/`.
+                The created objects are deleted when the run ends (see `eagle.resources`).
+
+        Usage:
+            >>> result = UserFaker.objects.bulk_create(1000, url='/users/', client=client, concurrency=16)
+            >>> result.created, result.failures
+            (1000, [])
+        """
+        if client is None:
+            client = AuthenticatedHttpClient()
+
+        faker_cls = self.faker_cls
+        payloads = faker_cls.iter_many(n)
+        # Tracked as soon as they are created, the objects of a batch are deleted at `url`, not at `batch_url`.
+        track = partial(resources.track, client, url, delete_url=delete_url)
+        if batch_url is None:
+            chunks = ((index, [payload]) for index, payload in enumerate(payloads))
+            send = partial(self._create_one, client, url, pk_variable, track, kwargs)
+        else:
+            batches = iter(lambda: list(islice(payloads, batch_size)), [])
+            chunks = ((index * batch_size, batch) for index, batch in enumerate(batches))
+            send = partial(self._create_batch, client, batch_url, pk_variable, track, kwargs)
+
+        created: List[Tuple[int, Any]] = []
+        failures: List[BulkCreateFailure] = []
+        with TracedThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='eagle-bulk-create') as executor:
+            # Only a few chunks wait for a worker, the next payloads are generated as the requests complete.
+            in_flight = set()
+            for start, chunk in chunks:
+                if len(in_flight) >= concurrency * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._collect(done, created, failures)
+                in_flight.add(executor.submit(send, start, chunk))
+            self._collect(in_flight, created, failures)
+
+        created.sort()
+        failures.sort()
+        ids = [pk for _, pk in created]
+        if all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            ids = array('q', ids)
+        if failures:
+            logger.warning(f'Bulk create {faker_cls.__name__}: {len(ids)} of {n} created, {len(failures)} failed.')
+        return BulkCreateResult(ids=ids, failures=failures, requested=n)
+
+    @staticmethod
+    def _collect(futures: Iterable, created: List[Tuple[int, Any]], failures: List[BulkCreateFailure]) -> None:
+        for future in futures:
+            chunk_created, chunk_failures = future.result()
+            created.extend(chunk_created)
+            failures.extend(chunk_failures)
+
+    @staticmethod
+    def _create_one(client, url, pk_variable, track, kwargs, start, chunk):
+        try:
+            response = client.request(method='POST', url=url, json=chunk[0], **kwargs)
+        except Exception as e:
+            return [], [BulkCreateFailure(start, None, repr(e))]
+        if not response.ok:
+            return [], [BulkCreateFailure(start, response.status_code, response.text)]
+        try:
+            pk = response.json()[pk_variable]
+        except (ValueError, KeyError, TypeError):
+            return [], [BulkCreateFailure(start, response.status_code, f'No `{pk_variable}` in the response.')]
+        track(pk)
+        return [(start, pk)], []
+
+    @staticmethod
+    def _create_batch(client, url, pk_variable, track, kwargs, start, chunk):
+        indexes = range(start, start + len(chunk))
+        try:
+            response = client.request(method='POST', url=url, json=chunk, **kwargs)
+        except Exception as e:
+            return [], [BulkCreateFailure(index, None, repr(e)) for index in indexes]
+        if not response.ok:
+            return [], [BulkCreateFailure(index, response.status_code, response.text) for index in indexes]
+        try:
+            objects = response.json()
+            if isinstance(objects, dict):
+                objects = objects.get('results', [])
+            ids = [
+                created_object[pk_variable] for created_object in objects
+                if isinstance(created_object, dict) and pk_variable in created_object
+            ]
+        except (ValueError, TypeError):
+            ids = []
+        # The objects the endpoint did create are deleted at the end of the run, even if the batch is reported failed.
+        for pk in ids:
+            track(pk)
+        if len(ids) != len(chunk):
+            reason = f'The batch endpoint answered {len(ids)} `{pk_variable}` for {len(chunk)} payloads.'
+            return [], [BulkCreateFailure(index, response.status_code, reason) for index in indexes]
+        return list(zip(indexes, ids)), []
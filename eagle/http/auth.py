@@ -9,6 +9,8 @@ from eagle.exceptions import APIAuthFailedException
 from eagle.logger import logger
 from eagle.http.enums import HttpAuthType
 from eagle.http.hooks import log_response
+from eagle.tracing import tracer
+from eagle import metrics
 
 
 class Authentication:
@@ -107,12 +109,14 @@ class BearerTokenAuthentication(Authentication):
         return self._authentication
 
     def refresh_token(self):
-        self._authentication = {}
-        logger.info('Refreshing token...')
-        with contextlib.suppress(FileNotFoundError):
-            with open(self.token_file, 'w') as f:
-                json.dump({}, f)
-        return self.get_auth_headers()
+        with tracer.start_span('auth.token_refresh', attributes={'url.full': self.token_url}):
+            metrics.token_refreshes_total.inc()
+            self._authentication = {}
+            logger.info('Refreshing token...')
+            with contextlib.suppress(FileNotFoundError):
+                with open(self.token_file, 'w') as f:
+                    json.dump({}, f)
+            return self.get_auth_headers()
 
     def fetch_token(self) -> Dict[str, str]:
         with contextlib.suppress(FileNotFoundError):
@@ -123,17 +127,20 @@ class BearerTokenAuthentication(Authentication):
         # Make a request to the token endpoint to get the new token
         retries = 0
         error_msg = None
-        while retries < self.retry:
-            try:
-                response = requests.post(self.token_url, json=self.auth_body, hooks={'response': log_response})
-                response.raise_for_status()
-                error_msg = None
-                break
-            except (requests.exceptions.HTTPError, requests.exceptions.Timeout) as e:
-                retries += 1
-                print(response.text)
-                error_msg = f"Failed to get the token. {e}"
-                logger.warn(f"{error_msg}. Retrying...")
+        with tracer.start_span('auth.token_fetch', attributes={'url.full': self.token_url}) as span:
+            while retries < self.retry:
+                try:
+                    response = requests.post(self.token_url, json=self.auth_body, hooks={'response': log_response})
+                    response.raise_for_status()
+                    error_msg = None
+                    break
+                except (requests.exceptions.HTTPError, requests.exceptions.Timeout) as e:
+                    retries += 1
+                    metrics.http_retries_total.inc('token')
+                    print(response.text)
+                    error_msg = f"Failed to get the token. {e}"
+                    logger.warn(f"{error_msg}. Retrying...")
+            span.set_attribute('eagle.retries', retries)
 
         if error_msg:
             raise APIAuthFailedException(error_msg)
@@ -1,11 +1,16 @@
 import requests
 import abc
 import inspect
+import time
 from typing import Any, Type, Dict, Optional
 from requests.models import Response, Request
 from eagle.http.enums import HttpAuthType
 from eagle.http.auth import Authentication
 from eagle.http.hooks import show_response_table
+from eagle.timing import PhaseTimer, null_timer
+from eagle.tracing import SpanKind, tracer
+from eagle import metrics
+from eagle.resources import resources
 
 
 class HttpClient(requests.Session):
@@ -84,6 +89,7 @@ class AuthenticatedHttpClient(HttpClient, metaclass=StrategyMeta):
         verify=None,
         cert=None,
         json=None,
+        timer: Optional[PhaseTimer] = None,
     ):
         """Constructs a :class:`Request <Request>`, prepares it and sends it.
         Returns :class:`Response <Response>` object.
@@ -124,6 +130,8 @@ class AuthenticatedHttpClient(HttpClient, metaclass=StrategyMeta):
             may be useful during local development or testing.
         :param cert: (optional) if String, path to ssl client cert file (.pem).
             If Tuple, ('cert', 'key') pair.
+        :param timer: (optional) :class:`PhaseTimer <eagle.timing.PhaseTimer>`
+            the auth, prepare and network timings are recorded in.
         :rtype: requests.Response
         """
         # Create the Request.
@@ -143,38 +151,76 @@ class AuthenticatedHttpClient(HttpClient, metaclass=StrategyMeta):
             hooks=hooks,
         )
 
-        if self.authentication:
-            req = self.authentication.set_authentication(req)
-
-        prep = self.prepare_request(req)
-
-        proxies = proxies or {}
-
-        settings = self.merge_environment_settings(
-            prep.url, proxies, stream, verify, cert
-        )
-
         # Send the request.
         send_kwargs = {
             "timeout": timeout,
             "allow_redirects": allow_redirects,
         }
-        send_kwargs |= settings
-        return self.send(prep, **send_kwargs)
+        environment = {
+            "proxies": proxies or {},
+            "stream": stream,
+            "verify": verify,
+            "cert": cert,
+        }
+        return self._send(req, timer=timer, environment=environment, **send_kwargs)
 
-    def send_request(self, request: Request, **kwargs: Any) -> Response:
+    def send_request(self, request: Request, timer: Optional[PhaseTimer] = None, **kwargs: Any) -> Response:
         """
         This method is used to send a request.
+        The auth, prepare and network timings are recorded in `timer` if given.
         """
-
         if self.endpoint and not request.url.startswith('http'):
             request.url = self.endpoint + request.url
 
-        if self.authentication:
-            request = self.authentication.set_authentication(request)
+        return self._send(request, timer=timer, **kwargs)
 
-        prep = self.prepare_request(request)
-        return self.send(prep, **kwargs)
+    def _send(
+        self,
+        request: Request,
+        timer: Optional[PhaseTimer] = None,
+        environment: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> Response:
+        """
+        Authenticate, prepare and send `request` inside an HTTP client span.
+        If `environment` is given, it is merged with the environment settings like `requests.Session.request` does.
+        """
+        timer = timer or null_timer
+        attributes = {'http.request.method': request.method, 'url.full': request.url}
+
+        with tracer.start_span(f'HTTP {request.method}', SpanKind.CLIENT, attributes) as span:
+            if self.authentication:
+                with timer.phase('auth'):
+                    request = self.authentication.set_authentication(request)
+
+            with timer.phase('prepare'):
+                prep = self.prepare_request(request)
+                if environment is not None:
+                    kwargs |= self.merge_environment_settings(prep.url, **environment)
+
+            # Propagate the trace context so client and server spans can be joined.
+            if span.traceparent:
+                prep.headers['traceparent'] = span.traceparent
+
+            metrics.http_requests_total.inc(request.method)
+            metrics.http_requests_in_flight.inc()
+            start = time.perf_counter()
+            try:
+                with timer.phase('network'):
+                    response = self.send(prep, **kwargs)
+            except Exception:
+                metrics.http_responses_total.inc('error')
+                raise
+            finally:
+                metrics.http_requests_in_flight.dec()
+                metrics.http_request_duration_seconds.observe(time.perf_counter() - start, request.method)
+
+            metrics.http_responses_total.inc(metrics.get_status_class(response.status_code))
+            span.set_attribute('http.response.status_code', response.status_code)
+
+        if request.method == 'DELETE':
+            resources.observe_delete(request.url, response.status_code)
+        return response
 
     def get(self, url: str, show_table: bool = False, json_path: str = None, ignore_keys: list = None, **kwargs: Any) -> Response:
         """
@@ -216,6 +262,7 @@ class BearerAuthenticatedHttpClient(AuthenticatedHttpClient):
         # If the response status code is 401, it means that the token has expired.
         # Then we need to refresh the token and retry the request.
         if response.status_code == 401:
+            metrics.http_retries_total.inc('unauthorized')
             self.authentication.refresh_token()
             response = super().request(method, url, **kwargs)
 
@@ -227,6 +274,7 @@ class BearerAuthenticatedHttpClient(AuthenticatedHttpClient):
         # If the response status code is 401, it means that the token has expired.
         # Then we need to refresh the token and retry the request.
         if response.status_code == 401:
+            metrics.http_retries_total.inc('unauthorized')
             self.authentication.refresh_token()
             response = super().send_request(request, **kwargs)
 
@@ -0,0 +1,257 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from eagle.logger import logger
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metric:
+    """
+    Base class of the metrics.
+
+    Updates are lock-free: every thread writes to a shard of its own
+    and the shards are only summed when the metrics are exposed.
+    The lock is taken once per thread, when its shard is created.
+    """
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._local = threading.local()
+        self._shards: List[Dict[Tuple[str, ...], Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict[Tuple[str, ...], Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _format_labels(self, label_values: Tuple[str, ...], extra: Optional[Dict[str, str]] = None) -> str:
+        labels = dict(zip(self.label_names, label_values))
+        if extra:
+            labels |= extra
+        if not labels:
+            return ''
+        escaped = (
+            f'{key}="{_escape_label_value(str(value))}"'
+            for key, value in labels.items()
+        )
+        return '{' + ','.join(escaped) + '}'
+
+    def collect(self) -> Dict[Tuple[str, ...], Any]:
+        raise NotImplementedError
+
+    def expose(self) -> List[str]:
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.metric_type}',
+        ]
+        for label_values, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{self._format_labels(label_values)} {value}')
+        return lines
+
+
+class Counter(Metric):
+
+    metric_type = 'counter'
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def collect(self) -> Dict[Tuple[str, ...], float]:
+        values: Dict[Tuple[str, ...], float] = {}
+        for shard in list(self._shards):
+            for label_values, value in shard.copy().items():
+                values[label_values] = values.get(label_values, 0) + value
+        return values
+
+
+class Gauge(Counter):
+
+    metric_type = 'gauge'
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(Metric):
+
+    metric_type = 'histogram'
+
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, *args: Any, buckets: Optional[Sequence[float]] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets or self.default_buckets))
+
+    def observe(self, value: float, *label_values: str) -> None:
+        shard = self._shard()
+        # [count of each bucket..., count of +Inf, sum]
+        data = shard.get(label_values)
+        if data is None:
+            data = shard[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        data[bisect.bisect_left(self.buckets, value)] += 1
+        data[-1] += value
+
+    def collect(self) -> Dict[Tuple[str, ...], List[float]]:
+        values: Dict[Tuple[str, ...], List[float]] = {}
+        for shard in list(self._shards):
+            for label_values, data in shard.copy().items():
+                total = values.setdefault(label_values, [0] * len(data))
+                for i, value in enumerate(list(data)):
+                    total[i] += value
+        return values
+
+    def expose(self) -> List[str]:
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.metric_type}',
+        ]
+        for label_values, data in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), data[:-1]):
+                cumulative += count
+                labels = self._format_labels(label_values, {'le': str(bound)})
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = self._format_labels(label_values)
+            lines.append(f'{self.name}_sum{labels} {data[-1]}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f'Metric {metric.name} is already registered.')
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets=buckets))
+
+    def exposition(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    'eagle_http_requests_total', 'HTTP requests sent.', ['method']
+)
+http_responses_total = registry.counter(
+    'eagle_http_responses_total', 'HTTP responses received, by status class.', ['status_class']
+)
+http_requests_in_flight = registry.gauge(
+    'eagle_http_requests_in_flight', 'HTTP requests waiting for their response.'
+)
+http_request_duration_seconds = registry.histogram(
+    'eagle_http_request_duration_seconds', 'Duration of HTTP requests.', ['method']
+)
+http_retries_total = registry.counter(
+    'eagle_http_retries_total', 'Requests sent again, by reason.', ['reason']
+)
+token_refreshes_total = registry.counter(
+    'eagle_token_refreshes_total', 'Bearer token refreshes.'
+)
+cases_total = registry.counter(
+    'eagle_cases_total', 'Executed test cases, by result.', ['result']
+)
+case_duration_seconds = registry.histogram(
+    'eagle_case_duration_seconds', 'Duration of test cases, check points included.'
+)
+deduplicated_requests_total = registry.counter(
+    'eagle_deduplicated_requests_total', 'Cases checking the response of an identical request instead of sending it.'
+)
+check_point_failures_total = registry.counter(
+    'eagle_check_point_failures_total', 'Failed check points, by check point name.', ['check_point']
+)
+
+
+def get_status_class(status_code: int) -> str:
+    return f'{status_code // 100}xx'
+
+
+class MetricsServer:
+    """
+    Serve the metrics of a registry at `/metrics` from a background thread.
+
+    Usage:
+        >>> server = MetricsServer(port=9464).start()
+        >>> # curl http://127.0.0.1:9464/metrics
+        >>> server.stop()
+    """
+
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, metrics_registry: Optional[MetricsRegistry] = None, host: str = '127.0.0.1', port: int = 9464) -> None:
+        self.registry = metrics_registry or registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _build_request_handler(self):
+        server = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                content = server.registry.exposition().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', server.content_type)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return MetricsRequestHandler
+
+    def start(self) -> 'MetricsServer':
+        self._server = ThreadingHTTPServer((self.host, self.port), self._build_request_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name='eagle-metrics', daemon=True).start()
+        logger.info(f'Serving metrics at http://{self.host}:{self.port}/metrics')
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,331 @@
+import json
+import random
+from collections.abc import Mapping, Sequence as SequenceABC
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from eagle.seed import use_random
+
+
+Path = Tuple[Union[str, int], ...]
+
+
+class _Deleted:
+
+    def __repr__(self) -> str:
+        return 'DELETED'
+
+
+# Override value marking a key as removed from the payload.
+DELETED = _Deleted()
+
+
+def as_path(key: Union[str, int, Sequence[Union[str, int]]]) -> Path:
+    if isinstance(key, (str, int)):
+        return (key,)
+    return tuple(key)
+
+
+class PayloadOverlay(Mapping):
+    """
+    A payload stored as a shared `base` plus a few `overrides`,
+    so invalid variants of a payload do not have to deep copy it.
+
+    `overrides` maps a key path (e.g. `('address', 'city')`) to the value
+    at that path, or to `DELETED` if the key is removed. Override values may be
+    overlays themselves. The base is never mutated: `materialize` copies
+    only the containers along the overridden paths and shares everything else,
+    and reading a key returns the nested dicts and lists as read-only views.
+    Deleting a key of a missing parent does nothing, the deleted indexes of a list
+    are the indexes before any of them is deleted.
+
+    Usage:
+        >>> valid = {'name': 'eagle', 'address': {'city': 'x', 'zip': 1}}
+        >>> overlay = PayloadOverlay(valid).set(('address', 'city'), None)
+        >>> overlay.materialize()
+        {'name': 'eagle', 'address': {'city': None, 'zip': 1}}
+        >>> valid['address']['city']
+        'x'
+    """
+
+    __slots__ = ('base', 'overrides')
+
+    def __init__(self, base: Dict[str, Any], overrides: Optional[Dict[Path, Any]] = None) -> None:
+        self.base = base
+        self.overrides: Dict[Path, Any] = overrides if overrides is not None else {}
+
+    def set(self, key, value: Any) -> 'PayloadOverlay':
+        self.overrides[as_path(key)] = value
+        return self
+
+    def delete(self, key) -> 'PayloadOverlay':
+        self.overrides[as_path(key)] = DELETED
+        return self
+
+    def override(self, key, value: Any) -> 'PayloadOverlay':
+        """Return a new overlay on the same base with one more override."""
+        return PayloadOverlay(self.base, {**self.overrides, as_path(key): value})
+
+    def materialize(self) -> Dict[str, Any]:
+        """Build the plain JSON payload."""
+        return materialize(self)
+
+    def _top_level_overrides(self) -> Dict[Union[str, int], Any]:
+        return {path[0]: value for path, value in self.overrides.items() if len(path) == 1}
+
+    def __getitem__(self, key):
+        if any(len(path) > 1 and path[0] == key for path in self.overrides):
+            return read_only(self.materialize()[key])
+        value = self._top_level_overrides().get(key, self.base.get(key, DELETED))
+        if value is DELETED:
+            raise KeyError(key)
+        return read_only(value)
+
+    def __iter__(self) -> Iterator:
+        top_level = self._top_level_overrides()
+        for key in self.base:
+            if top_level.get(key) is not DELETED:
+                yield key
+        for key, value in top_level.items():
+            if key not in self.base and value is not DELETED:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f'PayloadOverlay({self.materialize()!r})'
+
+
+class ReadOnlyList(SequenceABC):
+    """A read-only view of a list of a payload, its nested dicts and lists are read-only views too."""
+
+    __slots__ = ('items',)
+
+    def __init__(self, items: List[Any]) -> None:
+        self.items = items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ReadOnlyList(self.items[index])
+        return read_only(self.items[index])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ReadOnlyList):
+            other = other.items
+        return isinstance(other, list) and self.items == other
+
+    def __repr__(self) -> str:
+        return f'ReadOnlyList({self.items!r})'
+
+
+def read_only(value: Any) -> Any:
+    """A read-only view of `value` if it is a dict or a list of a payload, so the shared payload is never mutated."""
+    if isinstance(value, dict):
+        return PayloadOverlay(value)
+    if isinstance(value, list):
+        return ReadOnlyList(value)
+    return value
+
+
+def _copy_container(value: Any) -> Any:
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, PayloadOverlay):
+        return value.materialize()
+    return dict(value) if value is not None else {}
+
+
+def materialize(value: Any) -> Any:
+    """
+    Turn `value` into plain JSON data if it is a `PayloadOverlay`, otherwise return it unchanged.
+    """
+    if not isinstance(value, PayloadOverlay):
+        return value
+
+    result = _copy_container(value.base)
+    # ids of the containers already copied, so every container is copied at most once.
+    copied = {id(result)}
+    # The indexes deleted from each list, deleted once the other overrides are applied.
+    list_deletes: Dict[int, Tuple[List[Any], set]] = {}
+    for path, override in value.overrides.items():
+        if override is DELETED and not _has_parent(result, path):
+            continue
+        node = result
+        for key in path[:-1]:
+            child = node[key] if isinstance(node, list) else node.get(key)
+            if id(child) not in copied or child is None:
+                child = _copy_container(child)
+                copied.add(id(child))
+                node[key] = child
+            node = child
+
+        if override is DELETED:
+            if isinstance(node, list):
+                list_deletes.setdefault(id(node), (node, set()))[1].add(path[-1])
+            else:
+                node.pop(path[-1], None)
+        else:
+            node[path[-1]] = materialize(override)
+
+    for node, indexes in list_deletes.values():
+        # From the last index, so the deletes do not shift each other.
+        for index in sorted((index % len(node) for index in indexes if -len(node) <= index < len(node)), reverse=True):
+            del node[index]
+    return result
+
+
+def _has_parent(data: Any, path: Path) -> bool:
+    """Whether the container holding the key of `path` exists in `data`."""
+    node = data
+    for key in path[:-1]:
+        if isinstance(node, PayloadOverlay):
+            node = node.materialize()
+        if isinstance(node, list):
+            if not isinstance(key, int) or not -len(node) <= key < len(node):
+                return False
+            node = node[key]
+        elif isinstance(node, dict):
+            if key not in node:
+                return False
+            node = node[key]
+        else:
+            return False
+    return isinstance(node, (dict, list, PayloadOverlay))
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    `default` hook of `json.dumps` for payloads containing overlays.
+    A `StreamedList` is shown as a summary, it is only encoded in full by `JsonStream`.
+
+    Usage:
+        >>> json.dumps(invalid_data.data, default=to_jsonable)
+    """
+    if isinstance(value, PayloadOverlay):
+        return value.materialize()
+    if isinstance(value, ReadOnlyList):
+        return value.items
+    if isinstance(value, StreamedList):
+        return repr(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class StreamedList:
+    """
+    A list too large to be built in memory, e.g. the 100k items of a bulk import.
+
+    Its items are generated in chunks by `generate_items(count)`, with a generator seeded with `seed`,
+    every time the list is iterated: iterating it twice gives the same items.
+    A payload containing one is sent as a `JsonStream`.
+
+    Usage:
+        >>> items = StreamedList(100000, lambda count: [get_random().random() for _ in range(count)], seed=1)
+        >>> len(items)
+        100000
+    """
+
+    def __init__(
+        self,
+        length: int,
+        generate_items: Callable[[int], List[Any]],
+        seed: int,
+        chunk_size: int = 1000,
+    ) -> None:
+        self.length = length
+        self.generate_items = generate_items
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+    def iter_chunks(self) -> Iterator[List[Any]]:
+        random_ = random.Random(self.seed)
+        for start in range(0, self.length, self.chunk_size):
+            # The generator is only switched while a chunk is generated, never across a `yield`.
+            with use_random(random_):
+                chunk = self.generate_items(min(self.chunk_size, self.length - start))
+            yield chunk
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f'StreamedList(<{self.length} items>)'
+
+
+def contains_streamed(value: Any) -> bool:
+    """Whether `value` is or contains a `StreamedList` (overlays are looked into)."""
+    if isinstance(value, StreamedList):
+        return True
+    if isinstance(value, PayloadOverlay):
+        return contains_streamed(value.base) or any(contains_streamed(item) for item in value.overrides.values())
+    if isinstance(value, dict):
+        return any(contains_streamed(item) for item in value.values())
+    if isinstance(value, list):
+        return any(contains_streamed(item) for item in value)
+    return False
+
+
+def iter_json(value: Any) -> Iterator[str]:
+    """
+    Encode `value` to JSON piece by piece, the items of the `StreamedList`s are encoded a chunk at a time.
+    """
+    if isinstance(value, PayloadOverlay):
+        value = value.materialize()
+
+    if isinstance(value, StreamedList):
+        yield '['
+        separator = ''
+        for chunk in value.iter_chunks():
+            if chunk:
+                yield separator + json.dumps(chunk, default=to_jsonable)[1:-1]
+                separator = ','
+        yield ']'
+    elif isinstance(value, dict) and contains_streamed(value):
+        yield '{'
+        for index, (key, item) in enumerate(value.items()):
+            yield (',' if index else '') + json.dumps(key) + ':'
+            yield from iter_json(item)
+        yield '}'
+    elif isinstance(value, list) and contains_streamed(value):
+        yield '['
+        for index, item in enumerate(value):
+            if index:
+                yield ','
+            yield from iter_json(item)
+        yield ']'
+    else:
+        yield json.dumps(value, default=to_jsonable)
+
+
+class JsonStream:
+    """
+    A JSON request body encoded while it is sent.
+
+    `requests` sends an iterable body without a length with chunked transfer encoding,
+    so neither eagle nor `requests` ever hold the whole body. It can be iterated again,
+    e.g. when a request is sent again after a token refresh.
+
+    Usage:
+        >>> client.request('POST', '/items/bulk/', data=JsonStream(items), headers={'Content-Type': 'application/json'})
+    """
+
+    def __init__(self, value: Any, buffer_size: int = 64 * 1024) -> None:
+        self.value = value
+        self.buffer_size = buffer_size
+
+    def __iter__(self) -> Iterator[bytes]:
+        buffer = []
+        buffered = 0
+        for piece in iter_json(self.value):
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= self.buffer_size:
+                yield ''.join(buffer).encode('utf-8')
+                buffer, buffered = [], 0
+        if buffer:
+            yield ''.join(buffer).encode('utf-8')
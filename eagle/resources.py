@@ -0,0 +1,262 @@
+"""
+Resources created on the API during a run, deleted when it ends.
+
+Every tracked resource is journaled to `app_settings.RESOURCE_JOURNAL_FILE`, so the resources
+of an interrupted run are deleted later with `eagle cleanup`.
+The journal is shared by the concurrent runs, they write it under a lock on `<journal>.lock`.
+"""
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from eagle.logger import logger
+from eagle.settings.bases import app_settings
+from eagle.tracing import TracedThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows, the runs sharing a journal are not synchronized.
+    fcntl = None
+
+
+# Statuses of a DELETE after which the resource is gone.
+GONE_STATUS_CODES = {404, 410}
+
+
+class TrackedResource(namedtuple('TrackedResource', ['url', 'created_at'])):
+    """A resource to delete: its absolute URL and when it was created."""
+    __slots__ = ()
+
+
+class CleanupResult(namedtuple('CleanupResult', ['deleted', 'failed'])):
+    """The URLs deleted (or already gone) and the resources that could not be deleted."""
+    __slots__ = ()
+
+
+@contextmanager
+def journal_lock(journal_file: str):
+    """Hold an exclusive lock on `journal_file` shared with the other processes."""
+    if fcntl is None:
+        yield
+        return
+    with open(f'{journal_file}.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_resource_url(client: Any, create_url: str, pk: Any, delete_url: Optional[str] = None) -> str:
+    """
+    The absolute URL of a resource created at `create_url`: `delete_url` (with a `{pk}` placeholder),
+    or `<create_url>/<pk>/`.
+    """
+    if delete_url is None:
+        delete_url = create_url.split('?')[0].rstrip('/') + '/{pk}/'
+    url = delete_url.format(pk=pk)
+    endpoint = getattr(client, 'endpoint', None)
+    if endpoint and not url.startswith('http'):
+        url = endpoint + url
+    return url
+
+
+class ResourceRegistry:
+    """
+    The resources created during the run, in creation order, with the client that created them.
+
+    A resource is forgotten once a DELETE of its URL succeeds or answers 404 / 410,
+    whoever sends it (a delete case, a cleanup method, a fixture pool...).
+
+    Usage:
+        >>> resources.track(client, '/users/', 42)
+        >>> resources.cleanup(concurrency=8)
+    """
+
+    def __init__(self, journal_file: Optional[str] = None) -> None:
+        self.journal_file = journal_file
+        self._resources: Dict[str, TrackedResource] = {}
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._journal = None
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def __iter__(self):
+        return iter(list(self._resources.values()))
+
+    def _write(self, op: str, url: str) -> None:
+        journal_file = self.journal_file or app_settings.RESOURCE_JOURNAL_FILE
+        if not journal_file:
+            return
+        if self._journal is None:
+            os.makedirs(os.path.dirname(journal_file) or '.', exist_ok=True)
+        with journal_lock(journal_file):
+            if self._journal is not None and not self._is_current_journal(journal_file):
+                # Another run compacted the journal, the open file is not the journal anymore.
+                self._journal.close()
+                self._journal = None
+            if self._journal is None:
+                self._journal = open(journal_file, 'a', encoding='utf-8', buffering=1)
+            self._journal.write(json.dumps({'op': op, 'url': url, 'time': time.time()}) + '\n')
+
+    def _is_current_journal(self, journal_file: str) -> bool:
+        try:
+            return os.path.samestat(os.fstat(self._journal.fileno()), os.stat(journal_file))
+        except OSError:
+            return False
+
+    def track(self, client: Any, create_url: str, pk: Any, delete_url: Optional[str] = None) -> TrackedResource:
+        """Record the resource `pk` created at `create_url`, see `get_resource_url`."""
+        url = get_resource_url(client, create_url, pk, delete_url)
+        with self._lock:
+            resource = self._resources.get(url)
+            if resource is None:
+                resource = self._resources[url] = TrackedResource(url, time.time())
+                self._clients[url] = client
+                self._write('track', url)
+        return resource
+
+    def track_response(
+        self,
+        response: Any,
+        client: Any,
+        pk_variable: str = 'id',
+        delete_url: Optional[str] = None,
+    ) -> Optional[TrackedResource]:
+        """
+        Record the resource created by `response` if it is a 2xx response of a POST with `pk_variable`.
+        Its response hook form is `track_created_resource`.
+        """
+        request = response.request
+        if request is None or request.method != 'POST' or not 200 <= response.status_code < 300:
+            return None
+        try:
+            pk = response.json()[pk_variable]
+        except (ValueError, KeyError, TypeError):
+            return None
+        return self.track(client, request.url, pk, delete_url)
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            if self._resources.pop(url, None) is not None:
+                self._clients.pop(url, None)
+                self._write('forget', url)
+
+    def observe_delete(self, url: str, status_code: int) -> None:
+        """Forget the resource at `url` if a DELETE of it succeeded or found it gone."""
+        if url in self._resources and (200 <= status_code < 300 or status_code in GONE_STATUS_CODES):
+            self.forget(url)
+
+    def load(self) -> List[TrackedResource]:
+        """Add the resources of the journal not deleted yet (e.g. by an interrupted run)."""
+        resources = self._read_journal()
+        with self._lock:
+            for url, resource in resources.items():
+                self._resources.setdefault(url, resource)
+        return list(resources.values())
+
+    def _read_journal(self) -> Dict[str, TrackedResource]:
+        journal_file = self.journal_file or app_settings.RESOURCE_JOURNAL_FILE
+        if not journal_file or not os.path.exists(journal_file):
+            return {}
+        resources: Dict[str, TrackedResource] = {}
+        with open(journal_file, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line of an interrupted run may be cut.
+                    continue
+                if entry['op'] == 'track':
+                    resources[entry['url']] = TrackedResource(entry['url'], entry['time'])
+                else:
+                    resources.pop(entry['url'], None)
+        return resources
+
+    def cleanup(self, client: Any = None, concurrency: int = 8) -> CleanupResult:
+        """
+        Delete the tracked resources, the most recent first, `concurrency` at a time.
+        The resources that fail (e.g. still referenced by a resource deleted in the same batch) are tried once more.
+
+        Args:
+            client (AuthenticatedHttpClient, optional): The client deleting the resources,
+                defaults to the client that created each of them.
+        """
+        deleted: List[str] = []
+        pending = sorted(self, key=lambda resource: resource.created_at, reverse=True)
+        with TracedThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='eagle-cleanup') as executor:
+            for _ in range(2):
+                failed = []
+                # One batch at a time, so the most recent resources are gone before the older ones are deleted.
+                for start in range(0, len(pending), concurrency):
+                    batch = pending[start:start + concurrency]
+                    for resource, ok in zip(batch, executor.map(lambda resource: self._delete(resource, client), batch)):
+                        if ok:
+                            deleted.append(resource.url)
+                        else:
+                            failed.append(resource)
+                pending = failed
+                if not pending:
+                    break
+
+        if pending:
+            logger.warning(f'{len(pending)} resources could not be deleted, run `eagle cleanup` to retry.')
+        self.compact()
+        return CleanupResult(deleted=deleted, failed=pending)
+
+    def _delete(self, resource: TrackedResource, client: Any) -> bool:
+        client = client or self._clients.get(resource.url)
+        if client is None:
+            return False
+        try:
+            response = client.delete(resource.url)
+        except Exception as e:
+            logger.warning(f'Could not delete {resource.url}: {e}')
+            return False
+        # The client forgets the resource when the DELETE goes through it, this covers any other client.
+        self.observe_delete(resource.url, response.status_code)
+        return resource.url not in self._resources
+
+    def compact(self) -> None:
+        """
+        Rewrite the journal with the resources still to delete, of this run and of the previous ones.
+        The other runs do not write the journal meanwhile, their entries are kept.
+        """
+        journal_file = self.journal_file or app_settings.RESOURCE_JOURNAL_FILE
+        if not journal_file:
+            return
+        os.makedirs(os.path.dirname(journal_file) or '.', exist_ok=True)
+        with self._lock, journal_lock(journal_file):
+            if self._journal is not None:
+                self._journal.flush()
+            remaining = self._read_journal()
+            remaining.update(self._resources)
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            temporary_file = f'{journal_file}.{os.getpid()}.tmp'
+            with open(temporary_file, 'w', encoding='utf-8') as f:
+                for resource in remaining.values():
+                    f.write(json.dumps({'op': 'track', 'url': resource.url, 'time': resource.created_at}) + '\n')
+            os.replace(temporary_file, journal_file)
+
+
+resources = ResourceRegistry()
+
+
+def track_created_resource(response: Any, client: Any, pk_variable: str = 'id', delete_url: Optional[str] = None) -> None:
+    """
+    Response hook recording the resource created by a POST, see `ResourceRegistry.track_response`.
+
+    Usage:
+        >>> APIEndpointTestCase(..., response_hooks=[{
+                'func': track_created_resource,
+                'kwargs': {'client': client, 'pk_variable': 'id', 'delete_url': '/users/{pk}/'},
+            }])
+    """
+    resources.track_response(response, client, pk_variable, delete_url)
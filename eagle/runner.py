@@ -1,6 +1,7 @@
 import os
+import random
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from eagle.http.client import AuthenticatedHttpClient
 from importlib import import_module
 import importlib.util
@@ -8,6 +9,49 @@ from eagle.logger import logger
 from eagle.testcase.unit import APIEndpointTestCase
 from eagle.testcase.suitus import APITestSuite, FakerAutoTestSuite
 from eagle.testcase.evaluator import TestEvaluator
+from eagle.testcase.fixtures import drain_fixture_pools
+from eagle.testcase.registry import RegisteredTestCase, build_test_case
+from eagle.resources import resources
+from eagle.tracing import tracer
+from eagle.metrics import MetricsServer
+from eagle.seed import set_seed
+from eagle.settings.bases import app_settings
+
+
+def load_client(root_path: str, client_path: Optional[str] = None) -> AuthenticatedHttpClient:
+    """
+    The client of the tests: the first `AuthenticatedHttpClient` instance of `client_path`
+    (`<root_path>/client.py` by default), or a new client.
+    """
+    if client_path is None:
+
+        # if client_path is None, we assume that the client is in the root_path
+        # and is named client.py
+        # if it doesn't exist, we create a new client
+        client_path = os.path.join(root_path, 'client.py')
+        if not os.path.exists(client_path):
+            return AuthenticatedHttpClient()
+
+    logger.info(f'Loading client from {client_path}...')
+    spec = importlib.util.spec_from_file_location('client', client_path)
+    result = importlib.util.module_from_spec(spec)
+    sys.modules['client'] = result
+    client_module = spec.loader.exec_module(result)
+
+    # we assume that the client is the first AuthenticatedHttpClient instance
+    # in the client module
+    # if it doesn't exist, we create a new client.
+    try:
+        client = next(
+            client
+            for var_name in dir(client_module)
+            if isinstance(client := getattr(client_module, var_name), AuthenticatedHttpClient)
+        )
+        return client
+    except StopIteration:
+        logger.warning(f'No AuthenticatedHttpClient instance found in {client_path}')
+        logger.warning('Creating a new AuthenticatedHttpClient instance.')
+        return AuthenticatedHttpClient()
 
 
 class Runner:
@@ -25,43 +69,45 @@ class Runner:
         root_path: str,
         client_path: Optional[str] = None,
         prefix: str | None = None,
+        trace_file: str | None = None,
+        metrics_port: int | None = None,
+        seed: int | None = None,
+        case_id: str | None = None,
+        cleanup: bool = True,
+        cleanup_concurrency: int = 8,
     ) -> None:
         self.root_path = root_path
         self.client = self._get_or_create_client(client_path)
         self.cases = []
         self.evaluator = None
         self.prefix = prefix
+        self.trace_file = trace_file
+        self.metrics_port = metrics_port
+
+        # Every run is seeded, so any generated case can be reproduced
+        # with `eagle run --seed <seed> --case <case_id>`.
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.case_id = case_id
+        # Delete the resources created by the run when it ends.
+        self.cleanup = cleanup
+        self.cleanup_concurrency = cleanup_concurrency
+        self._prepared = False
+
+    def prepare(self) -> None:
+        """
+        Set the global state of the run: the seed, the selected case id and the trace exporter.
+        Called by `run` before the test cases are discovered, and by `execute`, once.
+        """
+        if self._prepared:
+            return
+        self._prepared = True
+        if self.trace_file:
+            tracer.configure(self.trace_file)
+        set_seed(self.seed)
+        app_settings.CASE_ID = self.case_id
 
     def _get_or_create_client(self, client_path: Optional[str] = None) -> AuthenticatedHttpClient:
-        if client_path is None:
-
-            # if client_path is None, we assume that the client is in the root_path
-            # and is named client.py
-            # if it doesn't exist, we create a new client
-            client_path = os.path.join(self.root_path, 'client.py')
-            if not os.path.exists(client_path):
-                return AuthenticatedHttpClient()
-
-        logger.info(f'Loading client from {client_path}...')
-        spec = importlib.util.spec_from_file_location('client', client_path)
-        result = importlib.util.module_from_spec(spec)
-        sys.modules['client'] = result
-        client_module = spec.loader.exec_module(result)
-
-        # we assume that the client is the first AuthenticatedHttpClient instance
-        # in the client module
-        # if it doesn't exist, we create a new client.
-        try:
-            client = next(
-                client
-                for var_name in dir(client_module)
-                if isinstance(client := getattr(client_module, var_name), AuthenticatedHttpClient)
-            )
-            return client
-        except StopIteration:
-            logger.warning(f'No AuthenticatedHttpClient instance found in {client_path}')
-            logger.warning('Creating a new AuthenticatedHttpClient instance.')
-            return AuthenticatedHttpClient()
+        return load_client(self.root_path, client_path)
 
     def add_case(self, test_case: APIEndpointTestCase) -> None:
         self.cases.append(test_case)
@@ -104,13 +150,63 @@ class Runner:
                         yaml_path = os.path.join(root, file_name)
                         self.load_case_from_yaml(yaml_path)
 
+    def select_case(self, case_id: str) -> None:
+        """
+        Keep only the case with `case_id`, and the suites containing it.
+        Only the registered test cases that may contain it are built.
+        """
+        selected_cases = []
+        for case in self.cases:
+            if isinstance(case, RegisteredTestCase):
+                if not case.may_contain(case_id):
+                    continue
+                case = case.build()
+            if isinstance(case, APITestSuite):
+                case.filter_cases(lambda _case: _case.case_id == case_id)
+                if case.has_cases:
+                    selected_cases.append(case)
+            elif getattr(case, 'case_id', None) == case_id:
+                selected_cases.append(case)
+        if not selected_cases:
+            logger.warning(f'No case found with id {case_id}')
+        self.cases = selected_cases
+
+    def execute(self) -> None:
+        self.prepare()
+        logger.info(f'Running with seed {self.seed}')
+        with tracer.start_span('run', attributes={'eagle.root_path': self.root_path, 'eagle.seed': self.seed}):
+            # The registered test cases are built when their turn comes.
+            self.cases = list(self.cases)
+            for index, case in enumerate(self.cases):
+                self.cases[index] = case = build_test_case(case)
+                case.execute()
+        self.evaluator = TestEvaluator(self.cases, seed=self.seed)
+
+    def list_test_cases(self) -> List[RegisteredTestCase]:
+        """Discover the registered test cases without building them."""
+        from eagle.testcase.registry import registry
+        self.auto_discover()
+        return registry.get_test_cases()
+
     def run(self) -> None:
         from eagle.testcase.registry import registry
-        # print(registry.get_test_cases())
+        self.prepare()
         self.auto_discover()
-        # print(registry.get_test_cases())
         self.cases = registry.get_test_cases()
-        for case in self.cases:
-            case.execute()
-        self.evaluator = TestEvaluator(self.cases)
+        if self.case_id is not None:
+            self.select_case(self.case_id)
+        metrics_server = None
+        if self.metrics_port is not None:
+            metrics_server = MetricsServer(port=self.metrics_port).start()
+        try:
+            self.execute()
+        finally:
+            # Delete the prerequisite objects no case used, then everything else the run created.
+            drain_fixture_pools()
+            if self.cleanup:
+                resources.cleanup(concurrency=self.cleanup_concurrency)
+            # Flush the spans still buffered by the exporter.
+            tracer.shutdown()
+            if metrics_server is not None:
+                metrics_server.stop()
         self.evaluator.show_test_result()
@@ -0,0 +1,68 @@
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+from eagle.settings.bases import app_settings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# The generator used by the faker fields and the invalid value providers.
+# It is the global `random` generator unless a seeded generator is in use.
+_current_random: ContextVar[random.Random] = ContextVar('eagle_random', default=random._inst)
+
+
+def set_seed(seed: Optional[int]) -> None:
+    """Set the seed of the run, every Faker without an explicit seed derives its generators from it."""
+    app_settings.SEED = seed
+
+
+def get_seed() -> Optional[int]:
+    return app_settings.SEED
+
+
+def get_random() -> random.Random:
+    return _current_random.get()
+
+
+def get_numpy_random():
+    """
+    A NumPy generator seeded from the current generator, or None if NumPy is not installed.
+    """
+    if np is None:
+        return None
+    return np.random.default_rng(get_random().getrandbits(64))
+
+
+def derive_seed(seed: int, *parts: Any) -> int:
+    """
+    Derive an independent, reproducible seed from `seed` and `parts`.
+
+    Usage:
+        >>> derive_seed(42, 'UserFaker', 'invalid', 'name')
+        8731406591275840981
+    """
+    key = ':'.join(str(part) for part in (seed, *parts))
+    return int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:8], 'big')
+
+
+@contextmanager
+def use_random(generator: random.Random) -> Iterator[random.Random]:
+    token = _current_random.set(generator)
+    try:
+        yield generator
+    finally:
+        _current_random.reset(token)
+
+
+def seeded_random(seed: Optional[int], *parts: Any) -> random.Random:
+    """
+    The generator derived from `seed` and `parts`, or the current generator if `seed` is None.
+    """
+    if seed is None:
+        return get_random()
+    return random.Random(derive_seed(seed, *parts))
@@ -55,5 +55,17 @@ class AppSettings:
 
     TOKEN_RETRY = 3
 
+    # Journal of the resources created by the runs and not deleted yet, see `eagle.resources`.
+    RESOURCE_JOURNAL_FILE = os.path.join(os.path.expanduser("~/.eagle"), "resources.jsonl")
+
+    # Compiled OpenAPI / JSON Schema documents, see `eagle.testcase.loader.openapi`.
+    OPENAPI_CACHE_DIR = os.path.join(os.path.expanduser("~/.eagle"), "openapi")
+
+    # The seed of the run. Generated payloads are reproducible for a given seed.
+    SEED = None
+
+    # When set, only the case with this id is generated and executed.
+    CASE_ID = None
+
 
 app_settings = AppSettings()
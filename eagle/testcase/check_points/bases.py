@@ -1,5 +1,6 @@
 import inspect
 from eagle.logger import logger
+from eagle.tracing import SpanStatus, tracer
 
 
 class LogCheckPointMetaclass(type):
@@ -10,11 +11,13 @@ class LogCheckPointMetaclass(type):
             original_call = new_cls.__call__
 
             def new_call(self, *args, **kwargs):
-                result = original_call(self, *args, **kwargs)
-                if not self.failed:
-                    logger.info(f'check: {self._name} | SUCCESS')
-                else:
-                    logger.error(f'check: {self._name} | FAILURE | {self.error_message}')
+                with tracer.start_span(f'check_point {self._name}', attributes={'eagle.check_point': self._name}) as span:
+                    result = original_call(self, *args, **kwargs)
+                    if not self.failed:
+                        logger.info(f'check: {self._name} | SUCCESS')
+                    else:
+                        span.set_status(SpanStatus.ERROR, self.error_message)
+                        logger.error(f'check: {self._name} | FAILURE | {self.error_message}')
                 return result
             new_cls.__call__ = new_call
         return new_cls
@@ -26,6 +29,9 @@ class CheckPoint(metaclass=LogCheckPointMetaclass):
     failed = False
     error_message = ''
 
+    # Check points that send requests of their own record their timings here.
+    timer = None
+
     def __call__(self, *args, **kwargs):
         pass
 
@@ -2,6 +2,11 @@ from requests.models import Response
 from eagle.testcase.check_points.bases import CheckPoint
 from eagle.utils import get_value_from_json_path
 from eagle.http.client import AuthenticatedHttpClient
+from eagle.timing import PhaseTimer
+from eagle.testcase.pagination import CrawlReport, PaginationCrawler
+from eagle.testcase.schema import compile_array, compile_schema, typed
+from eagle.logger import logger
+from collections import namedtuple
 from datetime import datetime
 import pytz
 
@@ -237,6 +242,53 @@ class HttpResponseJsonIncludeCheckPoint(HttpResponseCheckPoint):
                     return
 
 
+class HttpResponseSchemaCheckPoint(HttpResponseCheckPoint):
+    """
+    Check the whole value at a json path against a schema, a `Faker` class or a JSON Schema,
+    compiled once into a validation function, see `eagle.testcase.schema.compile_schema`.
+    The body is decoded once and every value is checked in the same pass.
+
+    usage:
+        >>> check_point = HttpResponseSchemaCheckPoint(UserFaker, '$.results', many=True, max_items=100)
+        >>> check_point(response)
+        >>> check_point.error_message
+        'Invalid response schema: $.results[42].age: expected integer, got string'
+    """
+
+    _name = 'http_response_schema'
+    _error_messages = 'Invalid response schema: {json_path}{error}'
+
+    def __init__(
+        self,
+        schema,
+        json_path: str = '$',
+        many: bool = False,
+        max_items: int | None = None,
+        document: dict | None = None,
+    ) -> None:
+        """
+        Args:
+            schema (type | dict): A `Faker` class or a JSON Schema.
+            many (bool): The value is an array of values of the schema, e.g. the items of a list.
+            max_items (int, optional): Check at most `max_items` elements of each array, picked at random.
+            document (dict, optional): The document the `$ref`s of the JSON Schema point into, e.g. an OpenAPI document.
+        """
+        self.json_path = json_path
+        self.validate = compile_schema(schema, max_items, document)
+        if many:
+            self.validate = typed(['array'], compile_array([self.validate], max_items, json_path))
+
+    def __call__(self, response: Response) -> None:
+        try:
+            res_data = response.json()
+        except Exception as e:
+            self.do_fail(f'Invalid response json, cannot decode json, {e}')
+            return
+        data = res_data if self.json_path == '$' else get_value_from_json_path(res_data, self.json_path)
+        if (error := self.validate(data)) is not None:
+            self.do_fail(self._error_messages.format(json_path=self.json_path, error=error))
+
+
 class HttpResponseListPaginationCheckPoint(HttpResponseCheckPoint):
 
     _name = 'http_response_list_pagination'
@@ -272,6 +324,118 @@ class HttpResponseListPaginationCheckPoint(HttpResponseCheckPoint):
             )
 
 
+class HttpResponsePaginationCrawlCheckPoint(HttpResponseCheckPoint):
+    """
+    Crawl every page of the list whose first page is the response, see `PaginationCrawler`,
+    and fail if an item is listed twice, an item is missing, a page is short or cannot be read,
+    or the count changes during the crawl.
+
+    Usage:
+        >>> crawler = PaginationCrawler(client, '/users/', page_size=1000)
+        >>> APIEndpointTestCase('GET', crawler.first_page_url, client=client, check_points=[
+                HttpResponsePaginationCrawlCheckPoint(crawler),
+            ])
+    """
+
+    _name = 'http_response_pagination_crawl'
+    _error_messages = 'Inconsistent pagination of {url}: {summary}'
+
+    def __init__(self, crawler: PaginationCrawler) -> None:
+        self.crawler = crawler
+        self.report: CrawlReport | None = None
+
+    def __call__(self, response: Response) -> None:
+        self.timer = PhaseTimer(f'crawl {self.crawler.url}')
+        with self.timer.phase('crawl'):
+            self.report = self.crawler.crawl(first_response=response)
+        logger.info(f'crawl: {self.crawler.url} | {self.report.summary()}')
+        if not self.report.consistent:
+            self.do_fail(self._error_messages.format(url=self.crawler.url, summary=self.report.summary()))
+
+
+# The response header holding the validator sent back in each conditional request header.
+CONDITIONAL_REQUEST_VALIDATORS = {
+    'If-None-Match': 'ETag',
+    'If-Modified-Since': 'Last-Modified',
+}
+
+
+class ConditionalRequestReport(namedtuple('ConditionalRequestReport', [
+    'header', 'status_code', 'full_bytes', 'bytes_saved', 'full_latency', 'conditional_latency',
+])):
+    """
+    A conditional request against the full response: the conditional header sent, the status code,
+    the body size of the full response and the bytes not sent again, the latencies (seconds) of both requests.
+    """
+    __slots__ = ()
+
+    @property
+    def latency_saved(self) -> float:
+        return self.full_latency - self.conditional_latency
+
+
+class HttpResponseNotModifiedCheckPoint(HttpResponseCheckPoint):
+    """
+    Send the request of the response again with a conditional header (`If-None-Match` with its `ETag`,
+    or `If-Modified-Since` with its `Last-Modified`), and check the object is not sent again:
+    a 304 with an empty body. The latency and the bytes saved are in `report`.
+
+    Usage:
+        >>> APIEndpointTestCase('GET', '/users/1/', client=client, check_points=[
+                HttpStatusCodeEqual(200),
+                HttpResponseNotModifiedCheckPoint('If-None-Match', client),
+            ])
+    """
+
+    _name = 'http_response_not_modified'
+    _error_messages = 'Invalid conditional response to {header}: {value}, expected 304 with an empty body, but got {code} with {size} bytes.'
+
+    def __init__(self, header: str, client: AuthenticatedHttpClient | None = None) -> None:
+        if header not in CONDITIONAL_REQUEST_VALIDATORS:
+            raise ValueError(f'`header` must be one of {tuple(CONDITIONAL_REQUEST_VALIDATORS)}, got {header!r}.')
+        self.header = header
+        self.client = client
+        if self.client is None:
+            self.client = AuthenticatedHttpClient()
+        self.response = None
+        self.report: ConditionalRequestReport | None = None
+
+    def __call__(self, response: Response) -> None:
+        validator = CONDITIONAL_REQUEST_VALIDATORS[self.header]
+        value = response.headers.get(validator)
+        if not value:
+            self.do_fail(f'No {validator} in the response, {self.header} cannot be checked.')
+            return
+
+        request = response.request
+        self.timer = PhaseTimer(f'{request.method} {request.url} ({self.header})')
+        self.response = self.client.request(
+            request.method, request.url, headers={self.header: value}, timer=self.timer
+        )
+        self.report = ConditionalRequestReport(
+            header=self.header,
+            status_code=self.response.status_code,
+            full_bytes=len(response.content),
+            bytes_saved=len(response.content) - len(self.response.content),
+            full_latency=response.elapsed.total_seconds(),
+            conditional_latency=self.response.elapsed.total_seconds(),
+        )
+        logger.info(
+            f'conditional: {request.url} | {self.header} | {self.report.status_code}, '
+            f'{self.report.bytes_saved} of {self.report.full_bytes} bytes saved, '
+            f'{self.report.full_latency * 1000:.1f}ms -> {self.report.conditional_latency * 1000:.1f}ms'
+        )
+        if self.response.status_code != 304 or self.response.content:
+            self.do_fail(
+                self._error_messages.format(
+                    header=self.header,
+                    value=value,
+                    code=self.response.status_code,
+                    size=len(self.response.content),
+                )
+            )
+
+
 class HttpResponseDateCheckPoint(HttpResponseCheckPoint):
 
     _name = 'http_response_date'
@@ -380,6 +544,8 @@ class HttpResponseDateRangeCheckPoint(HttpResponseCheckPoint):
 
 class CallAPICheckPoint(CheckPoint):
 
+    _name = 'call_api'
+
     def __init__(
         self,
         method: str,
@@ -400,9 +566,11 @@ class CallAPICheckPoint(CheckPoint):
         self.request_kwargs = kwargs
 
     def __call__(self, *args, **kwargs):
-        self.response = self.client.request(self.method, self.url, **self.request_kwargs)
-        for check_point in self.check_points:
-            check_point(self.response)
+        self.timer = PhaseTimer(f'{self.method} {self.url}')
+        self.response = self.client.request(self.method, self.url, timer=self.timer, **self.request_kwargs)
+        with self.timer.phase('check_points'):
+            for check_point in self.check_points:
+                check_point(self.response)
 
         for point in self.check_points:
             if point.failed:
@@ -1,6 +1,9 @@
-from typing import List, Union
+from collections import defaultdict
+from typing import Dict, List, Optional, Union
 from eagle.testcase.unit import APIEndpointTestCase
-from eagle.testcase.suitus import APITestSuite
+from eagle.testcase.suitus import APITestSuite, ExecutedCase
+from eagle.timing import summarize_timings
+from eagle.payload import to_jsonable
 from prettytable import PrettyTable
 from colorama import Fore
 import json
@@ -8,38 +11,77 @@ import json
 
 class TestEvaluator:
 
-    def __init__(self, cases: List[Union[APIEndpointTestCase, APITestSuite]]):
+    def __init__(self, cases: List[Union[APIEndpointTestCase, APITestSuite]], seed: Optional[int] = None):
+        self.seed = seed
+        # The unit cases and the `ExecutedCase` kept by the suites, see `APITestSuite.executed_case_history`.
+        self.cases: List[Union[APIEndpointTestCase, ExecutedCase]] = []
+        self.total = 0
+        # Cases that sent their request, the others checked the response of an identical one.
+        self.requests_sent = 0
         self.faliure_cases = []
-        self.cases = self._collect_unit_case(cases)
+        self.timers = []
+        self._collect_unit_case(cases)
 
     def _collect_unit_case(self, cases):
-        new_cases = []
+        """Add up the results, the suites only keep the totals, timings and failed cases of their executed cases."""
         for case in cases:
             if isinstance(case, APIEndpointTestCase):
-                new_cases.append(case)
+                self.cases.append(case)
+                self.total += 1
+                if case.shared_with is None:
+                    self.requests_sent += 1
+                if case.timer is not None:
+                    self.timers.append(case.timer)
                 if not case.passed:
                     self.faliure_cases.append(case)
             if isinstance(case, APITestSuite):
-                new_cases.extend(case._cases)
-                for _case in case._cases:
-                    if not _case.passed:
-                        self.faliure_cases.append(_case)
-        return new_cases
+                self.cases.extend(case.executed_cases)
+                self.total += case.executed_count
+                self.requests_sent += case.requests_sent
+                self.timers.extend(case.timers)
+                self.faliure_cases.extend(case.failed_cases)
 
     def get_not_passed_cases(self):
-        return [
-            case for case in self.cases
-            if not case.passed
-        ]
+        return list(self.faliure_cases)
 
     @property
     def pass_rate(self):
-        return 1 - len(self.faliure_cases) / len(self.cases) if self.cases else 0
+        return 1 - len(self.faliure_cases) / self.total if self.total else 0
 
     @property
     def humen_pass_rate(self):
         return f"{self.pass_rate * 100}%"
 
+    def get_timing_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the phase timings of all executed cases.
+        Timings of the sub requests sent by check points are reported as `sub_request.<phase>`.
+        """
+        samples = defaultdict(list)
+        for timer in self.timers:
+            for phase, seconds in timer.phases.items():
+                samples[phase].append(seconds)
+            for sub_timer in timer.sub_timers:
+                for phase, seconds in sub_timer.phases.items():
+                    samples[f'sub_request.{phase}'].append(seconds)
+            samples['total'].append(timer.total)
+        return {phase: summarize_timings(values) for phase, values in samples.items()}
+
+    def show_timing_summary(self):
+        summary = self.get_timing_summary()
+        if not summary:
+            return
+        table = PrettyTable()
+        table.title = 'PHASE TIMINGS (ms)'
+        table.field_names = ['phase', 'count', 'total', 'mean', 'p50', 'p95', 'max']
+        for phase, stats in summary.items():
+            table.add_row([
+                phase,
+                stats['count'],
+                *(f'{stats[key] * 1000:.2f}' for key in ('total', 'mean', 'p50', 'p95', 'max'))
+            ])
+        print(table)
+
     def show_test_result(self):
         print(f'{Fore.RESET}')
         print('='*150)
@@ -50,10 +92,14 @@ class TestEvaluator:
             print(f'{Fore.RED}')
             for case in self.faliure_cases:
                 print(f'case_name | {Fore.RED}{case.name}')
+                if case.case_id:
+                    print(f'case_id   | {Fore.RED}{case.case_id}')
                 print(f'status    | {Fore.RED}FAILURE')
                 if case.request.json:
-                    body = json.dumps(case.request.json)
+                    body = json.dumps(case.request.json, default=to_jsonable)
                     print(f'body      | {Fore.RED}{body}')
+                if case.shared_with is not None:
+                    print(f'shared    | {Fore.RED}{case.shared_with.case_id}')
                 reason = ''.join(f'<{point.error_message}>' for point in case.failed_check_points)
                 print(f'reason    | {Fore.RED}{reason}')
 
@@ -63,13 +109,18 @@ class TestEvaluator:
                     response = case.response.text
 
                 print(f'response  | {Fore.RED}{response}')
+                if case.case_id and self.seed is not None:
+                    print(f'reproduce | {Fore.RED}eagle run --seed {self.seed} --case {case.case_id}')
                 print(Fore.RED+'-' * 150)
 
         table = PrettyTable()
         print(Fore.BLUE)
-        table.field_names = [f'{Fore.BLUE}total_cases', 'pass', 'faliure', 'pass_rate']
-        total = len(self.cases)
+        table.field_names = [f'{Fore.BLUE}total_cases', 'pass', 'faliure', 'pass_rate', 'requests', 'seed']
+        total = self.total
         faliure = len(self.faliure_cases)
-        table.add_row([f'{Fore.BLUE}{total}', total-faliure, faliure, self.humen_pass_rate])
+        table.add_row([
+            f'{Fore.BLUE}{total}', total-faliure, faliure, self.humen_pass_rate, self.requests_sent, self.seed
+        ])
         print(table)
+        self.show_timing_summary()
         print(f'{Fore.RESET}')
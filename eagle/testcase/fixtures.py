@@ -0,0 +1,172 @@
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, Optional, Tuple
+from eagle.exceptions import FixtureError
+from eagle.http.client import AuthenticatedHttpClient
+from eagle.logger import logger
+from eagle.tracing import TracedThreadPoolExecutor
+
+
+class PooledObject(namedtuple('PooledObject', ['pk', 'data'])):
+    """An object created by a `FixturePool`: its primary key and the body of the create response."""
+    __slots__ = ()
+
+
+class FixturePool:
+    """
+    Objects of a Faker class created at a URL ahead of demand, e.g. the object an update or a delete case works on.
+
+    `reserve` creates objects in the background, `concurrency` at a time. `acquire` hands out:
+        - an exclusive object, owned by the caller from then on (it is updated or deleted),
+          `release` gives it back if it was not used;
+        - or the shared object, the same for every caller, who must not change it.
+    `drain` deletes the objects nobody took, and the shared one.
+
+    Usage:
+        >>> pool = get_fixture_pool(UserFaker, '/users/', client, delete_url='/users/{pk}/')
+        >>> pool.reserve(2)
+        >>> user = pool.acquire()
+        >>> user.pk
+        42
+    """
+
+    def __init__(
+        self,
+        faker_class: type,
+        url: str,
+        client: AuthenticatedHttpClient,
+        pk_variable: str = 'id',
+        delete_url: Optional[str] = None,
+        concurrency: int = 4,
+    ) -> None:
+        """
+        Args:
+            delete_url (str, optional): URL deleting an object, with a `{pk}` placeholder. Without it,
+                `drain` leaves the unused objects on the server.
+        """
+        self.faker_class = faker_class
+        self.url = url
+        self.client = client
+        self.pk_variable = pk_variable
+        self.delete_url = delete_url
+        self.concurrency = concurrency
+
+        self._lock = threading.Lock()
+        self._ready: Deque[PooledObject] = deque()
+        self._pending: Deque[Future] = deque()
+        self._shared: Optional[PooledObject] = None
+        self._executor: Optional[TracedThreadPoolExecutor] = None
+
+    def _create(self) -> PooledObject:
+        response = self.faker_class.objects.create(
+            url=self.url, client=self.client, pk_variable=self.pk_variable, delete_url=self.delete_url
+        )
+        try:
+            data = response.json()
+            return PooledObject(pk=data[self.pk_variable], data=data)
+        except (ValueError, KeyError, TypeError):
+            raise FixtureError(
+                f'Could not create a {self.faker_class.__name__} at {self.url}: '
+                f'{response.status_code} {response.text}'
+            )
+
+    def reserve(self, n: int) -> None:
+        """Start creating `n` more objects in the background."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = TracedThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix=f'eagle-fixtures-{self.faker_class.__name__}'
+                )
+            for _ in range(n):
+                self._pending.append(self._executor.submit(self._create))
+
+    def acquire(self, shared: bool = False) -> PooledObject:
+        """
+        Hand out an object: a ready one, else the next one being created, else a new one.
+
+        Args:
+            shared (bool): Hand out the shared object instead of an exclusive one.
+        """
+        if shared:
+            with self._lock:
+                if self._shared is not None:
+                    return self._shared
+            pooled_object = self.acquire()
+            with self._lock:
+                if self._shared is None:
+                    self._shared = pooled_object
+                    return pooled_object
+            # Another caller set the shared object meanwhile.
+            self.release(pooled_object)
+            return self._shared
+
+        with self._lock:
+            if self._ready:
+                return self._ready.popleft()
+            pending = self._pending.popleft() if self._pending else None
+        if pending is not None:
+            return pending.result()
+        return self._create()
+
+    def release(self, pooled_object: PooledObject) -> None:
+        """Give back an unused exclusive object, it is handed out again."""
+        with self._lock:
+            self._ready.append(pooled_object)
+
+    def drain(self) -> None:
+        """Wait for the objects being created, then delete the unused ones and the shared one."""
+        with self._lock:
+            pending, self._pending = self._pending, deque()
+            executor, self._executor = self._executor, None
+        for future in pending:
+            try:
+                self.release(future.result())
+            except Exception as e:
+                logger.warning(f'Fixture of {self.faker_class.__name__} not created: {e}')
+        if executor is not None:
+            executor.shutdown()
+
+        with self._lock:
+            unused = list(self._ready)
+            if self._shared is not None:
+                unused.append(self._shared)
+            self._ready.clear()
+            self._shared = None
+        if unused and self.delete_url is None:
+            logger.warning(f'{len(unused)} unused {self.faker_class.__name__} left at {self.url}: no `delete_url`.')
+            return
+        for pooled_object in unused:
+            url = self.delete_url.format(pk=pooled_object.pk)
+            # A failed delete must not stop the drain: the object stays in the resource journal,
+            # `resources.cleanup` or `eagle cleanup` tries again.
+            try:
+                self.client.delete(url)
+            except Exception as e:
+                logger.warning(f'Could not delete the unused {self.faker_class.__name__} {url}: {e}')
+
+
+# The pools by (Faker class, create URL, client).
+_pools: Dict[Tuple[type, str, int], FixturePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_fixture_pool(faker_class: type, url: str, client: AuthenticatedHttpClient, **kwargs: Any) -> FixturePool:
+    """The pool of `faker_class` objects created at `url` with `client`, `kwargs` are used when it is created."""
+    key = (faker_class, url, id(client))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = FixturePool(faker_class, url, client, **kwargs)
+        return _pools[key]
+
+
+def drain_fixture_pools() -> None:
+    """Drain every pool, see `FixturePool.drain`."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        try:
+            pool.drain()
+        except Exception as e:
+            logger.warning(f'Could not drain the {pool.faker_class.__name__} pool of {pool.url}: {e}')
@@ -0,0 +1,476 @@
+"""
+Import an OpenAPI 3 or JSON Schema document as `Faker` classes and `RestApiCaseSet` classes.
+
+The document is compiled once into a plain JSON description of its fields and endpoints,
+cached on disk under `app_settings.OPENAPI_CACHE_DIR` and keyed by the hash of the document:
+later imports of the same document only read that JSON. The classes are built when they are first used.
+
+Usage:
+    >>> api = import_openapi('openapi.yaml')
+    >>> UserFaker = api.fakers['User']
+    >>> class TestUser(api.casesets['Users'], FakerAutoTestSuite):
+            client = client
+"""
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import yaml
+from eagle.exceptions import OpenAPIImportError
+from eagle.faker import Faker, fields
+from eagle.logger import logger
+from eagle.settings.bases import app_settings
+from eagle.testcase.check_points.http import HttpStatusCodeEqual
+from eagle.testcase.rest_caseset import RestApiCaseSet
+
+
+# Bump when the compiled format changes, so the cached documents are compiled again.
+COMPILED_VERSION = 1
+
+SCHEMA_REF_PREFIXES = ('#/components/schemas/', '#/definitions/', '#/$defs/')
+
+# Valid values of the string formats. A random string is an invalid value of all of them.
+FORMAT_CHOICES = {
+    'date': ['2023-01-31', '2023-06-15', '2024-02-29', '2024-12-01'],
+    'date-time': ['2023-01-31T08:00:00Z', '2023-06-15T12:30:00Z', '2024-02-29T23:59:59Z'],
+    'time': ['08:00:00', '12:30:00', '23:59:59'],
+    'email': ['alice@example.com', 'bob@example.com', 'carol@example.org'],
+    'uri': ['https://example.com/', 'https://example.com/a/b', 'https://example.org/?q=1'],
+    'uuid': [
+        '1b4e28ba-2fa1-41d2-883f-0016d3cca427',
+        '6f1c2f54-0b36-4d4c-9d8e-2f1a5c7b9e10',
+        'c9bf9e57-1685-4c89-bafb-ff5af830be8a',
+    ],
+}
+
+
+class CompiledCaseSet(namedtuple(
+    'CompiledCaseSet',
+    ['name', 'url', 'retrieve_url', 'faker', 'operations', 'create_status', 'invalid_status',
+     'update_method', 'update_status', 'delete_status'],
+)):
+    """The endpoints of a collection, the arguments of `OpenAPICaseSet`."""
+    __slots__ = ()
+
+
+class OpenAPICaseSet(RestApiCaseSet):
+    """
+    A `RestApiCaseSet` generated from a document, only the `operations` the document defines are tested.
+    """
+
+    operations = ()
+
+    def is_case_method_enabled(self, member_name: str) -> bool:
+        return super().is_case_method_enabled(member_name) and any(
+            operation in member_name for operation in self.operations
+        )
+
+
+class LazyClassMap(Mapping):
+    """A read-only mapping whose classes are built on first access and kept."""
+
+    def __init__(self, names: List[str], build: Callable[[str], type]) -> None:
+        self._names = names
+        self._build = build
+        self._classes: Dict[str, type] = {}
+
+    def __getitem__(self, name: str) -> type:
+        if name not in self._classes:
+            if name not in self._names:
+                raise KeyError(name)
+            self._classes[name] = self._build(name)
+        return self._classes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class OpenAPIImport:
+    """
+    The `Faker` classes (`fakers`, by schema name) and the `OpenAPICaseSet` classes (`casesets`, by collection name)
+    of a compiled document.
+
+    Args:
+        compiled (dict): The compiled document.
+        max_depth (int): Levels of named schemas nested in a field, deeper (e.g. recursive) references are left out.
+    """
+
+    def __init__(self, compiled: Dict[str, Any], max_depth: int = 4) -> None:
+        self.schemas: Dict[str, Dict[str, Any]] = compiled['schemas']
+        self.max_depth = max_depth
+        self.compiled_casesets = {
+            caseset['name']: CompiledCaseSet(**caseset) for caseset in compiled['casesets']
+        }
+        self.fakers = LazyClassMap([
+            name for name in self.schemas if 'properties' in self.resolve(name)
+        ], self.build_faker)
+        self.casesets = LazyClassMap(list(self.compiled_casesets), self.build_caseset)
+
+    def resolve(self, name: str) -> Dict[str, Any]:
+        return resolve_alias(self.schemas, {'ref': name})
+
+    def build_field(self, spec: Dict[str, Any], stack: Tuple[str, ...] = ()) -> Optional[fields.Field]:
+        """
+        Build the field of a compiled schema. A reference back to a schema being built,
+        or nested deeper than `max_depth`, is left out (None).
+        """
+        kwargs = dict(spec.get('kwargs', {}))
+        if 'ref' in spec:
+            if spec['ref'] in stack or len(stack) > self.max_depth:
+                return None
+            stack += (spec['ref'],)
+            target = self.schemas[spec['ref']]
+            return self.build_field({**target, 'kwargs': {**target.get('kwargs', {}), **kwargs}}, stack)
+
+        field_class = getattr(fields, spec['field'])
+        if 'properties' in spec:
+            for name, sub_spec in spec['properties'].items():
+                sub_field = self.build_field(sub_spec, stack)
+                if sub_field is not None:
+                    kwargs[name] = sub_field
+        elif 'items' in spec:
+            item = self.build_field(spec['items'], stack)
+            kwargs['fields'] = [item] if item is not None else []
+        return field_class(**kwargs)
+
+    def build_faker(self, name: str) -> type:
+        attrs = {'__module__': __name__}
+        for field_name, spec in self.resolve(name)['properties'].items():
+            field = self.build_field(spec, (name,))
+            if field is not None:
+                attrs[field_name] = field
+        return type(f'{to_class_name(name)}Faker', (Faker,), attrs)
+
+    def build_caseset(self, name: str) -> type:
+        caseset = self.compiled_casesets[name]
+        attrs = {
+            '__module__': __name__,
+            'url': caseset.url,
+            'retrieve_url': caseset.retrieve_url,
+            'operations': tuple(caseset.operations),
+            'create_valid_check_points': [HttpStatusCodeEqual(caseset.create_status)],
+            'create_invalid_check_points': [HttpStatusCodeEqual(caseset.invalid_status)],
+            'update_method': caseset.update_method,
+            'update_valid_check_points': [HttpStatusCodeEqual(caseset.update_status)],
+            'update_invalid_check_points': [HttpStatusCodeEqual(caseset.invalid_status)],
+            'delete_check_points': [HttpStatusCodeEqual(caseset.delete_status)],
+        }
+        if caseset.faker is not None:
+            attrs['faker_class'] = self.fakers[caseset.faker]
+        return type(f'{to_class_name(name)}CaseSet', (OpenAPICaseSet,), attrs)
+
+
+def resolve_alias(schemas: Dict[str, Dict[str, Any]], spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Follow the references of a compiled schema to the schema it is an alias of."""
+    seen = set()
+    while 'ref' in spec and spec['ref'] not in seen:
+        seen.add(spec['ref'])
+        spec = schemas[spec['ref']]
+    return spec
+
+
+def to_class_name(name: str) -> str:
+    return ''.join(part[:1].upper() + part[1:] for part in re.split(r'[^0-9a-zA-Z]+', name) if part)
+
+
+class SchemaCompiler:
+    """
+    Compile the schemas of a document to plain JSON: the field class and its arguments,
+    with the sub-fields in `properties` (dicts) or `items` (lists) and the named schemas as `ref`.
+    """
+
+    def __init__(self, document: Dict[str, Any]) -> None:
+        self.document = document
+        self.schemas: Dict[str, Dict[str, Any]] = {}
+        self.pending: List[Tuple[str, Dict[str, Any]]] = []
+
+    def resolve_pointer(self, ref: str) -> Any:
+        if not ref.startswith('#/'):
+            raise OpenAPIImportError(f'Only local references are supported: {ref}')
+        node = self.document
+        for part in ref[2:].split('/'):
+            part = part.replace('~1', '/').replace('~0', '~')
+            try:
+                node = node[int(part)] if isinstance(node, list) else node[part]
+            except (KeyError, IndexError, ValueError):
+                raise OpenAPIImportError(f'Unresolvable reference: {ref}')
+        return node
+
+    def get_schema_name(self, ref: str) -> Optional[str]:
+        for prefix in SCHEMA_REF_PREFIXES:
+            if ref.startswith(prefix):
+                return ref[len(prefix):]
+        return None
+
+    def deref(self, schema: Dict[str, Any], seen: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """Follow the `$ref` of `schema` to the schema it points to."""
+        while '$ref' in schema:
+            if schema['$ref'] in seen:
+                return {}
+            seen += (schema['$ref'],)
+            schema = self.resolve_pointer(schema['$ref'])
+        return schema
+
+    def merge_all_of(self, schema: Dict[str, Any], seen: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        merged = {key: value for key, value in schema.items() if key != 'allOf'}
+        properties = dict(merged.get('properties', {}))
+        required = list(merged.get('required', []))
+        for part in schema['allOf']:
+            part = self.deref(part, seen)
+            if 'allOf' in part:
+                part = self.merge_all_of(part, seen)
+            properties.update(part.get('properties', {}))
+            required += part.get('required', [])
+            for key, value in part.items():
+                merged.setdefault(key, value)
+        if properties:
+            merged['properties'] = properties
+            merged.setdefault('type', 'object')
+        merged['required'] = required
+        return merged
+
+    def compile_named(self, name: str, schema: Dict[str, Any]) -> None:
+        """
+        Compile a named schema. The named schemas it references are queued and compiled after it,
+        so deep or recursive references never nest the compilation.
+        """
+        self.reference(name, schema)
+        while self.pending:
+            pending_name, pending_schema = self.pending.pop()
+            self.schemas[pending_name] = self.compile(pending_schema)
+
+    def reference(self, name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        if name not in self.schemas:
+            # Registered right away, so the next references do not queue it again.
+            self.schemas[name] = {}
+            self.pending.append((name, schema))
+        return {'ref': name}
+
+    def compile(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        if '$ref' in schema:
+            name = self.get_schema_name(schema['$ref'])
+            if name is None:
+                return self.compile(self.resolve_pointer(schema['$ref']))
+            return self.reference(name, self.resolve_pointer(schema['$ref']))
+
+        if 'allOf' in schema:
+            schema = self.merge_all_of(schema)
+
+        allow_null = bool(schema.get('nullable'))
+        for key in ('oneOf', 'anyOf'):
+            if key in schema:
+                alternatives = [alternative for alternative in schema[key] if alternative.get('type') != 'null']
+                allow_null = allow_null or len(alternatives) < len(schema[key])
+                if alternatives:
+                    compiled = self.compile(alternatives[0])
+                    if allow_null:
+                        compiled['kwargs'] = {**compiled.get('kwargs', {}), 'allow_null': True}
+                    return compiled
+
+        schema_type = schema.get('type')
+        if isinstance(schema_type, list):
+            allow_null = allow_null or 'null' in schema_type
+            schema_type = next((item for item in schema_type if item != 'null'), None)
+        if schema_type is None:
+            schema_type = 'object' if 'properties' in schema else 'array' if 'items' in schema else 'string'
+
+        kwargs: Dict[str, Any] = {'allow_null': allow_null}
+        if 'enum' in schema:
+            choices = [choice for choice in schema['enum'] if choice is not None]
+            kwargs.update(choices=choices, allow_null=allow_null or None in schema['enum'], allow_blank='' in choices)
+            return {'field': 'ChoiceField', 'kwargs': kwargs}
+
+        if schema_type == 'object':
+            required = set(schema.get('required', []))
+            properties = {}
+            for name, sub_schema in schema.get('properties', {}).items():
+                # Read-only properties are not sent.
+                if self.deref(sub_schema).get('readOnly'):
+                    continue
+                compiled = self.compile(sub_schema)
+                compiled['kwargs'] = {**compiled.get('kwargs', {}), 'required': name in required}
+                properties[name] = compiled
+            return {'field': 'DictField', 'kwargs': kwargs, 'properties': properties}
+
+        if schema_type == 'array':
+            min_length = schema.get('minItems', 0)
+            kwargs.update(min_length=min_length, max_length=schema.get('maxItems', max(10, min_length)))
+            return {'field': 'ListField', 'kwargs': kwargs, 'items': self.compile(schema.get('items', {}))}
+
+        if schema_type in ('integer', 'number'):
+            kwargs.update(self.compile_range(schema, step=1 if schema_type == 'integer' else 0))
+            return {'field': 'IntegerField' if schema_type == 'integer' else 'FloatField', 'kwargs': kwargs}
+
+        if schema_type == 'boolean':
+            return {'field': 'BooleanField', 'kwargs': kwargs}
+
+        if schema.get('format') in FORMAT_CHOICES:
+            kwargs.update(choices=FORMAT_CHOICES[schema['format']], allow_blank=False)
+            return {'field': 'ChoiceField', 'kwargs': kwargs}
+
+        min_length = schema.get('minLength', 0)
+        kwargs.update(
+            min_length=min_length or 1,
+            max_length=schema.get('maxLength', max(20, min_length)),
+            allow_blank=not min_length,
+        )
+        return {'field': 'CharField', 'kwargs': kwargs}
+
+    def compile_range(self, schema: Dict[str, Any], step: int) -> Dict[str, Any]:
+        kwargs = {}
+        for key, exclusive_key, name, sign in (
+            ('minimum', 'exclusiveMinimum', 'min_value', 1),
+            ('maximum', 'exclusiveMaximum', 'max_value', -1),
+        ):
+            exclusive = schema.get(exclusive_key)
+            if isinstance(exclusive, (int, float)) and not isinstance(exclusive, bool):
+                # OpenAPI 3.1 / JSON Schema: the exclusive bound is the value itself.
+                kwargs[name] = exclusive + sign * step
+            elif key in schema:
+                kwargs[name] = schema[key] + (sign * step if exclusive else 0)
+        return kwargs
+
+
+class OpenAPICompiler(SchemaCompiler):
+    """Compile the schemas and the collection endpoints of an OpenAPI 3 document."""
+
+    item_path_pattern = re.compile(r'^(?P<url>.*/)\{(?P<pk>[^}/]+)\}/?$')
+
+    def compile_document(self) -> Dict[str, Any]:
+        for name, schema in self.document.get('components', {}).get('schemas', {}).items():
+            self.compile_named(name, schema)
+        casesets = [caseset._asdict() for caseset in self.compile_casesets()]
+        return {'version': COMPILED_VERSION, 'schemas': self.schemas, 'casesets': casesets}
+
+    def get_request_schema(self, operation: Dict[str, Any], name: str) -> Optional[str]:
+        """The name of the schema of the JSON body of `operation`, inline schemas are named after `name`."""
+        request_body = self.deref(operation.get('requestBody', {}))
+        schema = request_body.get('content', {}).get('application/json', {}).get('schema')
+        if schema is None:
+            return None
+        schema_name = self.get_schema_name(schema.get('$ref', ''))
+        if schema_name is None:
+            schema_name = operation.get('operationId') or f'{name}Request'
+        self.compile_named(schema_name, schema)
+        return schema_name if 'properties' in resolve_alias(self.schemas, {'ref': schema_name}) else None
+
+    def get_status(self, operation: Dict[str, Any], candidates: Tuple[int, ...], default: int) -> int:
+        responses = {str(code) for code in operation.get('responses', {})}
+        return next((code for code in candidates if str(code) in responses), default)
+
+    def compile_casesets(self) -> Iterator[CompiledCaseSet]:
+        paths = self.document.get('paths', {})
+        item_paths = {}
+        for path in paths:
+            if match := self.item_path_pattern.match(path):
+                item_paths[match.group('url')] = (path, match.group('pk'))
+
+        for url, path_item in paths.items():
+            if '{' in url:
+                continue
+            name = to_class_name(url) or 'Root'
+            collection_url = url if url.endswith('/') else url + '/'
+            item_path, pk = item_paths.get(collection_url, (None, None))
+            item = paths.get(item_path, {})
+
+            operations = []
+            faker = None
+            create_status = invalid_status = update_status = delete_status = None
+            if 'post' in path_item:
+                faker = self.get_request_schema(path_item['post'], name)
+                if faker is not None:
+                    operations.append('create')
+                create_status = self.get_status(path_item['post'], (201, 200), 201)
+                invalid_status = self.get_status(path_item['post'], (400, 422), 400)
+            if 'get' in path_item:
+                operations.append('list')
+
+            update_method = next((method for method in ('put', 'patch') if method in item), 'put')
+            if faker is not None and update_method in item:
+                operations.append('update')
+                update_status = self.get_status(item[update_method], (200, 204), 200)
+            if 'delete' in item:
+                operations.append('delete')
+                delete_status = self.get_status(item['delete'], (204, 200), 204)
+
+            if not operations:
+                continue
+            yield CompiledCaseSet(
+                name=name,
+                url=url,
+                retrieve_url=item_path.replace('{' + pk + '}', '{pk}') if item_path else None,
+                faker=faker,
+                operations=operations,
+                create_status=create_status or 201,
+                invalid_status=invalid_status or 400,
+                update_method=update_method.upper(),
+                update_status=update_status or 200,
+                delete_status=delete_status or 204,
+            )
+
+
+class JSONSchemaCompiler(SchemaCompiler):
+    """Compile a JSON Schema document: its definitions, and the document itself if it describes an object."""
+
+    def compile_document(self) -> Dict[str, Any]:
+        for key, prefix in (('definitions', '#/definitions/'), ('$defs', '#/$defs/')):
+            for name in self.document.get(key, {}):
+                self.compile_named(name, self.resolve_pointer(prefix + name))
+        if 'properties' in self.document or 'allOf' in self.document:
+            self.compile_named(self.document.get('title') or 'Root', self.document)
+        return {'version': COMPILED_VERSION, 'schemas': self.schemas, 'casesets': []}
+
+
+def compile_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    if 'openapi' in document:
+        return OpenAPICompiler(document).compile_document()
+    if 'swagger' in document:
+        raise OpenAPIImportError('Swagger 2 documents are not supported, convert them to OpenAPI 3.')
+    return JSONSchemaCompiler(document).compile_document()
+
+
+def get_cache_path(content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()
+    return os.path.join(app_settings.OPENAPI_CACHE_DIR, f'{digest}.v{COMPILED_VERSION}.json')
+
+
+def import_openapi(path: str, cache: bool = True, max_depth: int = 4) -> OpenAPIImport:
+    """
+    Import an OpenAPI 3 or JSON Schema document (JSON or YAML).
+
+    Args:
+        path (str): Path of the document.
+        cache (bool): Read and write the compiled document in `app_settings.OPENAPI_CACHE_DIR`.
+        max_depth (int): See `OpenAPIImport`.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    cache_path = get_cache_path(content)
+    if cache and os.path.exists(cache_path):
+        with open(cache_path, encoding='utf-8') as f:
+            return OpenAPIImport(json.load(f), max_depth)
+
+    if path.endswith('.json'):
+        document = json.loads(content)
+    else:
+        document = yaml.load(content, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    if not isinstance(document, dict):
+        raise OpenAPIImportError(f'{path} is not an OpenAPI or JSON Schema document.')
+    compiled = compile_document(document)
+    logger.info(f'Compiled {len(compiled["schemas"])} schemas and {len(compiled["casesets"])} case sets of {path}')
+
+    if cache:
+        os.makedirs(app_settings.OPENAPI_CACHE_DIR, exist_ok=True)
+        # Written aside then moved, so a concurrent import never reads half a file.
+        temporary_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(compiled, f, separators=(',', ':'))
+        os.replace(temporary_path, cache_path)
+    return OpenAPIImport(compiled, max_depth)
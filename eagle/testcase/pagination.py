@@ -0,0 +1,343 @@
+"""
+Crawl every page of a paginated list, and check each item is listed exactly once.
+"""
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from requests.models import Response
+from eagle.http.client import AuthenticatedHttpClient
+from eagle.tracing import TracedThreadPoolExecutor
+from eagle.utils import get_value_from_json_path
+
+
+PAGINATION_CHOICES = ('page', 'offset', 'cursor')
+
+# Integer ids below this are stored in a bitmap (32 MiB at most), the others in a set.
+MAX_BITMAP_ID = 1 << 28
+
+# The duplicated ids kept in a report, to show some of them.
+MAX_REPORTED_DUPLICATES = 10
+
+
+def with_query(url: str, **params: Any) -> str:
+    """`url` with the query params `params`, replacing the params of the same name."""
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    query_params = dict(parse_qsl(query, keep_blank_values=True))
+    query_params.update(params)
+    return urlunsplit((scheme, netloc, path, urlencode(query_params), fragment))
+
+
+class IdSet:
+    """
+    The ids seen by a crawl. Non-negative integer ids cost a bit each (a bitmap),
+    so the ids of millions of items fit in a few MiB; the other ids are kept in a set.
+    """
+
+    def __init__(self) -> None:
+        self._bitmap = bytearray()
+        self._others: Set[Any] = set()
+        self._len = 0
+
+    def add(self, item_id: Any) -> bool:
+        """Add `item_id`, returns False if it was already seen."""
+        if type(item_id) is int and 0 <= item_id < MAX_BITMAP_ID:
+            index, bit = item_id >> 3, 1 << (item_id & 7)
+            if index >= len(self._bitmap):
+                # Grow by doubling, the ids of a crawl mostly come in increasing order.
+                self._bitmap.extend(bytes(max(index + 1, 2 * len(self._bitmap)) - len(self._bitmap)))
+            if self._bitmap[index] & bit:
+                return False
+            self._bitmap[index] |= bit
+        else:
+            if item_id in self._others:
+                return False
+            self._others.add(item_id)
+        self._len += 1
+        return True
+
+    def __contains__(self, item_id: Any) -> bool:
+        if type(item_id) is int and 0 <= item_id < MAX_BITMAP_ID:
+            index = item_id >> 3
+            return index < len(self._bitmap) and bool(self._bitmap[index] & (1 << (item_id & 7)))
+        return item_id in self._others
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class FailedPage(namedtuple('FailedPage', ['url', 'status_code', 'reason'])):
+    """A page that could not be read: its URL, the status code (None if no response) and the reason."""
+    __slots__ = ()
+
+
+class CrawlReport(namedtuple('CrawlReport', [
+    'pages', 'items', 'unique', 'expected', 'duplicates', 'duplicate_ids', 'short_pages', 'counts', 'failed_pages', 'elapsed',
+])):
+    """
+    The result of a `PaginationCrawler.crawl`:
+        - pages, items, unique: the pages read, the items listed and the distinct ids among them;
+        - expected: the `count` of the first page (None if the list has no count, e.g. cursor pagination);
+        - duplicates, duplicate_ids: the items listed again, and some of their ids;
+        - short_pages: the URLs of the pages, other than the last, with less than a page of items;
+        - counts: the distinct `count`s read, more than one if the list changed during the crawl;
+        - failed_pages: the `FailedPage`s;
+        - elapsed: the duration of the crawl, in seconds.
+    """
+    __slots__ = ()
+
+    @property
+    def missing(self) -> Optional[int]:
+        """The items counted but never listed (gaps)."""
+        if self.expected is None:
+            return None
+        return max(self.expected - self.unique, 0)
+
+    @property
+    def unexpected(self) -> Optional[int]:
+        """The distinct items listed beyond the count."""
+        if self.expected is None:
+            return None
+        return max(self.unique - self.expected, 0)
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def consistent(self) -> bool:
+        return (
+            not self.duplicates
+            and not self.missing
+            and not self.unexpected
+            and not self.short_pages
+            and not self.failed_pages
+            and len(self.counts) <= 1
+        )
+
+    def summary(self) -> str:
+        summary = (
+            f'{self.pages} pages in {self.elapsed:.2f}s ({self.pages_per_second:.1f} pages/s), '
+            f'{self.items} items, {self.unique} unique'
+        )
+        if self.expected is not None:
+            summary += f', expected {self.expected}, missing {self.missing}, unexpected {self.unexpected}'
+        if self.duplicates:
+            summary += f', {self.duplicates} duplicates (e.g. {", ".join(map(str, self.duplicate_ids))})'
+        if self.short_pages:
+            summary += f', {len(self.short_pages)} short pages (e.g. {self.short_pages[0]})'
+        if len(self.counts) > 1:
+            summary += f', count changed during the crawl: {sorted(self.counts)}'
+        if self.failed_pages:
+            failed_page = self.failed_pages[0]
+            summary += f', {len(self.failed_pages)} failed pages (e.g. {failed_page.url}: {failed_page.status_code})'
+        return summary
+
+
+class PaginationCrawler:
+    """
+    Read every page of a list and record each item id in an `IdSet`, without keeping the pages.
+
+    The pagination is either:
+        - 'page': `?page=<n>&page_size=<size>`, the pages after the first are fetched `concurrency` at a time;
+        - 'offset': `?offset=<n * size>&<page_size_query_param>=<size>` (e.g. `limit`), fetched the same way;
+        - 'cursor': the `next` URL of each page, a page is fetched while the previous one is read.
+
+    Usage:
+        >>> crawler = PaginationCrawler(client, '/users/', page_size=1000, concurrency=8)
+        >>> report = crawler.crawl()
+        >>> report.consistent, report.pages_per_second
+        (True, 85.2)
+    """
+
+    def __init__(
+        self,
+        client: AuthenticatedHttpClient,
+        url: str,
+        page_size: int,
+        pagination: str = 'page',
+        data_json_path: str = '$',
+        count_key: str = 'count',
+        results_key: str = 'results',
+        next_key: str = 'next',
+        id_key: str = 'id',
+        page_query_param: str = 'page',
+        page_size_query_param: str = 'page_size',
+        offset_query_param: str = 'offset',
+        concurrency: int = 8,
+    ) -> None:
+        """
+        Args:
+            url (str): The URL of the list, it may have query params of its own (e.g. filters).
+            pagination (str): 'page', 'offset' or 'cursor'.
+            data_json_path (str): JSON path of the object holding `count_key`, `results_key` and `next_key`.
+            concurrency (int): Maximum number of pages fetched at the same time, with 'page' and 'offset'.
+        """
+        if pagination not in PAGINATION_CHOICES:
+            raise ValueError(f'`pagination` must be one of {PAGINATION_CHOICES}, got {pagination!r}.')
+        self.client = client
+        self.url = url
+        self.page_size = page_size
+        self.pagination = pagination
+        self.data_json_path = data_json_path
+        self.count_key = count_key
+        self.results_key = results_key
+        self.next_key = next_key
+        self.id_key = id_key
+        self.page_query_param = page_query_param
+        self.page_size_query_param = page_size_query_param
+        self.offset_query_param = offset_query_param
+        self.concurrency = concurrency
+
+    @property
+    def first_page_url(self) -> str:
+        """The URL of the first page, a list case sending it can hand its response to `crawl`."""
+        return with_query(self.url, **{self.page_size_query_param: self.page_size})
+
+    def get_page_url(self, page: int) -> str:
+        """The URL of the page `page` (from 1) of a 'page' or 'offset' pagination."""
+        if self.pagination == 'offset':
+            return with_query(self.first_page_url, **{self.offset_query_param: (page - 1) * self.page_size})
+        return with_query(self.first_page_url, **{self.page_query_param: page})
+
+    def fetch(self, url: str) -> Tuple[str, Optional[Response], Optional[Dict[str, Any]], Optional[str]]:
+        """Fetch a page: its URL, the response, the object at `data_json_path` and why it is unreadable."""
+        try:
+            response = self.client.request('GET', url)
+        except Exception as e:
+            return url, None, None, str(e)
+        return (url, response, *self.read(response))
+
+    def read(self, response: Response) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        if response.status_code != 200:
+            return None, response.text[:200]
+        try:
+            data = get_value_from_json_path(response.json(), self.data_json_path)
+        except ValueError as e:
+            return None, f'Invalid response json, {e}'
+        if not isinstance(data, dict) or not isinstance(data.get(self.results_key), list):
+            return None, f'No `{self.results_key}` list at {self.data_json_path}'
+        return data, None
+
+    def crawl(self, first_response: Optional[Response] = None) -> CrawlReport:
+        """
+        Crawl the list.
+
+        Args:
+            first_response (Response, optional): The response of `first_page_url`, fetched if not given.
+        """
+        crawl = _Crawl(self)
+        start = time.perf_counter()
+        if first_response is None:
+            page = self.fetch(self.first_page_url)
+        else:
+            page = (self.first_page_url, first_response, *self.read(first_response))
+
+        if self.pagination == 'cursor':
+            self._crawl_cursor(crawl, page)
+        else:
+            self._crawl_pages(crawl, page)
+        return crawl.report(time.perf_counter() - start)
+
+    def _crawl_pages(self, crawl: '_Crawl', first_page: Tuple) -> None:
+        url, response, data, reason = first_page
+        count = data.get(self.count_key) if data is not None else None
+        if data is not None and not isinstance(count, int):
+            data, reason = None, f'No `{self.count_key}` in the first page'
+        last_page = max(-(-count // self.page_size), 1) if data is not None else 1
+        if crawl.ingest(url, response, data, reason, last=last_page == 1) is None:
+            return
+        crawl.expected = count
+        if last_page == 1:
+            return
+        last_page_url = self.get_page_url(last_page)
+
+        pages: Iterator[int] = iter(range(2, last_page + 1))
+        with TracedThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='eagle-crawl') as executor:
+            # Only `concurrency` pages are in flight, each page is read and dropped as soon as it arrives.
+            in_flight = set()
+            for page in pages:
+                in_flight.add(executor.submit(self.fetch, self.get_page_url(page)))
+                if len(in_flight) >= self.concurrency:
+                    break
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, response, data, reason = future.result()
+                    crawl.ingest(url, response, data, reason, last=url == last_page_url)
+                    page = next(pages, None)
+                    if page is not None:
+                        in_flight.add(executor.submit(self.fetch, self.get_page_url(page)))
+
+    def _crawl_cursor(self, crawl: '_Crawl', first_page: Tuple) -> None:
+        page = first_page
+        with TracedThreadPoolExecutor(max_workers=1, thread_name_prefix='eagle-crawl') as executor:
+            while True:
+                url, response, data, reason = page
+                next_url = data.get(self.next_key) if data is not None else None
+                # The next page is on its way while this one is read.
+                pending = executor.submit(self.fetch, next_url) if next_url else None
+                if crawl.pages == 0 and data is not None and isinstance(data.get(self.count_key), int):
+                    crawl.expected = data[self.count_key]
+                crawl.ingest(url, response, data, reason, last=pending is None)
+                if pending is None:
+                    return
+                page = pending.result()
+
+
+class _Crawl:
+    """The state of a crawl, only updated by the thread running it."""
+
+    def __init__(self, crawler: PaginationCrawler) -> None:
+        self.crawler = crawler
+        self.ids = IdSet()
+        self.pages = 0
+        self.items = 0
+        self.expected: Optional[int] = None
+        self.duplicates = 0
+        self.duplicate_ids: List[Any] = []
+        self.short_pages: List[str] = []
+        self.counts: Set[int] = set()
+        self.failed_pages: List[FailedPage] = []
+
+    def ingest(
+        self,
+        url: str,
+        response: Optional[Response],
+        data: Optional[Dict[str, Any]],
+        reason: Optional[str],
+        last: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        if data is None:
+            self.failed_pages.append(FailedPage(url, getattr(response, 'status_code', None), reason))
+            return None
+        crawler = self.crawler
+        self.pages += 1
+        items = data[crawler.results_key]
+        self.items += len(items)
+        if isinstance(data.get(crawler.count_key), int):
+            self.counts.add(data[crawler.count_key])
+        if len(items) < crawler.page_size and not last:
+            self.short_pages.append(url)
+        for item in items:
+            item_id = item.get(crawler.id_key) if isinstance(item, dict) else None
+            if not self.ids.add(item_id):
+                self.duplicates += 1
+                if len(self.duplicate_ids) < MAX_REPORTED_DUPLICATES:
+                    self.duplicate_ids.append(item_id)
+        return data
+
+    def report(self, elapsed: float) -> CrawlReport:
+        return CrawlReport(
+            pages=self.pages,
+            items=self.items,
+            unique=len(self.ids),
+            expected=self.expected,
+            duplicates=self.duplicates,
+            duplicate_ids=self.duplicate_ids,
+            short_pages=self.short_pages,
+            counts=self.counts,
+            failed_pages=self.failed_pages,
+            elapsed=elapsed,
+        )
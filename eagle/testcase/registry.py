@@ -1,20 +1,78 @@
+from typing import Any, List
+
+
+class RegisteredTestCase:
+    """
+    A registered test case, built only when the runner pulls it: registering, listing
+    or selecting test cases generates no payload and sends no request.
+    """
+
+    def __init__(self, test_case: Any):
+        """
+        Args:
+            test_case: A test case (or suite) class, built with no arguments, or an already built test case.
+        """
+        self._test_case = test_case
+        self.test_case_cls = test_case if isinstance(test_case, type) else type(test_case)
+        self.name = self.test_case_cls.__name__
+        self.module = self.test_case_cls.__module__
+
+    @property
+    def is_built(self) -> bool:
+        return not isinstance(self._test_case, type)
+
+    def build(self):
+        if not self.is_built:
+            self._test_case = self._test_case()
+        return self._test_case
+
+    def may_contain(self, case_id: str) -> bool:
+        """
+        Whether the test case may contain the case `case_id`, without building it.
+        The generated cases of a case set are named after its class (`<class name>.<method>:<key>`).
+        """
+        from eagle.testcase.rest_caseset import RestApiCaseSet
+
+        if self.is_built or not issubclass(self.test_case_cls, RestApiCaseSet):
+            return True
+        return case_id.split('.', 1)[0] == self.name
+
+    def __repr__(self) -> str:
+        return f'<RegisteredTestCase {self.module}.{self.name}>'
+
 
 class TestCaseRegistry:
     def __init__(self):
-        self.test_cases = []
+        self.test_cases: List[RegisteredTestCase] = []
 
-    def register(self, test_case_cls):
-        self.test_cases.append(test_case_cls)
+    def register(self, test_case) -> RegisteredTestCase:
+        registered = RegisteredTestCase(test_case)
+        self.test_cases.append(registered)
+        return registered
 
-    def get_test_cases(self):
+    def get_test_cases(self) -> List[RegisteredTestCase]:
         return self.test_cases
 
 
 registry = TestCaseRegistry()
 
 
-def register_test_case(test_case_cls):
-    test_case = test_case_cls
-    if isinstance(test_case_cls, type):
-        test_case = test_case_cls()
-    registry.register(test_case)
+def build_test_case(test_case: Any):
+    """The test case of a `RegisteredTestCase`, built now, or `test_case` itself."""
+    if isinstance(test_case, RegisteredTestCase):
+        return test_case.build()
+    return test_case
+
+
+def register_test_case(test_case_cls: Any):
+    """
+    Register a test case class (or a built test case), it is built when the runner executes it.
+    Returns its argument, so it is also a class decorator.
+
+    Usage:
+        >>> @register_test_case
+            class TestUser(RestApiCaseSet, FakerAutoTestSuite):
+                ...
+    """
+    registry.register(test_case_cls)
+    return test_case_cls
@@ -1,4 +1,5 @@
-from typing import List
+from typing import Iterator, List, Tuple
+from itertools import chain
 from eagle.testcase.check_points.http import (
     HttpStatusCodeEqual,
     CallAPICheckPoint,
@@ -7,27 +8,46 @@ from eagle.testcase.check_points.http import (
     HttpResponseValueInListItemsCheckPoint,
     HttpResponseValueContainCheckPoint,
     CheckPoint,
-    HttpResponseListPaginationCheckPoint
+    HttpResponseListPaginationCheckPoint,
+    HttpResponsePaginationCrawlCheckPoint,
+    HttpResponseNotModifiedCheckPoint,
+    HttpResponseSchemaCheckPoint
 )
 import re
 from eagle.testcase.unit import APIEndpointTestCase
-import inspect
+from eagle.testcase.pagination import PaginationCrawler
 from eagle.faker.bases import Faker
 from eagle.http.client import AuthenticatedHttpClient
 from eagle.http.hooks import show_response_table
 from eagle.logger import logger
+from eagle.combinatorics import covering_array, stratified_sample
+from eagle.seed import get_seed, seeded_random
+from eagle.settings.bases import app_settings
+from eagle.testcase.fixtures import FixturePool, get_fixture_pool
+from eagle.resources import track_created_resource
 
 
 class FakerAsTestCaseMixin:
 
+    def get_case_id(self, method: str, key: str = '') -> str:
+        return f'{type(self).__name__}.{method}:{key}'
+
     def generate_valid_case(self, faker: Faker, **kwargs):
-        return [APIEndpointTestCase(json=faker.valid_data, **kwargs)]
+        case_id = self.get_case_id(kwargs['method'], 'valid')
+        if app_settings.CASE_ID is not None and app_settings.CASE_ID != case_id:
+            return []
+        return [APIEndpointTestCase(json=faker.valid_data, case_id=case_id, **kwargs)]
 
     def generate_invalid_case(self, faker: Faker, **kwargs):
-        return [
-            APIEndpointTestCase(json=invalid_data.data, **kwargs)
-            for invalid_data in faker.invalid_data
-        ]
+        return list(self.iter_invalid_case(faker, **kwargs))
+
+    def iter_invalid_case(self, faker: Faker, **kwargs) -> Iterator[APIEndpointTestCase]:
+        """
+        Lazy `generate_invalid_case`, the invalid data of each case is generated when the case is consumed.
+        """
+        case_id_prefix = self.get_case_id(kwargs['method'])
+        for invalid_data in faker.iter_selected_invalid_data(case_id_prefix):
+            yield APIEndpointTestCase(json=invalid_data.data, case_id=case_id_prefix + invalid_data.key, **kwargs)
 
 
 class CreateApiMixin:
@@ -48,31 +68,45 @@ class CreateApiMixin:
         return self.create_url or self.url
 
     def get_extra_create_valid_check_points(self, faker):
+        schema_check_points = self.get_response_schema_check_points(self.create_json_path)
         if self.disable_payload_check:
-            return []
+            return schema_check_points
         return [
            HttpResponseJsonIncludeCheckPoint(faker.valid_data, self.create_json_path)
-        ]
+        ] + schema_check_points
+
+    def get_create_response_hooks(self):
+        # Invalid data accepted by mistake creates an object too.
+        return [{
+            'func': track_created_resource,
+            'kwargs': {
+                'client': self.client,
+                'pk_variable': self.pk_variable,
+                'delete_url': self.get_resource_delete_url(),
+            },
+        }]
 
     def get_create_test_cases(self):
         url = self.get_create_url()
-        faker = self.get_faker_class()()
+        faker = self.get_faker_class()(key=self.get_case_id(self.create_method))
         valid_cases = self.generate_valid_case(
             faker=faker,
             method=self.create_method,
             url=url,
             client=self.client,
-            check_points=self.create_valid_check_points + self.get_extra_create_valid_check_points(faker)
+            check_points=self.create_valid_check_points + self.get_extra_create_valid_check_points(faker),
+            response_hooks=self.get_create_response_hooks(),
         )
-        invalid_cases = self.generate_invalid_case(
+        invalid_cases = self.iter_invalid_case(
             faker=faker,
             method=self.create_method,
             url=url,
             client=self.client,
             check_points=self.create_invalid_check_points,
+            response_hooks=self.get_create_response_hooks(),
         )
 
-        return valid_cases + invalid_cases
+        return chain(valid_cases, invalid_cases)
 
 
 class UpdateApiMixin:
@@ -98,20 +132,16 @@ class UpdateApiMixin:
         return url
 
     def create_retrieve_object(self):
-        if getattr(self, 'create_url', None) is None and self.url is None:
-            raise AttributeError('`create_url` or `url` is not defined.')
-        self.retrieve_object = self.get_faker_class().objects.create(
-            url=getattr(self, 'create_url', None) or self.url,
-            client=self.client,
-        )
+        # The object is updated: it is exclusive to this case set.
+        self.retrieve_object = self.get_fixture_pool().acquire()
 
     def get_update_pk(self):
         if not getattr(self, 'retrieve_object', None):
             self.create_retrieve_object()
-        return self.retrieve_object.json()[self.pk_variable]
+        return self.retrieve_object.pk
 
     def get_extra_update_valid_check_points(self, faker):
-        return [
+        return self.get_response_schema_check_points(self.update_json_path) + [
             HttpResponseJsonIncludeCheckPoint(faker.valid_data, self.update_json_path),
             CallAPICheckPoint(
                 method='GET',
@@ -127,7 +157,7 @@ class UpdateApiMixin:
 
     def get_update_test_cases(self, *args, **kwargs):
         url = self.get_update_url()
-        faker = self.get_faker_class()()
+        faker = self.get_faker_class()(key=self.get_case_id(self.update_method))
         valid_cases = self.generate_valid_case(
             faker=faker,
             method=self.update_method,
@@ -135,7 +165,7 @@ class UpdateApiMixin:
             client=self.client,
             check_points=self.update_valid_check_points + self.get_extra_update_valid_check_points(faker)
         )
-        invalid_cases = self.generate_invalid_case(
+        invalid_cases = self.iter_invalid_case(
             faker=faker,
             method=self.update_method,
             url=url,
@@ -143,12 +173,8 @@ class UpdateApiMixin:
             check_points=self.update_invalid_check_points,
         )
 
-        return valid_cases + invalid_cases
+        return chain(valid_cases, invalid_cases)
 
-    def clenup_update_test_cases(self):
-        if getattr(self, 'retrieve_object', None):
-            url = self.get_update_url()
-            self.client.delete(url)
 
 class DeleteApiMixin:
 
@@ -171,18 +197,13 @@ class DeleteApiMixin:
         return url
 
     def create_delete_object(self):
-        if getattr(self, 'create_url', None) is None and self.url is None:
-            raise AttributeError('`create_url` or `url` is not defined.')
-        self.delete_object = self.get_faker_class().objects.create(
-            url=getattr(self, 'create_url', None) or self.url,
-            client=self.client,
-        )
+        # The object is deleted: it is exclusive to this case set.
+        self.delete_object = self.get_fixture_pool().acquire()
 
     def get_delete_pk(self):
         if not getattr(self, 'delete_object', None):
             self.create_delete_object()
-        print(self.delete_object.json())
-        return self.delete_object.json()[self.pk_variable]
+        return self.delete_object.pk
 
     def get_extra_delete_check_points(self):
         return [
@@ -208,7 +229,31 @@ class DeleteApiMixin:
         ]
 
 
+LIST_SAMPLING_CHOICES = (None, 'stratified', 'pairwise', 'random')
+
+
 class ListApiMixin:
+    """
+    List API test case mixin.
+
+    By default every filter value, every search and every (filter value, search) pair has its own case.
+    With `list_combination_strength` set, the filters and the search are combined in the same request instead,
+    along a t-wise covering array: each filter and the search are either absent or take one of their values,
+    and every combination of any t of them is in some case (2: pairwise).
+    `list_case_budget` caps the number of combined cases, and enables the combination (pairwise by default).
+
+    `list_sampling` picks the cases kept within `list_case_budget` instead:
+        - 'pairwise': the combination above;
+        - 'stratified': the filter, the search and the (filter value, search) cases, round robin across the filters,
+          the searches and the (filter, search) pairs, at random within each of them;
+        - 'random': the filter, the search and the (filter value, search) cases, at random.
+    The cases are drawn from the seed of the run.
+    `list_coverage` holds the covered values of each filter, the covered searches
+    and the covered (filter value, search) pairs, they are logged when the cases are generated.
+
+    With `list_crawl_page_size` set, a case crawls every page of the list (`list_pagination`: 'page', 'offset'
+    or 'cursor') and checks each item (by `pk_variable`) is listed exactly once, see `PaginationCrawler`.
+    """
     list_method = 'GET'
     list_check_points = [HttpStatusCodeEqual(200)]
     list_root_json_path = '$'
@@ -217,6 +262,94 @@ class ListApiMixin:
     show_list_response = False
     show_ignore_keys = []
     list_page_size_query_param = None
+    list_combination_strength = None
+    list_case_budget = None
+    list_sampling = None
+    list_coverage = None
+    _expanded_list_queries = None
+    list_crawl_page_size = None
+    list_pagination = 'page'
+    list_crawl_concurrency = 8
+
+    @property
+    def combines_list_queries(self):
+        if self.list_sampling not in LIST_SAMPLING_CHOICES:
+            raise ValueError(f'`list_sampling` must be one of {LIST_SAMPLING_CHOICES}, got {self.list_sampling!r}.')
+        if self.list_sampling is not None:
+            return self.list_sampling == 'pairwise'
+        return self.list_combination_strength is not None or self.list_case_budget is not None
+
+    def get_expanded_list_queries(
+        self,
+    ) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]], List[Tuple[str, str, str, str]]]:
+        """
+        The (filter key, value) queries of the filter cases, the (search key, value) queries of the search cases
+        and the (filter key, value, search key, value) queries of the filter and search cases,
+        sampled within `list_case_budget` along `list_sampling`.
+        """
+        if self._expanded_list_queries is not None:
+            return self._expanded_list_queries
+        filter_strata = [
+            [(filter_key, filter_value) for filter_value in filter_values]
+            for filter_key, filter_values in self.list_filters.items()
+        ]
+        search_strata = [
+            [(filter_key, filter_value, search_key, search_value) for filter_key, filter_value in stratum]
+            for stratum in filter_strata
+            for search_key, search_value in self.list_search.items()
+        ]
+        # The searches are one more stratum, a search query is tagged so it never equals a filter query.
+        searches = [('search', search_key, search_value) for search_key, search_value in self.list_search.items()]
+        strata = filter_strata + ([searches] if searches else []) + search_strata
+        budget = self.list_case_budget
+        if budget is not None and budget < sum(map(len, strata)):
+            random_ = seeded_random(get_seed(), type(self).__qualname__, 'list')
+            if self.list_sampling == 'random':
+                sample = set(random_.sample([query for stratum in strata for query in stratum], budget))
+            else:
+                sample = set(stratified_sample(strata, budget, random_))
+            # The sampled queries keep their declaration order.
+            strata = [[query for query in stratum if query in sample] for stratum in strata]
+        queries = [query for stratum in strata for query in stratum]
+        self._expanded_list_queries = (
+            [query for query in queries if len(query) == 2],
+            [query[1:] for query in queries if len(query) == 3],
+            [query for query in queries if len(query) == 4],
+        )
+        self.report_list_coverage(
+            [[query[:2]] for query in queries if len(query) == 2]
+            + [[query[:2]] for query in queries if len(query) == 3]
+            + [[query[:2], ('search', query[2])] for query in queries if len(query) == 4]
+        )
+        return self._expanded_list_queries
+
+    def report_list_coverage(self, queries: List[List[Tuple[str, str]]]) -> None:
+        """
+        Set and log `list_coverage`, the covered and the total number of values of each filter,
+        of searches and of (filter value, search) pairs, from the (key, value) queries of the cases.
+        A search is ('search', <search key>).
+        """
+        covered = {}
+        pairs = set()
+        for query in queries:
+            searches = [value for key, value in query if key == 'search']
+            for key, value in query:
+                covered.setdefault(key, set()).add(value)
+                if key != 'search':
+                    pairs.update((key, value, search) for search in searches)
+        self.list_coverage = {
+            filter_key: (len(covered.get(filter_key, ())), len(filter_values))
+            for filter_key, filter_values in self.list_filters.items()
+        }
+        if self.list_search:
+            self.list_coverage['search'] = (len(covered.get('search', ())), len(self.list_search))
+            if self.list_filters:
+                total_pairs = len(self.list_search) * sum(map(len, self.list_filters.values()))
+                self.list_coverage['filter x search'] = (len(pairs), total_pairs)
+        logger.info(
+            f'List queries of {self.url}: {len(queries)} cases, coverage: '
+            + ', '.join(f'{key} {covered}/{total}' for key, (covered, total) in self.list_coverage.items())
+        )
 
     def get_extra_list_test_cases(self):
         return []
@@ -256,11 +389,35 @@ class ListApiMixin:
             )
         return cases
     
+    def get_crawler(self) -> PaginationCrawler:
+        return PaginationCrawler(
+            self.client,
+            self.url,
+            self.list_crawl_page_size,
+            pagination=self.list_pagination,
+            id_key=getattr(self, 'pk_variable', 'id'),
+            page_size_query_param='limit' if self.list_pagination == 'offset' else 'page_size',
+            concurrency=self.list_crawl_concurrency,
+        )
+
+    def get_crawled_list_test_cases(self):
+        if not self.list_crawl_page_size:
+            return []
+        crawler = self.get_crawler()
+        return [
+            APIEndpointTestCase(
+                method=self.list_method,
+                url=crawler.first_page_url,
+                client=self.client,
+                check_points=self.list_check_points + [HttpResponsePaginationCrawlCheckPoint(crawler)],
+            )
+        ]
+
     def get_searched_list_test_cases(self):
-        if not self.list_search:
+        if not self.list_search or self.combines_list_queries:
             return []
         cases = []
-        for search_key, search_value in self.list_search.items():
+        for search_key, search_value in self.get_expanded_list_queries()[1]:
             url = f'{self.url}?search={search_value}'
             cases.append(
                 APIEndpointTestCase(
@@ -276,46 +433,100 @@ class ListApiMixin:
         return cases
     
     def get_filtered_list_test_cases(self):
-        if not self.list_filters:
+        if not self.list_filters or self.combines_list_queries:
             return []
         cases = []
-        for filter_key, filter_values in self.list_filters.items():
-            for filter_value in filter_values:
-                url = f'{self.url}?{filter_key}={filter_value}'
-                cases.append(
-                    APIEndpointTestCase(
-                        method=self.list_method,
-                        url=url,
-                        client=self.client,
-                        check_points=self.list_check_points + [
-                            HttpResponseValueInListItemsCheckPoint(filter_value, filter_key, self.list_root_json_path)
-                        ],
-                        response_hooks=self.get_response_hooks()
-                    )
+        for filter_key, filter_value in self.get_expanded_list_queries()[0]:
+            url = f'{self.url}?{filter_key}={filter_value}'
+            cases.append(
+                APIEndpointTestCase(
+                    method=self.list_method,
+                    url=url,
+                    client=self.client,
+                    check_points=self.list_check_points + [
+                        HttpResponseValueInListItemsCheckPoint(filter_value, filter_key, self.list_root_json_path)
+                    ],
+                    response_hooks=self.get_response_hooks()
                 )
+            )
         return cases
 
     def get_filtered_and_searched_list_test_cases(self):
-        if not self.list_search or not self.list_filters:
+        if not self.list_search or not self.list_filters or self.combines_list_queries:
             return []
         cases = []
-        for filter_key, filter_values in self.list_filters.items():
-            for filter_value in filter_values:
-                base_url = f'{self.url}?{filter_key}={filter_value}'
-                for search_key, search_value in self.list_search.items():
-                    url = f'{base_url}&search={search_value}'
-                    cases.append(
-                        APIEndpointTestCase(
-                            method=self.list_method,
-                            url=url,
-                            client=self.client,
-                            check_points=self.list_check_points + [
-                                HttpResponseValueContainCheckPoint(search_value, search_key, self.list_root_json_path),
-                                HttpResponseValueInListItemsCheckPoint(filter_value, filter_key, self.list_root_json_path)
-                            ],
-                            response_hooks=self.get_response_hooks()
-                        )
+        for filter_key, filter_value, search_key, search_value in self.get_expanded_list_queries()[2]:
+            url = f'{self.url}?{filter_key}={filter_value}&search={search_value}'
+            cases.append(
+                APIEndpointTestCase(
+                    method=self.list_method,
+                    url=url,
+                    client=self.client,
+                    check_points=self.list_check_points + [
+                        HttpResponseValueContainCheckPoint(search_value, search_key, self.list_root_json_path),
+                        HttpResponseValueInListItemsCheckPoint(filter_value, filter_key, self.list_root_json_path)
+                    ],
+                    response_hooks=self.get_response_hooks()
+                )
+            )
+        return cases
+
+    def get_combined_list_test_cases(self):
+        if not self.combines_list_queries or not (self.list_filters or self.list_search):
+            return []
+        # Each dimension is a filter, then the search; value 0 of a dimension leaves it out of the query.
+        dimensions = [
+            [None] + [(filter_key, filter_value) for filter_value in filter_values]
+            for filter_key, filter_values in self.list_filters.items()
+        ]
+        if self.list_search:
+            dimensions.append([None] + list(self.list_search.items()))
+        has_search = bool(self.list_search)
+
+        array = covering_array(
+            [len(dimension) for dimension in dimensions],
+            strength=self.list_combination_strength or 2,
+            budget=self.list_case_budget,
+            skip_default=True,
+            random_=seeded_random(get_seed(), type(self).__qualname__, 'list'),
+        )
+        logger.info(
+            f'Combine {len(dimensions)} list queries of {self.url} in {len(array.rows)} cases, '
+            f'coverage: {array.coverage:.1%}'
+        )
+
+        cases = []
+        covered_queries = []
+        for row in array.rows:
+            query = []
+            check_points = list(self.list_check_points)
+            covered_queries.append([])
+            for index, value in enumerate(row):
+                if not value:
+                    continue
+                key, query_value = dimensions[index][value]
+                is_search = has_search and index == len(dimensions) - 1
+                covered_queries[-1].append(('search', key) if is_search else (key, query_value))
+                if is_search:
+                    query.append(f'search={query_value}')
+                    check_points.append(
+                        HttpResponseValueContainCheckPoint(query_value, key, self.list_root_json_path)
+                    )
+                else:
+                    query.append(f'{key}={query_value}')
+                    check_points.append(
+                        HttpResponseValueInListItemsCheckPoint(query_value, key, self.list_root_json_path)
                     )
+            cases.append(
+                APIEndpointTestCase(
+                    method=self.list_method,
+                    url=f'{self.url}?{"&".join(query)}',
+                    client=self.client,
+                    check_points=check_points,
+                    response_hooks=self.get_response_hooks()
+                )
+            )
+        self.report_list_coverage(covered_queries)
         return cases
 
     def get_list_test_cases(self, *args, **kwargs):
@@ -329,11 +540,62 @@ class ListApiMixin:
 
 
 class RetrieveApiMixin:
-    ...
+    """
+    Retrieve API test case mixin.
 
+    With `retrieve_cache_check` set, the retrieve case fetches an object, the shared object of the fixture pool
+    for a `{pk}` (it is only read), then fetches it again with each of `retrieve_conditional_headers`
+    (`If-None-Match` and / or `If-Modified-Since`) and checks the answer is a 304 with an empty body,
+    see `HttpResponseNotModifiedCheckPoint`.
+    The variables of `retrieve_url` are given by `get_retrieve_<variable>`, else by `get_update_<variable>`.
+    """
+    retrieve_method = 'GET'
+    retrieve_check_points = [HttpStatusCodeEqual(200)]
+    retrieve_cache_check = False
+    retrieve_conditional_headers = ('If-None-Match', 'If-Modified-Since')
 
-class ClenupMixin:
-    should_cleanup_after_test = True
+    def get_retrieve_url(self):
+        url = self.retrieve_url
+        pattern = r'\{([^}]+)\}'
+        matches = re.findall(pattern, url)
+        variables = list(matches)
+        for variable in variables:
+            get_variable_func = getattr(self, f'get_retrieve_{variable}', None) or getattr(self, f'get_update_{variable}', None)
+            if get_variable_func:
+                url = url.format(**{variable: get_variable_func()})
+            else:
+                raise AttributeError(f'`get_retrieve_{variable}` is not defined.')
+        return url
+
+    def get_retrieve_pk(self):
+        return self.get_fixture_pool().acquire(shared=True).pk
+
+    def get_extra_retrieve_check_points(self):
+        return self.get_response_schema_check_points(self.retrieve_json_path) + [
+            HttpResponseNotModifiedCheckPoint(header, self.client)
+            for header in self.retrieve_conditional_headers
+        ]
+
+    def uses_shared_retrieve_object(self) -> bool:
+        """Whether the retrieve case reads the shared object of the fixture pool."""
+        return (
+            self.retrieve_cache_check
+            and self.retrieve_url is not None
+            and '{pk}' in self.retrieve_url
+            and type(self).get_retrieve_pk is RetrieveApiMixin.get_retrieve_pk
+        )
+
+    def get_retrieve_test_cases(self, *args, **kwargs):
+        if not self.retrieve_cache_check or self.retrieve_url is None:
+            return []
+        return [
+            APIEndpointTestCase(
+                method=self.retrieve_method,
+                url=self.get_retrieve_url(),
+                client=self.client,
+                check_points=self.retrieve_check_points + self.get_extra_retrieve_check_points()
+            )
+        ]
 
 
 class RestApiCaseSet(
@@ -343,7 +605,6 @@ class RestApiCaseSet(
     DeleteApiMixin,
     ListApiMixin,
     RetrieveApiMixin,
-    ClenupMixin
 ):
     faker_class = None
     url = None
@@ -351,32 +612,90 @@ class RestApiCaseSet(
     retrieve_url = None
     pk_variable = 'id'
     enable = None
+    fixture_concurrency = 4
+    # A `Faker` class or a JSON Schema, the objects answered by the create, update and retrieve cases are checked against it.
+    response_schema = None
+    # Check at most this many elements of each array of the objects, picked at random.
+    response_schema_max_items = None
+
+    # The names of the `get_*_test_cases` methods, in alphabetical order,
+    # collected once per class by `register_case_methods`.
+    _case_method_names: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.register_case_methods()
+
+    @classmethod
+    def register_case_methods(cls) -> None:
+        """Collect the case-producing methods of the class."""
+        methods = [name for name in dir(cls) if callable(getattr(cls, name, None))]
+        cls._case_method_names = tuple(
+            name for name in methods if name.startswith('get_') and name.endswith('_test_cases')
+        )
 
     def get_faker_class(self):
         if getattr(self, 'faker_class', None) is None:
             raise AttributeError('`faker_class` is not defined.')
         return self.faker_class
 
+    def is_case_method_enabled(self, member_name: str) -> bool:
+        return not self.enable or self.enable in member_name
+
+    def get_response_schema_check_points(self, json_path: str) -> List[CheckPoint]:
+        if self.response_schema is None:
+            return []
+        return [HttpResponseSchemaCheckPoint(self.response_schema, json_path, max_items=self.response_schema_max_items)]
+
+    def get_fixture_pool(self) -> FixturePool:
+        """
+        The pool of the objects the update and delete cases work on, shared by the case sets
+        creating the same Faker class at the same URL with the same client.
+        """
+        create_url = getattr(self, 'create_url', None) or self.url
+        if create_url is None:
+            raise AttributeError('`create_url` or `url` is not defined.')
+        return get_fixture_pool(
+            self.get_faker_class(),
+            create_url,
+            self.client,
+            pk_variable=self.pk_variable,
+            delete_url=self.get_resource_delete_url(),
+            concurrency=self.fixture_concurrency,
+        )
+
+    def get_resource_delete_url(self):
+        """The URL deleting a created object, if it only depends on its `{pk}`."""
+        delete_url = self.delete_url or self.retrieve_url
+        if delete_url is not None and set(re.findall(r'\{([^}]+)\}', delete_url)) != {'pk'}:
+            return None
+        return delete_url
+
+    def reserve_fixtures(self) -> None:
+        """Start creating the objects of the enabled update, delete and retrieve cases, in parallel."""
+        needed = sum(
+            1 for operation, url in (('update', self.update_url), ('delete', self.delete_url))
+            if (url or self.retrieve_url) and self.is_case_method_enabled(f'get_{operation}_test_cases')
+        )
+        if self.uses_shared_retrieve_object() and self.is_case_method_enabled('get_retrieve_test_cases'):
+            # The shared object is taken from the pool like the others.
+            needed += 1
+        if needed:
+            self.get_fixture_pool().reserve(needed)
+
     def get_caseset(self):
+        """
+        The test cases of all the `get_*_test_cases` methods. The methods are called right away,
+        the cases they return lazily (e.g. the invalid cases) are only generated while the suite runs.
+        """
+        self.reserve_fixtures()
         cases = []
-        for member_name, member in inspect.getmembers(self):
-            if (
-                inspect.ismethod(member)
-                and member_name.startswith('get_')
-                and member_name.endswith('_test_cases')
-                and (not self.enable or self.enable in member_name)
-            ):
-                if _cases := member():
-                    cases.extend(_cases)
-        return cases
+        for member_name in self._case_method_names:
+            if self.is_case_method_enabled(member_name):
+                if _cases := getattr(self, member_name)():
+                    cases.append(_cases)
+        return chain.from_iterable(cases)
+
+
 
-    def clenup(self):
-        if self.should_cleanup_after_test:
-            print('Start cleanup...')
-            for member_name, member in inspect.getmembers(self):
-                if (
-                    inspect.ismethod(member)
-                    and member_name.startswith('clenup_')
-                ):
-                    member()
-                    logger.info(f'Cleanup {member_name} success.')
+RestApiCaseSet.register_case_methods()
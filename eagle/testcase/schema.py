@@ -0,0 +1,439 @@
+"""
+Compile the schema of a response once into a validation function, checking a whole JSON value in one pass.
+
+The schema is either a `Faker` class (its declared fields) or a JSON Schema.
+"""
+import hashlib
+import json
+import math
+import random
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from eagle.seed import derive_seed, get_seed
+
+
+# A validator returns None if the value is valid, else why it is not, e.g. `.items[3].name: expected a string, got int`.
+Validator = Callable[[Any], Optional[str]]
+
+JSON_TYPE_NAMES = {
+    bool: 'boolean',
+    int: 'integer',
+    float: 'number',
+    str: 'string',
+    list: 'array',
+    dict: 'object',
+    type(None): 'null',
+}
+
+
+def get_json_type_name(value: Any) -> str:
+    return JSON_TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def is_number(value: Any) -> bool:
+    return type(value) in (int, float) and not (type(value) is float and math.isnan(value))
+
+
+# The checks of each JSON type, `bool` is not an integer there.
+TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'null': lambda value: value is None,
+    'boolean': lambda value: type(value) is bool,
+    'integer': lambda value: type(value) is int or (type(value) is float and value.is_integer()),
+    'number': is_number,
+    'string': lambda value: type(value) is str,
+    'array': lambda value: type(value) is list,
+    'object': lambda value: type(value) is dict,
+}
+
+
+def sample_indices(length: int, max_items: Optional[int], path: str = '$') -> Sequence[int]:
+    """
+    The indices of the elements of an array to validate: all of them, or `max_items` at random, first and last included.
+
+    The sample is drawn from a generator of its own, derived from the seed of the run, the `path` of the array
+    in the schema and its length: checking a response does not change the data generated for the next cases.
+    """
+    if max_items is None or length <= max_items:
+        return range(length)
+    if max_items < 2:
+        return range(max_items)
+    seed = get_seed()
+    random_ = random.Random() if seed is None else random.Random(derive_seed(seed, 'schema', path, length))
+    return [0, *sorted(random_.sample(range(1, length - 1), max_items - 2)), length - 1]
+
+
+def all_of(validators: List[Validator]) -> Validator:
+    if len(validators) == 1:
+        return validators[0]
+
+    def validate(value):
+        for validator in validators:
+            if (error := validator(value)) is not None:
+                return error
+        return None
+    return validate
+
+
+def compile_array(item_validators: List[Validator], max_items: Optional[int], path: str = '$') -> Validator:
+    """
+    Validate the elements of an array, element `i` with `item_validators[i % len(item_validators)]`.
+    `path` is the path of the array in the schema, see `sample_indices`.
+    """
+    if not item_validators:
+        return lambda value: None
+    count = len(item_validators)
+
+    def validate(value):
+        for index in sample_indices(len(value), max_items, path):
+            if (error := item_validators[index % count](value[index])) is not None:
+                return f'[{index}]{error}'
+        return None
+    return validate
+
+
+def compile_object(
+    properties: Dict[str, Validator],
+    required: Sequence[str] = (),
+    additional: Optional[Validator] = None,
+) -> Validator:
+    """Validate an object: its `required` keys are present, and the values of its keys."""
+    property_items = tuple(properties.items())
+
+    def validate(value):
+        for key in required:
+            if key not in value:
+                return f'.{key}: missing'
+        for key, validator in property_items:
+            if key in value and (error := validator(value[key])) is not None:
+                return f'.{key}{error}'
+        if additional is not None:
+            for key, item in value.items():
+                if key not in properties and (error := additional(item)) is not None:
+                    return f'.{key}{error}'
+        return None
+    return validate
+
+
+def typed(type_names: Sequence[str], validator: Optional[Validator] = None) -> Validator:
+    """Check the JSON type of the value is one of `type_names`, then run `validator` if it is not null."""
+    checks = tuple(TYPE_CHECKS[type_name] for type_name in type_names)
+    expected = ' or '.join(type_names)
+
+    def validate(value):
+        for check in checks:
+            if check(value):
+                return None if validator is None or value is None else validator(value)
+        return f': expected {expected}, got {get_json_type_name(value)}'
+    return validate
+
+
+def compile_range(
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+    exclusive_minimum: Optional[float] = None,
+    exclusive_maximum: Optional[float] = None,
+    measure: Callable[[Any], float] = lambda value: value,
+    name: str = 'value',
+) -> Optional[Validator]:
+    """Check `measure(value)` (the value, its length...) is within the bounds given, None if there are none."""
+    bounds = [
+        (bound, compare, text)
+        for bound, compare, text in (
+            (minimum, lambda measured, bound: measured >= bound, '>='),
+            (maximum, lambda measured, bound: measured <= bound, '<='),
+            (exclusive_minimum, lambda measured, bound: measured > bound, '>'),
+            (exclusive_maximum, lambda measured, bound: measured < bound, '<'),
+        )
+        if bound is not None
+    ]
+    if not bounds:
+        return None
+
+    def validate(value):
+        measured = measure(value)
+        for bound, compare, text in bounds:
+            if not compare(measured, bound):
+                return f': expected {name} {text} {bound}, got {measured}'
+        return None
+    return validate
+
+
+def compile_enum(choices: Sequence[Any]) -> Validator:
+    # `True == 1`: the JSON type is compared too.
+    allowed = {(type(choice) is bool, choice) for choice in choices if not isinstance(choice, (dict, list))}
+    unhashable = [choice for choice in choices if isinstance(choice, (dict, list))]
+
+    def validate(value):
+        if isinstance(value, (dict, list)):
+            if value in unhashable:
+                return None
+        elif (type(value) is bool, value) in allowed:
+            return None
+        return f': expected one of {list(choices)}, got {value!r}'
+    return validate
+
+
+class FakerSchemaCompiler:
+    """
+    Compile the declared fields of a `Faker` class: the types, the nullable fields, the required fields,
+    the blank strings, the choices, the numeric bounds and the nested dict and list fields.
+
+    The string and list lengths are not checked: their defaults (e.g. `CharField.max_length`) bound
+    the generated values, they are not constraints of the API.
+    """
+
+    def __init__(self, max_items: Optional[int] = None) -> None:
+        self.max_items = max_items
+
+    def compile_faker(self, faker_class: type) -> Validator:
+        return self.compile_fields(faker_class._declared_fields, '$')
+
+    def compile_fields(self, fields: Dict[str, Any], path: str) -> Validator:
+        return typed(['object'], compile_object(
+            {name: self.compile_field(field, f'{path}.{name}') for name, field in fields.items()},
+            required=[name for name, field in fields.items() if field.required],
+        ))
+
+    def compile_field(self, field: Any, path: str) -> Validator:
+        # `field_type` is a `FieldType` value.
+        field_type = field.field_type
+        nullable = ['null'] if field.allow_null else []
+        if field_type == 'boolean':
+            return typed(['boolean', *nullable])
+        if field_type in ('integer', 'float'):
+            bounds = compile_range(field.min_value, field.max_value)
+            return typed(['integer' if field_type == 'integer' else 'number', *nullable], bounds)
+        if field_type in ('char', 'text'):
+            blank = None if getattr(field, 'allow_blank', True) else compile_range(minimum=1, measure=len, name='length')
+            return typed(['string', *nullable], blank)
+        # The choices and the fields without a type (e.g. a custom `Field`) may be of any type.
+        any_type = [type_name for type_name in TYPE_CHECKS if type_name != 'null'] + nullable
+        if field_type == 'choices':
+            choices = list(field.choices) + ([''] if field.allow_blank else [])
+            return typed(any_type, compile_enum(choices) if field.choices else None)
+        if field_type == 'dict':
+            validator = self.compile_fields(field.fields, path)
+            return typed(['object', *nullable], validator) if nullable else validator
+        if field_type == 'list':
+            item_validators = [self.compile_field(item, f'{path}[]') for item in field.fields]
+            return typed(['array', *nullable], compile_array(item_validators, self.max_items, path))
+        return typed(any_type)
+
+
+class JSONSchemaCompiler:
+    """
+    Compile a JSON Schema (or an OpenAPI schema): `type` (and OpenAPI's `nullable`), `enum`, `const`,
+    the numeric bounds, `minLength`, `maxLength`, `pattern`, `items` (prefix `items` lists too),
+    `minItems`, `maxItems`, `properties`, `required`, `additionalProperties`, `allOf`, `anyOf`, `oneOf`
+    (as `anyOf`) and the local `$ref`s, recursive ones included. `format` and the other keywords are not checked.
+
+    The `$ref`s are resolved in `document`, e.g. the OpenAPI document of a response schema
+    with `#/components/schemas/...` references.
+    """
+
+    def __init__(self, document: Dict[str, Any], max_items: Optional[int] = None) -> None:
+        self.document = document
+        self.max_items = max_items
+        self._refs: Dict[str, Validator] = {}
+
+    def resolve_pointer(self, ref: str) -> Any:
+        if not ref.startswith('#'):
+            raise ValueError(f'Only local `$ref`s are supported, got {ref!r}.')
+        target = self.document
+        for part in ref[1:].split('/')[1:]:
+            target = target[part.replace('~1', '/').replace('~0', '~')]
+        return target
+
+    def compile_ref(self, ref: str) -> Validator:
+        if ref not in self._refs:
+            # Set before compiling, so a recursive reference finds it.
+            compiled: List[Validator] = []
+            self._refs[ref] = lambda value: compiled[0](value)
+            compiled.append(self.compile(self.resolve_pointer(ref), ref))
+        return self._refs[ref]
+
+    def compile(self, schema: Any, path: str = '$') -> Validator:
+        if schema is True or schema == {}:
+            return lambda value: None
+        if schema is False:
+            return lambda value: ': no value is allowed'
+
+        validators: List[Validator] = []
+        if '$ref' in schema:
+            validators.append(self.compile_ref(schema['$ref']))
+        for sub_schema in schema.get('allOf', ()):
+            validators.append(self.compile(sub_schema, path))
+        alternatives = schema.get('anyOf') or schema.get('oneOf')
+        if alternatives:
+            validators.append(self.compile_any_of([self.compile(sub_schema, path) for sub_schema in alternatives]))
+        if 'enum' in schema:
+            validators.append(compile_enum(schema['enum']))
+        if 'const' in schema:
+            validators.append(compile_enum([schema['const']]))
+
+        type_names = schema.get('type')
+        if isinstance(type_names, str):
+            type_names = [type_names]
+        type_validators = [
+            (type_name, validator)
+            for type_name, validator in (
+                ('number', self.compile_number(schema)),
+                ('string', self.compile_string(schema)),
+                ('array', self.compile_array(schema, path)),
+                ('object', self.compile_object(schema, path)),
+            )
+            if validator is not None
+        ]
+        if type_names is not None:
+            type_names = list(type_names) + (['null'] if schema.get('nullable') and 'null' not in type_names else [])
+            validators.append(typed(type_names))
+        if type_validators:
+            validators.append(self.compile_by_type(type_validators))
+        return all_of(validators) if validators else (lambda value: None)
+
+    def compile_any_of(self, validators: List[Validator]) -> Validator:
+        def validate(value):
+            errors = []
+            for validator in validators:
+                if (error := validator(value)) is None:
+                    return None
+                errors.append(error[2:] if error.startswith(': ') else error)
+            return f': no alternative matches ({"; ".join(errors)})'
+        return validate
+
+    def compile_by_type(self, type_validators: List[Tuple[str, Validator]]) -> Validator:
+        """The keywords of a type only apply to the values of that type."""
+        checks = tuple((TYPE_CHECKS[type_name], validator) for type_name, validator in type_validators)
+
+        def validate(value):
+            for check, validator in checks:
+                if check(value):
+                    return validator(value)
+            return None
+        return validate
+
+    def compile_number(self, schema: Dict[str, Any]) -> Optional[Validator]:
+        exclusive_minimum = schema.get('exclusiveMinimum')
+        exclusive_maximum = schema.get('exclusiveMaximum')
+        minimum, maximum = schema.get('minimum'), schema.get('maximum')
+        # Draft 4 and OpenAPI 3.0: `exclusiveMinimum` is a flag on `minimum`.
+        if exclusive_minimum is True:
+            minimum, exclusive_minimum = None, minimum
+        if exclusive_maximum is True:
+            maximum, exclusive_maximum = None, maximum
+        return compile_range(
+            minimum,
+            maximum,
+            exclusive_minimum if is_number(exclusive_minimum) else None,
+            exclusive_maximum if is_number(exclusive_maximum) else None,
+        )
+
+    def compile_string(self, schema: Dict[str, Any]) -> Optional[Validator]:
+        validators = []
+        if (length := compile_range(schema.get('minLength'), schema.get('maxLength'), measure=len, name='length')) is not None:
+            validators.append(length)
+        if 'pattern' in schema:
+            pattern = re.compile(schema['pattern'])
+            validators.append(
+                lambda value: None if pattern.search(value) else f': expected to match {pattern.pattern!r}, got {value!r}'
+            )
+        return all_of(validators) if validators else None
+
+    def compile_array(self, schema: Dict[str, Any], path: str) -> Optional[Validator]:
+        validators = []
+        if (length := compile_range(schema.get('minItems'), schema.get('maxItems'), measure=len, name='length')) is not None:
+            validators.append(length)
+        items = schema.get('prefixItems', schema.get('items'))
+        if isinstance(items, list):
+            validators.append(self.compile_prefix_items(
+                [self.compile(item, f'{path}[{index}]') for index, item in enumerate(items)], schema.get('items'), path
+            ))
+        elif items is not None:
+            validators.append(compile_array([self.compile(items, f'{path}[]')], self.max_items, path))
+        return all_of(validators) if validators else None
+
+    def compile_prefix_items(self, item_validators: List[Validator], rest: Any, path: str) -> Validator:
+        rest_validator = self.compile(rest, f'{path}[]') if isinstance(rest, dict) and 'prefixItems' not in rest else None
+
+        def validate(value):
+            for index, (validator, item) in enumerate(zip(item_validators, value)):
+                if (error := validator(item)) is not None:
+                    return f'[{index}]{error}'
+            if rest_validator is not None:
+                for index in sample_indices(len(value), self.max_items, path):
+                    if index >= len(item_validators) and (error := rest_validator(value[index])) is not None:
+                        return f'[{index}]{error}'
+            return None
+        return validate
+
+    def compile_object(self, schema: Dict[str, Any], path: str) -> Optional[Validator]:
+        properties = schema.get('properties', {})
+        required = schema.get('required', [])
+        additional = schema.get('additionalProperties')
+        if not properties and not required and additional in (None, True):
+            return None
+        return compile_object(
+            {name: self.compile(property_schema, f'{path}.{name}') for name, property_schema in properties.items()},
+            required=required,
+            additional=None if additional in (None, True) else self.compile(additional, f'{path}.*'),
+        )
+
+
+# The validators already compiled, by Faker class, or by document hash and `$ref` (or hash) of a JSON Schema,
+# and `max_items`.
+_compiled: Dict[Tuple[Any, Any, Optional[int]], Validator] = {}
+
+
+# id of a document -> (the document, its hash), a document (e.g. the OpenAPI document) is hashed once.
+_document_hashes: Dict[int, Tuple[Any, str]] = {}
+
+
+def get_schema_hash(schema: Any) -> str:
+    return hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def get_document_hash(document: Any) -> str:
+    """The hash of `document`, computed the first time the document is seen: it must not change afterwards."""
+    entry = _document_hashes.get(id(document))
+    if entry is None or entry[0] is not document:
+        entry = _document_hashes[id(document)] = (document, get_schema_hash(document))
+    return entry[1]
+
+
+def get_schema_key(schema: Any, document: Optional[Dict[str, Any]]) -> Any:
+    """A schema of a document that is only a `$ref` is keyed by its pointer, any other schema by its hash."""
+    if document is not None and isinstance(schema, dict) and len(schema) == 1 and isinstance(schema.get('$ref'), str):
+        return schema['$ref']
+    return get_schema_hash(schema)
+
+
+def compile_schema(schema: Any, max_items: Optional[int] = None, document: Optional[Dict[str, Any]] = None) -> Validator:
+    """
+    The validation function of `schema`, a `Faker` class or a JSON Schema, compiled once.
+
+    Args:
+        max_items (int, optional): Validate at most `max_items` elements of each array, picked at random
+            (the first and the last included), None to validate them all.
+        document (dict, optional): The document the `$ref`s of a JSON Schema point into, e.g. an OpenAPI document.
+            Defaults to the schema itself. It is hashed once, the schemas compiled from it are cached
+            by their `$ref`, so it must not change once used.
+
+    Usage:
+        >>> validate = compile_schema(UserFaker)
+        >>> validate({'name': 'alice', 'age': 'ten'})
+        '.age: expected integer, got string'
+        >>> validate = compile_schema({'$ref': '#/components/schemas/User'}, document=openapi_document)
+    """
+    if isinstance(schema, type) and hasattr(schema, '_declared_fields'):
+        key = (schema, None, max_items)
+        if key not in _compiled:
+            _compiled[key] = FakerSchemaCompiler(max_items).compile_faker(schema)
+        return _compiled[key]
+    if not isinstance(schema, (dict, bool)):
+        raise TypeError(f'`schema` must be a Faker class or a JSON Schema, got {schema!r}.')
+    key = (None if document is None else get_document_hash(document), get_schema_key(schema, document), max_items)
+    if key not in _compiled:
+        if document is None:
+            document = schema if isinstance(schema, dict) else {}
+        _compiled[key] = JSONSchemaCompiler(document, max_items).compile(schema)
+    return _compiled[key]
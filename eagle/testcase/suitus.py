@@ -1,22 +1,73 @@
 import inspect
-from typing import List, Optional
+from collections import OrderedDict, deque, namedtuple
+from typing import Callable, Iterable, Iterator, List, Optional
 from eagle.testcase.unit import APIEndpointTestCase
 from colorama import Fore
-from prettytable import PrettyTable
 import json
 from eagle.testcase.bases import TestCase
 from eagle.testcase.check_points.http import HttpStatusCodeEqual
+from eagle.tracing import tracer
+from eagle.payload import to_jsonable
+
+
+class ExecutedCase(namedtuple('ExecutedCase', ['name', 'case_id', 'passed', 'shared_with', 'reason'])):
+    """
+    An executed case kept by its suite for the reports, without its request and response:
+    the `case_id` of the case it shared the response with, and the error messages of its failed check points.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_case(cls, case: APIEndpointTestCase) -> 'ExecutedCase':
+        return cls(
+            case.name,
+            case.case_id,
+            case.passed,
+            case.shared_with.case_id if case.shared_with is not None else None,
+            ''.join(f'<{point.error_message}>' for point in case.failed_check_points),
+        )
 
 
 class APITestSuite(TestCase):
+    """
+    Executes its cases in order.
+
+    Generated cases (with a `case_id`) sending byte-identical requests (see `APIEndpointTestCase.fingerprint`),
+    e.g. two invalid providers producing the same body, send the request once:
+    the other cases check the same response and are still reported on their own.
+    Set `deduplicate_requests` to False to send every request.
+    Only the last `deduplication_window` sent requests are remembered, an older duplicate is sent again.
+
+    Generated cases are not kept once executed: the suite only records the totals, the timings,
+    the failed cases and the `ExecutedCase` of the last `executed_case_history` cases (None for all of them)
+    for the reports, so a large caseset runs in bounded memory.
+    """
 
     show_result = False
     show_response_body = False
-
-    def __init__(self, cases: Optional[List[APIEndpointTestCase]] = None):
+    deduplicate_requests = True
+    deduplication_window = 1024
+    executed_case_history = 10000
+
+    def __init__(self, cases: Optional[Iterable[APIEndpointTestCase]] = None):
+        """
+        Args:
+            cases (Iterable[APIEndpointTestCase], optional): The cases. A list is kept as is, any other iterable
+                (e.g. a generator of generated cases) is consumed lazily while the suite runs,
+                and its executed cases are dropped once recorded in the results.
+        """
+        self._pending_cases: Optional[Iterator[APIEndpointTestCase]] = None
+        if cases is None:
+            cases = []
+        if not isinstance(cases, list):
+            self._pending_cases = iter(cases)
+            cases = []
         self._cases = cases
-        if self._cases is None:
-            self._cases = []
+        self.executed_count = 0
+        self.requests_sent = 0
+        self.failed_cases: List[APIEndpointTestCase] = []
+        self.timers = []
+        self.executed_cases = deque(maxlen=self.executed_case_history)
         super().__init__()
 
     def add_case(self, case: APIEndpointTestCase) -> None:
@@ -27,43 +78,102 @@ class APITestSuite(TestCase):
         for case in cases:
             self.add_case(case)
 
+    @property
+    def has_cases(self) -> bool:
+        return bool(self._cases) or self._pending_cases is not None
+
+    def filter_cases(self, predicate: Callable[[APIEndpointTestCase], bool]) -> None:
+        """Keep only the cases matching `predicate`, the pending cases are filtered while they are consumed."""
+        self._cases = [case for case in self._cases if predicate(case)]
+        if self._pending_cases is not None:
+            self._pending_cases = filter(predicate, self._pending_cases)
+
+    def iter_cases(self) -> Iterator[APIEndpointTestCase]:
+        """
+        Yield the cases to execute, the pending ones are consumed as they come.
+        """
+        yield from list(self._cases)
+        if self._pending_cases is None:
+            return
+        pending_cases, self._pending_cases = self._pending_cases, None
+        yield from pending_cases
+
+    def record_result(self, case: APIEndpointTestCase) -> None:
+        """Record an executed case for the reports, only a failed case is kept."""
+        self.executed_count += 1
+        if case.shared_with is None:
+            self.requests_sent += 1
+        if case.timer is not None:
+            self.timers.append(case.timer)
+        if not case.passed:
+            self.failed_cases.append(case)
+        self.executed_cases.append(ExecutedCase.from_case(case))
+
     def show(self):
-        table = PrettyTable()
-        table.field_names = ["case_name", "status", "reason", "body"]
-
-        for case in self._cases:
-            body = json.dumps(case.request.json)
-            if case.passed:
-                print(Fore.GREEN+'-' * 150)
-                print(f'case_name | {Fore.GREEN}{case.name}')
-                print(f'status    | {Fore.GREEN}PASSED')
-                if case.request.json:
-                    print(f'body      | {Fore.GREEN}{body}')
-                if self.show_response_body:
-                    try:
-                        print(f'response  | {Fore.GREEN}{case.response.json()}')
-                    except Exception:
-                        print(f'response  | {Fore.GREEN}{case.response.text}')
-            else:
-                print(Fore.RED+'-' * 150)
-                print(f'case_name | {Fore.RED}{case.name}')
-                print(f'status    | {Fore.RED}FAILURE')
-                if case.request.json:
-                    print(f'body      | {Fore.RED}{body}')
-                reason = ''.join(f'<{point.error_message}>' for point in case.failed_check_points)
-                print(f'reason    | {Fore.RED}{reason}')
-                if self.show_response_body:
-                    try:
-                        print(f'response  | {Fore.RED}{case.response.json()}')
-                    except Exception:
-                        print(f'response  | {Fore.RED}{case.response.text}')
+        """
+        Show the executed cases kept in `executed_cases`.
+        Their bodies and responses are only shown while the cases run, with `show_result`.
+        """
+        for record in self.executed_cases:
+            color = Fore.GREEN if record.passed else Fore.RED
+            print(color + '-' * 150)
+            print(f'case_name | {color}{record.name}')
+            print(f'status    | {color}{"PASSED" if record.passed else "FAILURE"}')
+            if record.shared_with is not None:
+                print(f'shared    | {color}{record.shared_with}')
+            if not record.passed:
+                print(f'reason    | {color}{record.reason}')
+
+    def show_case(self, case: APIEndpointTestCase) -> None:
+        body = json.dumps(case.request.json, default=to_jsonable)
+        if case.passed:
+            print(Fore.GREEN+'-' * 150)
+            print(f'case_name | {Fore.GREEN}{case.name}')
+            print(f'status    | {Fore.GREEN}PASSED')
+            if case.request.json:
+                print(f'body      | {Fore.GREEN}{body}')
+            if case.shared_with is not None:
+                print(f'shared    | {Fore.GREEN}{case.shared_with.case_id}')
+            if self.show_response_body:
+                try:
+                    print(f'response  | {Fore.GREEN}{case.response.json()}')
+                except Exception:
+                    print(f'response  | {Fore.GREEN}{case.response.text}')
+        else:
+            print(Fore.RED+'-' * 150)
+            print(f'case_name | {Fore.RED}{case.name}')
+            print(f'status    | {Fore.RED}FAILURE')
+            if case.request.json:
+                print(f'body      | {Fore.RED}{body}')
+            if case.shared_with is not None:
+                print(f'shared    | {Fore.RED}{case.shared_with.case_id}')
+            reason = ''.join(f'<{point.error_message}>' for point in case.failed_check_points)
+            print(f'reason    | {Fore.RED}{reason}')
+            if self.show_response_body:
+                try:
+                    print(f'response  | {Fore.RED}{case.response.json()}')
+                except Exception:
+                    print(f'response  | {Fore.RED}{case.response.text}')
 
     def execute(self) -> None:
-        for test_case in self._cases:
-            test_case.execute()
-
-        if self.show_result:
-            self.show()
+        sent_cases = OrderedDict()
+        with tracer.start_span('suite', attributes={'eagle.suite': type(self).__name__}):
+            for test_case in self.iter_cases():
+                fingerprint = None
+                if self.deduplicate_requests and test_case.case_id is not None:
+                    fingerprint = test_case.fingerprint()
+                shared_with = sent_cases.get(fingerprint) if fingerprint is not None else None
+                test_case.execute(shared_with=shared_with)
+                if fingerprint is not None:
+                    if shared_with is None:
+                        sent_cases[fingerprint] = test_case
+                        if len(sent_cases) > self.deduplication_window:
+                            sent_cases.popitem(last=False)
+                    else:
+                        sent_cases.move_to_end(fingerprint)
+                self.record_result(test_case)
+                if self.show_result:
+                    self.show_case(test_case)
 
 
 class FakerAutoTestSuite(APITestSuite):
@@ -80,7 +190,7 @@ class FakerAutoTestSuite(APITestSuite):
 
     def __init__(self):
         caseset = self.get_caseset()
-        if not isinstance(caseset, list):
+        if isinstance(caseset, APIEndpointTestCase):
             caseset = [caseset]
         super().__init__(caseset)
 
@@ -3,13 +3,20 @@ from typing import (
     Dict,
     Any,
     Callable,
-    List
+    List,
+    Tuple
 )
+import hashlib
+import json
 from eagle.http.hooks import log_response
 from requests.models import Request
 from eagle.http.client import AuthenticatedHttpClient
 from eagle.testcase.check_points.http import HttpResponseCheckPoint
 from eagle.testcase.bases import TestCase
+from eagle.timing import PhaseTimer, timing_hooks
+from eagle.tracing import SpanStatus, tracer
+from eagle import metrics
+from eagle.payload import JsonStream, PayloadOverlay, contains_streamed, materialize, to_jsonable
 
 
 class APIEndpointTestCase(TestCase):
@@ -25,6 +32,8 @@ class APIEndpointTestCase(TestCase):
         client: Optional[AuthenticatedHttpClient] = None,
         check_points: Optional[List[HttpResponseCheckPoint]] = None,
         response_hooks: List[Dict[str, Any]] | None = None,
+        extra_timing_hooks: List[Dict[str, Any]] | None = None,
+        case_id: Optional[str] = None,
         **kwargs,
     ):
         """
@@ -42,11 +51,18 @@ class APIEndpointTestCase(TestCase):
                         'func': log_response
                     }
                 ]
+            extra_timing_hooks (List[Callable], optional): Hooks called with the case and its `PhaseTimer`
+                after the case is executed, even if its request failed, in the same format as `response_hooks`.
+                Defaults to None.
+                Hooks registered with `eagle.timing.register_timing_hook` are called for every case.
+            case_id (str, optional): Stable id of a generated case, used to run it again on its own
+                with `eagle run --seed <seed> --case <case_id>`. Defaults to None.
             **kwargs: Keyword arguments for requests.models.Request.
         """
         if name is None:
             name = f"{method} {url}"
         super().__init__(name)
+        self.case_id = case_id
         self.client = client
         if self.client is None:
             self.client = AuthenticatedHttpClient()
@@ -69,6 +85,39 @@ class APIEndpointTestCase(TestCase):
                 'func': log_response
             })
 
+        self.extra_timing_hooks = extra_timing_hooks or []
+        self.timer: Optional[PhaseTimer] = None
+        # The case whose response was checked instead of sending the same request again.
+        self.shared_with: Optional['APIEndpointTestCase'] = None
+
+    def fingerprint(self) -> Optional[Tuple[int, str, str, str]]:
+        """
+        Identify the request sent by the case: the client, the method, the URL
+        and a hash of the canonical JSON of the headers, the query params and the body.
+
+        Returns None when the request can not be compared (files, form data, cookies, auth or a streamed body).
+        """
+        request = self.request
+        if request.files or request.data or request.cookies or request.auth:
+            return None
+        if contains_streamed(request.json):
+            return None
+        try:
+            canonical = json.dumps(
+                [dict(request.headers), request.params, request.json],
+                sort_keys=True,
+                separators=(',', ':'),
+                default=to_jsonable,
+            )
+        except TypeError:
+            return None
+        return (
+            id(self.client),
+            request.method,
+            request.url,
+            hashlib.sha256(canonical.encode()).hexdigest(),
+        )
+
     def execute_response_hooks(self, response) -> None:
         for hook in self.response_hooks:
             func = hook['func']
@@ -77,10 +126,68 @@ class APIEndpointTestCase(TestCase):
     def execute_check_points(self, response) -> None:
         for check_point in self.check_points:
             check_point(response)
+            if check_point.timer is not None:
+                self.timer.add_sub_timer(check_point.timer)
             if check_point.failed:
+                metrics.check_point_failures_total.inc(check_point._name or type(check_point).__name__)
                 self.do_fail(check_point)
 
-    def execute(self) -> None:
-        self.response = self.client.send_request(self.request)
-        self.execute_response_hooks(self.response)
-        self.execute_check_points(self.response)
+    def execute_timing_hooks(self) -> None:
+        for func in timing_hooks:
+            func(self, self.timer)
+        for hook in self.extra_timing_hooks:
+            func = hook['func']
+            func(self, self.timer, *hook.get('args', []), **hook.get('kwargs', {}))
+
+    def send(self):
+        payload = self.request.json
+        streamed = contains_streamed(payload)
+        if not isinstance(payload, PayloadOverlay) and not streamed:
+            return self.client.send_request(self.request, timer=self.timer)
+
+        # Generated payloads are overlays on a shared valid payload,
+        # they are only turned into plain JSON while being sent.
+        # Payloads with a `StreamedList` are encoded while being sent, with chunked transfer encoding.
+        headers, data = self.request.headers, self.request.data
+        with self.timer.phase('prepare'):
+            body = materialize(payload)
+            if streamed:
+                self.request.json = None
+                self.request.data = JsonStream(body)
+                self.request.headers = {**(headers or {}), 'Content-Type': 'application/json'}
+            else:
+                self.request.json = body
+        try:
+            return self.client.send_request(self.request, timer=self.timer)
+        finally:
+            self.request.json = payload
+            self.request.headers, self.request.data = headers, data
+
+    def execute(self, shared_with: Optional['APIEndpointTestCase'] = None) -> None:
+        """
+        Args:
+            shared_with (APIEndpointTestCase, optional): An executed case sending the same request
+                (same `fingerprint`). Its response is checked instead of sending the request again.
+        """
+        self.timer = PhaseTimer(self.name)
+        self.shared_with = shared_with
+        try:
+            with tracer.start_span('case', attributes={'eagle.case': self.name}) as span:
+                if shared_with is None:
+                    self.response = self.send()
+                else:
+                    self.response = shared_with.response
+                    span.set_attribute('eagle.shared_with', shared_with.case_id or shared_with.name)
+                    metrics.deduplicated_requests_total.inc()
+                with self.timer.phase('response_hooks'):
+                    self.execute_response_hooks(self.response)
+                with self.timer.phase('check_points'):
+                    self.execute_check_points(self.response)
+                span.set_attribute('eagle.passed', self.passed)
+                if not self.passed:
+                    span.set_status(SpanStatus.ERROR, 'check points failed')
+            metrics.cases_total.inc('passed' if self.passed else 'failed')
+            metrics.case_duration_seconds.observe(self.timer.total)
+        finally:
+            # A request that raised is timed too.
+            self.execute_timing_hooks()
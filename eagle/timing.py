@@ -0,0 +1,112 @@
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class PhaseTimer:
+    """
+    Records monotonic timings (`time.perf_counter`) of the phases of a test case.
+
+    The phases recorded by eagle are:
+        - prepare: building the prepared request (url, body, merged settings).
+        - auth: injecting the authentication into the request.
+        - network: sending the request and reading the response.
+        - response_hooks: running the response hooks of the case.
+        - check_points: running the check points of the case.
+
+    Check points that send their own request (e.g. `CallAPICheckPoint`)
+    record it in a timer of their own, which is attached as a sub timer.
+
+    Usage:
+        >>> timer = PhaseTimer('GET /users/')
+        >>> with timer.phase('network'):
+                ...
+        >>> timer.phases
+        {'network': 0.0123}
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name
+        self.phases: Dict[str, float] = {}
+        self.sub_timers: List['PhaseTimer'] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def add_sub_timer(self, timer: 'PhaseTimer') -> None:
+        self.sub_timers.append(timer)
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def as_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'phases': dict(self.phases),
+            'total': self.total,
+            'sub_timers': [timer.as_dict() for timer in self.sub_timers],
+        }
+
+
+class NullPhaseTimer(PhaseTimer):
+    """A timer that records nothing, used when the caller does not ask for timings."""
+
+    def phase(self, name: str):
+        return nullcontext()
+
+    def add_sub_timer(self, timer: PhaseTimer) -> None:
+        pass
+
+
+null_timer = NullPhaseTimer()
+
+
+# Global timing hooks, called with (case, timer) after every case is executed.
+timing_hooks: List[Callable] = []
+
+
+def register_timing_hook(func: Callable) -> Callable:
+    """
+    Register a callback that receives the timings of every executed case.
+
+    Usage:
+        >>> @register_timing_hook
+            def print_slow_cases(case, timer):
+                if timer.total > 1:
+                    print(case.name, timer.phases)
+    """
+    if func not in timing_hooks:
+        timing_hooks.append(func)
+    return func
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_timings(values: List[float]) -> Dict[str, float]:
+    """
+    Summarize a list of durations in seconds.
+
+    Returns:
+        Dict[str, float]: count, total, mean, p50, p95 and max.
+    """
+    if not values:
+        return {'count': 0, 'total': 0.0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    sorted_values = sorted(values)
+    total = sum(sorted_values)
+    return {
+        'count': len(sorted_values),
+        'total': total,
+        'mean': total / len(sorted_values),
+        'p50': _percentile(sorted_values, 50),
+        'p95': _percentile(sorted_values, 95),
+        'max': sorted_values[-1],
+    }
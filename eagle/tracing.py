@@ -0,0 +1,280 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from typing import Any, Dict, List, Optional
+from eagle.logger import logger
+
+
+class SpanKind:
+    """OTLP span kinds."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class SpanStatus:
+    """OTLP status codes."""
+
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('eagle_current_span', default=None)
+
+
+def get_current_span() -> Optional['Span']:
+    return _current_span.get()
+
+
+class TracedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    A `ThreadPoolExecutor` running each task in a copy of the context it is submitted from,
+    so the spans of the task are children of the current span of the submitting thread.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return super().submit(copy_context().run, fn, *args, **kwargs)
+
+
+def _encode_attribute_value(value: Any) -> Dict[str, Any]:
+    # `bool` is checked first because it is a subclass of `int`.
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _encode_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {'key': key, 'value': _encode_attribute_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class NonRecordingSpan:
+    """The span handed out while tracing is disabled. Every operation is a no-op."""
+
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_status(self, code: int, message: str = '') -> None:
+        pass
+
+    def __enter__(self) -> 'NonRecordingSpan':
+        return self
+
+    def __exit__(self, *args: Any) -> bool:
+        return False
+
+
+NON_RECORDING_SPAN = NonRecordingSpan()
+
+
+class Span:
+    """
+    A timed operation of a run, e.g. a suite, a case, an HTTP request or a check point.
+
+    The span becomes the current span while it is entered,
+    so spans started inside it are recorded as its children.
+    """
+
+    def __init__(
+        self,
+        tracer: 'Tracer',
+        name: str,
+        kind: int = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.trace_id: Optional[str] = None
+        self.span_id: Optional[str] = None
+        self.parent_span_id: Optional[str] = None
+        self.start_time: Optional[int] = None
+        self.end_time: Optional[int] = None
+        self.status_code = SpanStatus.UNSET
+        self.status_message = ''
+        self._token = None
+
+    @property
+    def traceparent(self) -> str:
+        """The W3C trace context header value of this span."""
+        return f'00-{self.trace_id}-{self.span_id}-01'
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_status(self, code: int, message: str = '') -> None:
+        self.status_code = code
+        self.status_message = message
+
+    def __enter__(self) -> 'Span':
+        parent = _current_span.get()
+        if parent is None:
+            self.trace_id = os.urandom(16).hex()
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_span_id = parent.span_id
+        self.span_id = os.urandom(8).hex()
+        self.start_time = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self.end_time = time.time_ns()
+        if exc_type is not None:
+            self.set_status(SpanStatus.ERROR, f'{exc_type.__name__}: {exc_value}')
+        _current_span.reset(self._token)
+        self.tracer.on_end(self)
+        return False
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_time),
+            'endTimeUnixNano': str(self.end_time),
+            'attributes': _encode_attributes(self.attributes),
+            'status': {'code': self.status_code},
+        }
+        if self.parent_span_id:
+            span['parentSpanId'] = self.parent_span_id
+        if self.status_message:
+            span['status']['message'] = self.status_message
+        return span
+
+
+class BatchFileSpanExporter:
+    """
+    Export finished spans to a local file from a background thread.
+
+    Spans are written in batches, one OTLP/JSON `ExportTraceServiceRequest`
+    per line, which is the format of the OpenTelemetry collector's file exporter
+    and can be replayed with its `otlpjsonfile` receiver.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        service_name: str = 'eagle',
+        max_batch_size: int = 512,
+        schedule_delay: float = 1.0,
+    ) -> None:
+        self.file_path = file_path
+        self.service_name = service_name
+        self.max_batch_size = max_batch_size
+        self.schedule_delay = schedule_delay
+        self._queue: queue.Queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._worker, name='eagle-span-exporter', daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def _write(self, spans: List[Span]) -> None:
+        request = {
+            'resourceSpans': [{
+                'resource': {'attributes': _encode_attributes({'service.name': self.service_name})},
+                'scopeSpans': [{
+                    'scope': {'name': 'eagle'},
+                    'spans': [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+        try:
+            with open(self.file_path, 'a') as f:
+                f.write(json.dumps(request) + '\n')
+        except OSError as e:
+            logger.error(f'Failed to export {len(spans)} spans to {self.file_path}. {e}')
+
+    def _worker(self) -> None:
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.schedule_delay
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+
+            if len(batch) >= self.max_batch_size or time.monotonic() >= deadline:
+                if batch:
+                    self._write(batch)
+                    batch = []
+                deadline = time.monotonic() + self.schedule_delay
+
+            if self._stopped.is_set() and self._queue.empty():
+                if batch:
+                    self._write(batch)
+                return
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+class Tracer:
+    """
+    Creates the spans of a run.
+    Tracing is disabled until `configure` is called; until then every span is a no-op.
+
+    Usage:
+        >>> from eagle.tracing import tracer
+        >>> tracer.configure('eagle-trace.jsonl')
+        >>> with tracer.start_span('suite', attributes={'eagle.suite': 'TestUser'}):
+                ...
+        >>> tracer.shutdown()
+    """
+
+    def __init__(self) -> None:
+        self.exporter: Optional[BatchFileSpanExporter] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def configure(self, file_path: str, **kwargs: Any) -> None:
+        self.shutdown()
+        self.exporter = BatchFileSpanExporter(file_path, **kwargs)
+        logger.info(f'Exporting trace spans to {file_path}')
+
+    def start_span(
+        self,
+        name: str,
+        kind: int = SpanKind.INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        if self.exporter is None:
+            return NON_RECORDING_SPAN
+        return Span(self, name, kind, attributes)
+
+    def on_end(self, span: Span) -> None:
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def shutdown(self) -> None:
+        if self.exporter is not None:
+            self.exporter.shutdown()
+            self.exporter = None
+
+
+tracer = Tracer()
+atexit.register(tracer.shutdown)
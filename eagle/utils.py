@@ -1,9 +1,11 @@
 import re
 import string
 import random
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from jsonpath_rw import parse
 from prettytable import PrettyTable
+from eagle.seed import get_random
 
 
 def to_long_data(data):
@@ -61,5 +63,77 @@ def is_valid_url(url):
         return False
 
 
+class RandomStringGenerator:
+    """
+    Generates random strings over a fixed alphabet.
+
+    Whole strings are built per call by translating random bytes into the alphabet
+    (`bytes.translate` with a precomputed table) instead of picking characters one by one.
+    Bytes that would make some characters more likely than others are dropped.
+    Alphabets that are not ASCII fall back to `random.choices`.
+
+    Usage:
+        >>> generator = get_string_generator(string.ascii_letters)
+        >>> generator.generate(8)
+        'aZbTqkLm'
+    """
+
+    def __init__(self, alphabet: str) -> None:
+        assert alphabet, 'alphabet must not be empty'
+        self.alphabet = alphabet
+        self._use_bytes = alphabet.isascii() and len(alphabet) <= 256
+        if self._use_bytes:
+            size = len(alphabet)
+            self._table = bytes(ord(alphabet[i % size]) for i in range(256))
+            # Dropping the bytes above the largest multiple of the size keeps the characters equally likely.
+            self._delete = bytes(range(256 - 256 % size, 256))
+            self._keep_ratio = (256 - 256 % size) / 256
+
+    def generate(self, length: int, random_: Optional[random.Random] = None) -> str:
+        if length <= 0:
+            return ''
+        random_ = random_ or get_random()
+        if not self._use_bytes:
+            return ''.join(random_.choices(self.alphabet, k=length))
+
+        chars = b''
+        while len(chars) < length:
+            missing = length - len(chars)
+            chars += random_.randbytes(int(missing / self._keep_ratio) + 8).translate(self._table, self._delete)
+        return chars[:length].decode('ascii')
+
+    def generate_many(self, lengths: Sequence[int], random_: Optional[random.Random] = None) -> List[str]:
+        """Generate one string per length, from a single draw of random bytes."""
+        chars = self.generate(sum(lengths), random_)
+        values = []
+        offset = 0
+        for length in lengths:
+            values.append(chars[offset:offset + length])
+            offset += length
+        return values
+
+
+@lru_cache(maxsize=None)
+def get_string_generator(alphabet: str) -> RandomStringGenerator:
+    return RandomStringGenerator(alphabet)
+
+
+@lru_cache(maxsize=None)
+def get_record_builder(keys: Tuple[Any, ...]) -> Callable[[Sequence[List[Any]]], List[Dict[Any, Any]]]:
+    """
+    A function building the dicts of `keys` from one column of values per key,
+    about twice as fast as `dict(zip(keys, row))` for each row: the dict display is compiled once.
+
+    Usage:
+        >>> get_record_builder(('name', 'age'))([['alice', 'bob'], [30, 40]])
+        [{'name': 'alice', 'age': 30}, {'name': 'bob', 'age': 40}]
+    """
+    if not keys or not all(isinstance(key, str) for key in keys):
+        return lambda columns: [dict(zip(keys, row)) for row in zip(*columns)]
+    variables = [f'v{index}' for index in range(len(keys))]
+    items = ', '.join(f'{key!r}: {variable}' for key, variable in zip(keys, variables))
+    return eval(f'lambda columns: [{{{items}}} for {", ".join(variables)}, in zip(*columns)]')
+
+
 def generate_random_string(length=10, allow_string=string.ascii_letters+string.digits):
-    return ''.join(random.choice(allow_string) for _ in range(length))
+    return get_string_generator(allow_string).generate(length)